@@ -1,17 +1,72 @@
 # Task 3: AI/Logic Integration - Auto-solve questions step by step
 
 import re
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 import json
+from equation_engine import EquationEngine
+from solver_cache import SolverCache, normalize_text, solver_cache
+
+PROFIT_PCT_RE = re.compile(r'profit of (\d+(?:\.\d+)?)%', re.I)
+DISCOUNT_RE = re.compile(r'discount.*?(\d+(?:\.\d+)?)%', re.I)
+MARKUP_RE = re.compile(r'marks?.*?(\d+(?:\.\d+)?)%\s*above', re.I)
+PROFIT_AMOUNT_RE = re.compile(r'profit of ₹(\d+(?:\.\d+)?)')
+CP_REDUCE_RE = re.compile(r'reduces.*?cost price by (\d+(?:\.\d+)?)%', re.I)
+SP_INCREASE_RE = re.compile(r'increases.*?selling price by ₹(\d+(?:\.\d+)?)', re.I)
+NEW_PROFIT_RE = re.compile(r'profit percentage becomes (\d+(?:\.\d+)?)%', re.I)
+
+MARKUP_DISCOUNT_FORMULAS = ["SP = MP × (1 - Discount%/100)", "Profit = SP - CP"]
+TWO_SCENARIO_FORMULAS = ["Profit% = (Profit/CP) × 100"]
+
+def copy_solution(solution: Dict) -> Dict:
+    copied = dict(solution)
+    copied["steps"] = list(solution.get("steps", []))
+    copied["formula_used"] = list(solution.get("formula_used", []))
+    return copied
 
 class MathSolver:
     
+    def __init__(self, cache: Optional[SolverCache] = None):
+        self.engine = EquationEngine()
+        self.cache = cache if cache is not None else solver_cache
+    
+    def extract_profit_loss_params(self, text: str) -> Tuple[Optional[str], Tuple]:
+        # Mirrors the branch conditions of solve_profit_loss_problem and only
+        # reports a template when every parameter needed for an answer is present.
+        discount_match = DISCOUNT_RE.search(text)
+        markup_match = MARKUP_RE.search(text)
+        
+        if markup_match and discount_match:
+            profit_amt_match = PROFIT_AMOUNT_RE.search(text)
+            if not profit_amt_match:
+                return None, ()
+            return "markup_discount", (
+                float(markup_match.group(1)),
+                float(discount_match.group(1)),
+                float(profit_amt_match.group(1))
+            )
+        
+        if text.count('profit') >= 2 or 'reduces' in text.lower():
+            cp_reduce = CP_REDUCE_RE.search(text)
+            sp_increase = SP_INCREASE_RE.search(text)
+            new_profit = NEW_PROFIT_RE.search(text)
+            profit_match = PROFIT_PCT_RE.search(text)
+            if not (profit_match and cp_reduce and sp_increase and new_profit):
+                return None, ()
+            return "two_scenario", (
+                float(profit_match.group(1)),
+                float(cp_reduce.group(1)),
+                float(sp_increase.group(1)),
+                float(new_profit.group(1))
+            )
+        
+        return None, ()
+    
     def solve_profit_loss_problem(self, question_data: Dict) -> Dict:
         text = question_data.get('raw_text', '')
         
-        profit_match = re.search(r'profit of (\d+(?:\.\d+)?)%', text, re.I)
-        discount_match = re.search(r'discount.*?(\d+(?:\.\d+)?)%', text, re.I)
-        markup_match = re.search(r'marks?.*?(\d+(?:\.\d+)?)%\s*above', text, re.I)
+        profit_match = PROFIT_PCT_RE.search(text)
+        discount_match = DISCOUNT_RE.search(text)
+        markup_match = MARKUP_RE.search(text)
         
         solution = {
             "steps": [],
@@ -28,7 +83,7 @@ class MathSolver:
             solution["steps"].append(f"After {discount}% discount:")
             solution["steps"].append(f"Selling Price = {1 + markup/100}x × {1 - discount/100} = {(1 + markup/100) * (1 - discount/100)}x")
             
-            profit_amt_match = re.search(r'profit of ₹(\d+(?:\.\d+)?)', text)
+            profit_amt_match = PROFIT_AMOUNT_RE.search(text)
             if profit_amt_match:
                 profit_amt = float(profit_amt_match.group(1))
                 sp_multiplier = (1 + markup/100) * (1 - discount/100)
@@ -54,18 +109,18 @@ class MathSolver:
             
             solution["steps"].append("\nScenario 2: Modified transaction")
             
-            cp_reduce = re.search(r'reduces.*?cost price by (\d+(?:\.\d+)?)%', text, re.I)
+            cp_reduce = CP_REDUCE_RE.search(text)
             if cp_reduce:
                 reduce_pct = float(cp_reduce.group(1))
                 solution["steps"].append(f"New CP = x - {reduce_pct}% of x = {1 - reduce_pct/100}x")
             
-            sp_increase = re.search(r'increases.*?selling price by ₹(\d+(?:\.\d+)?)', text, re.I)
+            sp_increase = SP_INCREASE_RE.search(text)
             if sp_increase and profit_match:
                 increase_amt = float(sp_increase.group(1))
                 profit1 = float(profit_match.group(1))
                 solution["steps"].append(f"New SP = {1 + profit1/100}x + ₹{increase_amt}")
             
-            new_profit = re.search(r'profit percentage becomes (\d+(?:\.\d+)?)%', text, re.I)
+            new_profit = NEW_PROFIT_RE.search(text)
             if new_profit and cp_reduce and sp_increase:
                 new_profit_pct = float(new_profit.group(1))
                 reduce_pct = float(cp_reduce.group(1))
@@ -88,11 +143,164 @@ class MathSolver:
         
         return solution
     
+    def _solve_markup_discount_group(self, np, params: List[Tuple]) -> List[Optional[Dict]]:
+        markup, discount, profit_amt = np.array(params, dtype=float).T
+        
+        mp = 1 + markup/100
+        df = 1 - discount/100
+        sp_multiplier = (1 + markup/100) * (1 - discount/100)
+        profit_multiplier = sp_multiplier - 1
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cp = profit_amt / profit_multiplier
+        ok = np.isfinite(cp) & (profit_multiplier != 0)
+        
+        solutions = []
+        for (mk, dc, pa), m, d, s, p, x, valid in zip(params, mp.tolist(), df.tolist(),
+                                                      sp_multiplier.tolist(), profit_multiplier.tolist(),
+                                                      cp.tolist(), ok.tolist()):
+            if not valid:
+                solutions.append(None)
+                continue
+            solutions.append({
+                "steps": [
+                    "Let Cost Price = ₹x",
+                    f"Marked Price = x + {mk}% of x = {m}x",
+                    f"After {dc}% discount:",
+                    f"Selling Price = {m}x × {d} = {s}x",
+                    f"Profit = SP - CP = {s}x - x = {p}x",
+                    f"Given: {p}x = ₹{pa}",
+                    f"x = ₹{pa}/{p} = ₹{x:.2f}"
+                ],
+                "formula_used": MARKUP_DISCOUNT_FORMULAS,
+                "answer": f"₹{x:.2f}"
+            })
+        return solutions
+    
+    def _solve_two_scenario_group(self, np, params: List[Tuple]) -> List[Optional[Dict]]:
+        profit1, reduce_pct, increase_amt, new_profit_pct = np.array(params, dtype=float).T
+        
+        sp1 = 1 + profit1/100
+        cp2 = 1 - reduce_pct/100
+        new_profit = new_profit_pct/100
+        left_coef = (1 + profit1/100) - (1 - reduce_pct/100)
+        right_coef = (new_profit_pct/100) * (1 - reduce_pct/100)
+        solvable = np.abs(left_coef - right_coef) > 0.001
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x = increase_amt / (right_coef - left_coef)
+        
+        solutions = []
+        for (p1, rp, inc, npp), s1, c2, npf, xv, valid in zip(params, sp1.tolist(), cp2.tolist(),
+                                                             new_profit.tolist(), x.tolist(),
+                                                             solvable.tolist()):
+            if not valid:
+                solutions.append(None)
+                continue
+            solutions.append({
+                "steps": [
+                    "Scenario 1: Original transaction",
+                    "Let original CP = ₹x",
+                    f"Original SP = x + {p1}% of x = {s1}x",
+                    "\nScenario 2: Modified transaction",
+                    f"New CP = x - {rp}% of x = {c2}x",
+                    f"New SP = {s1}x + ₹{inc}",
+                    f"\nNew Profit% = {npp}%",
+                    "New Profit = New SP - New CP",
+                    f"({s1}x + {inc}) - {c2}x = {npf} × {c2}x",
+                    f"Solving: x = ₹{xv:.2f}"
+                ],
+                "formula_used": TWO_SCENARIO_FORMULAS,
+                "answer": f"₹{xv:.2f}"
+            })
+        return solutions
+    
+    def solve_batch(self, questions: List[Dict]) -> List[Dict]:
+        # Groups fully-specified profit/loss questions by template, solves each
+        # distinct parameter tuple once with NumPy array arithmetic and fans the
+        # result back out. Everything else (and any row the vectorized path
+        # cannot answer) goes through solve_question.
+        import numpy as np
+        
+        groups = {"markup_discount": {}, "two_scenario": {}}
+        results = [None] * len(questions)
+        
+        for idx, q in enumerate(questions):
+            if q.get('question_type', 'general') != 'profit_loss':
+                continue
+            template, params = self.extract_profit_loss_params(q.get('raw_text', ''))
+            if template:
+                groups[template].setdefault(params, []).append(idx)
+        
+        solvers = {
+            "markup_discount": self._solve_markup_discount_group,
+            "two_scenario": self._solve_two_scenario_group,
+        }
+        for template, members in groups.items():
+            if not members:
+                continue
+            unique_params = list(members)
+            for params, solution in zip(unique_params, solvers[template](np, unique_params)):
+                if solution is None:
+                    continue
+                for idx in members[params]:
+                    results[idx] = {
+                        "steps": list(solution["steps"]),
+                        "formula_used": list(solution["formula_used"]),
+                        "answer": solution["answer"]
+                    }
+        
+        for idx, q in enumerate(questions):
+            if results[idx] is None:
+                results[idx] = self.solve_question(q)
+        
+        return results
+    
     def solve_question(self, question_data: Dict) -> Dict:
+        # Memoized on (template, parameters) for the profit/loss templates so
+        # reworded copies of the same problem hit, and on whitespace-normalized
+        # text for everything else. Only an answer from the template itself is
+        # stored under its parameters; a fallback answer depends on the wording.
+        if self.cache.maxsize <= 0:
+            return self._solve_uncached(question_data)
+        
+        q_type = question_data.get('question_type', 'general')
+        text = question_data.get('raw_text', '')
+        
+        template_solution = None
+        if q_type == 'profit_loss':
+            template, params = self.extract_profit_loss_params(text)
+            if template:
+                cached = self.cache.get((template, params))
+                if cached is not None:
+                    return copy_solution(cached)
+                template_solution = self.solve_profit_loss_problem(question_data)
+                if template_solution["answer"] is not None:
+                    self.cache.put((template, params), copy_solution(template_solution))
+                    return template_solution
+        
+        key = (q_type, normalize_text(text))
+        cached = self.cache.get(key)
+        if cached is not None:
+            return copy_solution(cached)
+        
+        solution = self._solve_uncached(question_data, template_solution)
+        self.cache.put(key, copy_solution(solution))
+        return solution
+    
+    def _solve_uncached(self, question_data: Dict, template_solution: Optional[Dict] = None) -> Dict:
         q_type = question_data.get('question_type', 'general')
+        text = question_data.get('raw_text', '')
         
         if q_type == 'profit_loss':
-            return self.solve_profit_loss_problem(question_data)
+            solution = template_solution or self.solve_profit_loss_problem(question_data)
+            if solution["answer"] is None:
+                chained = self.engine.solve_chained_transaction(text)
+                if chained is not None:
+                    return chained
+            return solution
+        
+        solution = self.engine.solve(q_type, text)
+        if solution is not None:
+            return solution
         
         return {
             "steps": ["Solution method not implemented for this question type"],
@@ -0,0 +1,1173 @@
+# Benchmarks: synthetic question banks and performance measurements
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from array import array
+from typing import Dict, List, Optional
+
+TEMPLATES = [
+    """Q. A trader marks an article {markup}% above its cost price.
+He allows a {discount}% discount on the marked price and still earns a profit of ₹{profit}.
+Find the cost price of the article.
+Sol: Let the cost price = ₹ x
+1. Marked Price = {mp} x
+2. After {discount} % discount → Selling Price = {mp}x X {df} = {sp}x
+3. Profit = SP − CP = {sp}x − x = {pm}x
+Given profit = ₹ {profit}
+Answer → Cost Price ≈ ₹ {answer}
+""",
+    """Q. A shopkeeper sells a book at a profit of {p1}%. Later, he reduces the cost price by {r}%
+and increases the selling price by ₹{inc}. As a result, his profit percentage becomes
+{p2}%. Find the original cost price of the book.
+Sol:
+Given:
+• Original profit = {p1}% → SP1 = {s1}x
+• New CP = {c2}x
+• New SP = {s1}x + {inc}
+x = ₹{answer}
+""",
+]
+
+
+def generate_question(rng: random.Random) -> str:
+    if rng.random() < 0.5:
+        markup = rng.choice([20, 25, 30, 40, 50])
+        discount = rng.choice([5, 10, 15])
+        profit = rng.randint(10, 500)
+        mp = round(1 + markup / 100, 2)
+        df = round(1 - discount / 100, 2)
+        sp = round(mp * df, 4)
+        pm = round(sp - 1, 4)
+        answer = f"{profit / pm:.2f}" if pm > 0 else "0"
+        return TEMPLATES[0].format(markup=markup, discount=discount, profit=profit,
+                                   mp=mp, df=df, sp=sp, pm=pm, answer=answer)
+
+    p1 = rng.choice([5, 10, 20])
+    r = rng.choice([4, 5, 10])
+    inc = rng.randint(2, 50)
+    p2 = rng.choice([18.75, 25, 30])
+    s1 = round(1 + p1 / 100, 2)
+    c2 = round(1 - r / 100, 2)
+    denom = p2 / 100 * c2 - (s1 - c2)
+    answer = f"{inc / denom:.2f}" if denom else "0"
+    return TEMPLATES[1].format(p1=p1, r=r, inc=inc, p2=p2, s1=s1, c2=c2, answer=answer)
+
+
+def profit_loss_question(rng: random.Random):
+    # Same wording as SOLVER_TEMPLATES, which MathSolver can answer.
+    if rng.random() < 0.5:
+        a, b, c = rng.choice([20, 25, 30, 40, 50]), rng.choice([5, 10, 15]), rng.randint(10, 500)
+        margin = (1 + a / 100) * (1 - b / 100) - 1
+        return (SOLVER_TEMPLATES[0].format(a=a, b=b, c=c),
+                [f"MP = {1 + a / 100:.2f} CP", f"SP = {(1 + a / 100) * (1 - b / 100):.4f} CP",
+                 f"Profit = {margin:.4f} CP = {c}"],
+                f"₹{c / margin:.2f}")
+    while True:
+        a, b, c, d = rng.choice([5, 10, 20]), rng.choice([4, 5, 10]), rng.randint(2, 50), rng.choice([18.75, 25, 30])
+        s1, c2 = 1 + a / 100, 1 - b / 100
+        denom = d / 100 * c2 - (s1 - c2)
+        if denom > 0:
+            break
+    return (SOLVER_TEMPLATES[1].format(a=a, b=b, c=c, d=d),
+            [f"SP1 = {s1:.2f}x", f"New CP = {c2:.2f}x", f"({s1:.2f}x + {c}) - {c2:.2f}x = {d / 100} × {c2:.2f}x"],
+            f"₹{c / denom:.2f}")
+
+
+def time_work_question(rng: random.Random):
+    a, b = rng.sample([6, 8, 10, 12, 15, 18, 20, 24, 30], 2)
+    return (f"A can complete a work in {a} days and B can complete it in {b} days. "
+            f"In how many days will they complete the work together?",
+            [f"A's one day work = 1/{a}", f"B's one day work = 1/{b}",
+             f"Together = 1/{a} + 1/{b} = {a + b}/{a * b}"],
+            f"{a * b / (a + b):.2f} days")
+
+
+def speed_distance_question(rng: random.Random):
+    length = rng.choice([100, 120, 150, 180, 200, 250, 300])
+    speed = rng.choice([36, 45, 54, 72, 90])
+    ms = speed * 5 / 18
+    return (f"A train {length} m long running at {speed} km/h crosses a pole. Find the time taken.",
+            [f"Speed = {speed} × 5/18 = {ms:.2f} m/s", f"Time = {length} / {ms:.2f}"],
+            f"{length / ms:.2f} seconds")
+
+
+def simple_interest_question(rng: random.Random):
+    p, r, t = rng.randrange(1000, 20001, 500), rng.randint(4, 12), rng.randint(2, 6)
+    return (f"Find the simple interest on ₹{p} at {r}% per annum for {t} years.",
+            ["SI = P × R × T / 100", f"SI = {p} × {r} × {t} / 100"],
+            f"₹{p * r * t / 100:.2f}")
+
+
+def compound_interest_question(rng: random.Random):
+    p, r, t = rng.randrange(1000, 20001, 1000), rng.choice([5, 8, 10, 12]), rng.randint(1, 3)
+    return (f"Find the compound interest on ₹{p} at {r}% per annum for {t} years, compounded annually.",
+            [f"A = {p} × (1 + {r}/100)^{t}", "CI = A - P"],
+            f"₹{p * ((1 + r / 100) ** t - 1):.2f}")
+
+
+def ratio_proportion_question(rng: random.Random):
+    a, b = rng.sample([1, 2, 3, 4, 5, 7], 2)
+    total = (a + b) * rng.randint(10, 200)
+    return (f"Divide ₹{total} in the ratio {a}:{b}.",
+            [f"Total parts = {a} + {b} = {a + b}", f"Shares = {total} × {a}/{a + b} and {total} × {b}/{a + b}"],
+            f"₹{total * a // (a + b)}, ₹{total * b // (a + b)}")
+
+
+def chained_transaction_question(rng: random.Random):
+    gain, loss = rng.choice([10, 20, 25]), rng.choice([5, 10, 20])
+    pay = rng.randrange(200, 2001, 50)
+    return (f"A sells an item to B at {gain} % profit.\nB sells it to C at {loss} % loss.\n"
+            f"C pays ₹ {pay}.\nFind A’s cost price.",
+            [f"C pays = CP × {1 + gain / 100} × {1 - loss / 100}", f"CP = {pay} / {(1 + gain / 100) * (1 - loss / 100):.4f}"],
+            f"₹{pay / ((1 + gain / 100) * (1 - loss / 100)):.2f}")
+
+
+# Topics for mixed banks; names follow the question types the solvers know.
+TOPICS = {
+    'profit_loss': profit_loss_question,
+    'time_work': time_work_question,
+    'speed_distance': speed_distance_question,
+    'simple_interest': simple_interest_question,
+    'compound_interest': compound_interest_question,
+    'ratio_proportion': ratio_proportion_question,
+    'chained_transaction': chained_transaction_question,
+}
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    # "profit_loss=3,time_work=1" -> relative weights; "all" -> every topic equally.
+    if not value or value == 'all':
+        return {topic: 1.0 for topic in TOPICS}
+    mix = {}
+    for part in value.split(','):
+        topic, _, weight = part.partition('=')
+        topic = topic.strip()
+        if topic not in TOPICS:
+            raise ValueError(f"Unknown topic '{topic}' (choose from {', '.join(TOPICS)})")
+        mix[topic] = float(weight or 1)
+    return mix
+
+
+def mixed_question(rng: random.Random, topics: List[str], weights: List[float], worked: float) -> str:
+    # A worked fraction of questions keep their solution steps; the rest only
+    # carry the answer, so the pipeline's solve stage has to solve them.
+    question, steps, answer = TOPICS[rng.choices(topics, weights)[0]](rng)
+    body = "\n".join(steps) + "\n" if rng.random() < worked else ""
+    return f"Q. {question}\nSol:\n{body}Answer → {answer}\n"
+
+
+def generate_bank(path: str, n: int, seed: int = 42, mix: Optional[Dict[str, float]] = None,
+                  worked: float = 1.0) -> str:
+    # Without a mix the bank uses the two profit/loss templates above, as before.
+    rng = random.Random(seed)
+    topics, weights = (list(mix), list(mix.values())) if mix else (None, None)
+    with open(path, 'w', encoding='utf-8') as f:
+        for _ in range(n):
+            f.write(mixed_question(rng, topics, weights, worked) if mix else generate_question(rng))
+            f.write("\n")
+    return path
+
+
+def peak_rss_kb() -> int:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == 'darwin' else rss
+
+
+def _ingest_child(path: str, mode: str):
+    from json_converter import DatasetToJSON
+    converter = DatasetToJSON()
+    start = time.perf_counter()
+    if mode == 'stream':
+        count = sum(1 for _ in converter.iter_file(path))
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            count = len(converter.parse_raw_dataset(f.read()))
+    elapsed = time.perf_counter() - start
+    print(f"{count} {elapsed:.3f} {peak_rss_kb()}")
+
+
+def bench_ingest(sizes):
+    print(f"{'questions':>10} {'size MB':>8} {'mode':>7} {'seconds':>8} {'peak RSS MB':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            path = generate_bank(os.path.join(tmp, f"bank_{n}.txt"), n)
+            size_mb = os.path.getsize(path) / 1e6
+            for mode in ('eager', 'stream'):
+                out = subprocess.run(
+                    [sys.executable, __file__, '_ingest', path, mode],
+                    capture_output=True, text=True, check=True,
+                    cwd=os.path.dirname(os.path.abspath(__file__))
+                ).stdout.split()
+                count, elapsed, rss = int(out[0]), float(out[1]), int(out[2])
+                print(f"{count:>10} {size_mb:>8.1f} {mode:>7} {elapsed:>8.2f} {rss / 1024:>12.1f}")
+
+
+def bench_scaling(n: int, max_workers: int):
+    from main_pipeline import QuestionToVisualPipeline
+
+    rng = random.Random(42)
+    raw_dataset = "\n" + "\n".join(generate_question(rng) for _ in range(n))
+    workers = [1]
+    while workers[-1] * 2 <= max_workers:
+        workers.append(workers[-1] * 2)
+    if workers[-1] != max_workers:
+        workers.append(max_workers)
+
+    print(f"{'workers':>8} {'seconds':>8} {'q/s':>8} {'speedup':>8}")
+    baseline = None
+    for w in workers:
+        with tempfile.TemporaryDirectory() as tmp:
+            pipeline = QuestionToVisualPipeline(output_dir=tmp, workers=w)
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                pipeline.run_complete_pipeline(raw_dataset)
+            elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{w:>8} {elapsed:>8.2f} {n / elapsed:>8.1f} {baseline / elapsed:>7.2f}x")
+
+
+def synthetic_questions(n: int, seed: int = 42):
+    from json_converter import DatasetToJSON
+    rng = random.Random(seed)
+    raw_dataset = "\n" + "\n".join(generate_question(rng) for _ in range(n))
+    return DatasetToJSON().parse_raw_dataset(raw_dataset)
+
+
+def bench_render(n: int, workers: int):
+    from visual_generator import VisualExplanationGenerator
+
+    questions = synthetic_questions(n)
+    generator = VisualExplanationGenerator()
+    print(f"{'workers':>8} {'seconds':>8} {'img/s':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        items = [(q, i, os.path.join(tmp, f"question_{i}.png")) for i, q in enumerate(questions, 1)]
+
+        start = time.perf_counter()
+        for item in items:
+            generator.render_to_file(*item)
+        elapsed = time.perf_counter() - start
+        print(f"{'serial':>8} {elapsed:>8.2f} {n / elapsed:>8.1f}")
+
+        if workers > 1:
+            start = time.perf_counter()
+            generator.render_batch(items, workers)
+            elapsed = time.perf_counter() - start
+            print(f"{workers:>8} {elapsed:>8.2f} {n / elapsed:>8.1f}")
+
+
+def bench_visual(n: int):
+    from visual_generator import VisualExplanationGenerator
+
+    questions = synthetic_questions(n)
+    print(f"{'mode':>8} {'seconds':>8} {'img/s':>8}")
+    for label, use_cache in (('uncached', False), ('cached', True)):
+        generator = VisualExplanationGenerator(use_cache=use_cache)
+        start = time.perf_counter()
+        for i, q in enumerate(questions, 1):
+            generator.generate_visual(q, i)
+        elapsed = time.perf_counter() - start
+        print(f"{label:>8} {elapsed:>8.2f} {n / elapsed:>8.1f}")
+
+
+def bench_store(n: int):
+    from bonus_validator import AutoSaveManager
+    from record_store import JsonlRecordReader
+
+    questions = synthetic_questions(min(n, 1000))
+    rng = random.Random(0)
+    lookups = [rng.randint(1, n) for _ in range(1000)]
+    print(f"{'format':>10} {'seconds':>8} {'rec/s':>9} {'files':>7} {'MB':>7} {'get us':>7}")
+    for label, fmt, options in (('files', 'files', {}), ('jsonl', 'jsonl', {}),
+                                ('jsonl.gz', 'jsonl', {'compress': True})):
+        with tempfile.TemporaryDirectory() as tmp:
+            manager = AutoSaveManager(tmp, fmt, **options)
+            start = time.perf_counter()
+            for i in range(1, n + 1):
+                manager.save_question(dict(questions[i % len(questions)]), i)
+            manager.close()
+            elapsed = time.perf_counter() - start
+
+            files, size = 0, 0
+            for root, _, names in os.walk(os.path.join(tmp, "json")):
+                files += len(names)
+                size += sum(os.path.getsize(os.path.join(root, name)) for name in names)
+
+            start = time.perf_counter()
+            if fmt == 'files':
+                for i in lookups:
+                    path = manager.question_path(i, True)
+                    if not os.path.exists(path):
+                        path = manager.question_path(i, False)
+                    with open(path, 'r', encoding='utf-8') as f:
+                        f.read()
+            else:
+                readers = [JsonlRecordReader(manager.store_dir(v)) for v in (True, False)]
+                for i in lookups:
+                    next(r for r in readers if i in r).get(i)
+            lookup = (time.perf_counter() - start) / len(lookups) * 1e6
+            print(f"{label:>10} {elapsed:>8.2f} {n / elapsed:>9.0f} {files:>7} {size / 1e6:>7.1f} {lookup:>7.0f}")
+
+
+def bench_memory(n: int):
+    import gc
+    import tracemalloc
+    from bonus_validator import AutoSaveManager
+    from json_converter import DatasetToJSON
+
+    rng = random.Random(42)
+    raw_dataset = "\n" + "\n".join(generate_question(rng) for _ in range(n))
+    converter = DatasetToJSON()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = AutoSaveManager(tmp)
+
+        def as_dicts():
+            questions = converter.parse_raw_dataset(raw_dataset)
+            for q in questions:
+                q['formula_used'] = []
+                manager.validate_and_categorize(q)
+            return questions
+
+        def as_records():
+            records = converter.parse_records(raw_dataset)
+            for r in records:
+                r.formula_used = ()
+                manager.validate_record(r)
+            return records
+
+        print(f"{'format':>8} {'MB':>8} {'bytes/q':>8} {'seconds':>8}")
+        results = {}
+        for label, build in (('dict', as_dicts), ('slots', as_records)):
+            gc.collect()
+            tracemalloc.start()
+            start = time.perf_counter()
+            results[label] = build()
+            elapsed = time.perf_counter() - start
+            gc.collect()
+            size = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            print(f"{label:>8} {size / 1e6:>8.1f} {size / n:>8.0f} {elapsed:>8.2f}")
+
+        same = [r.to_dict() for r in results['slots']] == results['dict']
+        print(f"Identical JSON: {same}")
+
+
+INVALID_QUESTIONS = [
+    {"raw_text": "Invalid", "solution_steps": [], "answer": ""},
+    {"raw_text": "Find the cost price of the article quickly", "solution_steps": ["Let CP = x"], "answer": "N/A"},
+    {"raw_text": "Xq zzv 12 kjh wpt rrt mmn find?", "solution_steps": ["a", "b"], "answer": "none"},
+    {"raw_text": "12 + 34 = ?? ## $$ 56 % 78 * 90 = the", "solution_steps": ["1 + 1", "= 2"], "answer": "two"},
+    {"raw_text": "A trader sells an article at a profit of 20 percent.", "solution_steps": ["SP = 1.2 CP", "done"], "answer": "₹120"},
+]
+
+
+def validation_questions(n: int):
+    pool = synthetic_questions(200) + INVALID_QUESTIONS
+    return [pool[i % len(pool)] for i in range(n)]
+
+
+def bench_validate(n: int):
+    from bonus_validator import AutoSaveManager
+
+    questions = validation_questions(n)
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = AutoSaveManager(tmp)
+    validator = manager.validator
+
+    start = time.perf_counter()
+    expected = [
+        manager.validation_for(q['raw_text'], q['solution_steps'], q['answer'])
+        for q in questions
+    ]
+    per_question = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = validator.validate_many(questions)
+    batched = time.perf_counter() - start
+
+    print(f"{'mode':>13} {'seconds':>8} {'q/s':>10}")
+    print(f"{'per-question':>13} {per_question:>8.2f} {n / per_question:>10.0f}")
+    print(f"{'validate_many':>13} {batched:>8.2f} {n / batched:>10.0f}")
+    print(f"Speedup: {per_question / batched:.2f}x, valid {batch.valid_count()}/{len(batch)}")
+    same = all(batch.validation(i) == expected[i] for i in range(n))
+    print(f"Identical results: {same}")
+    return same
+
+
+def bench_report(n: int):
+    import tracemalloc
+    from bonus_validator import AutoSaveManager
+
+    pool = validation_questions(len(INVALID_QUESTIONS) * 2)
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = AutoSaveManager(tmp)
+        validations = [manager.validate_and_categorize(dict(q))['validation'] for q in pool]
+
+        def from_list():
+            questions = [{"validation": validations[i % len(validations)]} for i in range(n)]
+            manager.save_report(manager.generate_validation_report(questions))
+
+        def streaming():
+            report = manager.report_builder()
+            for i in range(n):
+                report.add(i + 1, validations[i % len(validations)])
+            report.finish()
+
+        print(f"{'mode':>10} {'seconds':>8} {'peak MB':>8}")
+        for label, build in (('list', from_list), ('streaming', streaming)):
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                build()
+                elapsed = time.perf_counter() - start
+                # Peak memory is measured on a second run so tracing doesn't skew the timing.
+                tracemalloc.start()
+                build()
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            print(f"{label:>10} {elapsed:>8.2f} {peak / 1e6:>8.1f}")
+
+
+SOLVER_TEMPLATES = [
+    "A trader marks an article {a}% above its cost price and allows a discount of {b}%. "
+    "He earns a profit of ₹{c}. Find the cost price.",
+    "A shopkeeper sells a book at a profit of {a}%. Later, he reduces the cost price by {b}% "
+    "and increases the selling price by ₹{c}. As a result, his profit percentage becomes {d}%. "
+    "Find the original cost price of the book.",
+]
+
+
+def solver_questions(n: int, seed: int = 42):
+    # Single-line variants of the two profit/loss templates MathSolver answers.
+    rng = random.Random(seed)
+    questions = []
+    for _ in range(n):
+        template = rng.choice(SOLVER_TEMPLATES)
+        text = template.format(a=rng.choice([5, 10, 20, 25, 40]), b=rng.choice([4, 5, 10, 15]),
+                               c=rng.randint(2, 500), d=rng.choice([18.75, 25, 30]))
+        questions.append({"raw_text": text, "question_type": "profit_loss"})
+    return questions
+
+
+def bench_solver(n: int):
+    from ai_solver import MathSolver
+    from solver_cache import SolverCache
+
+    questions = solver_questions(n)
+    solver = MathSolver(cache=SolverCache(maxsize=0))
+    memo = SolverCache(maxsize=max(n, 1))
+    memo_solver = MathSolver(cache=memo)
+
+    def best_of(fn, repeat=3):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = fn()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return result, best
+
+    scalar, scalar_time = best_of(lambda: [solver.solve_question(q) for q in questions])
+    batch, batch_time = best_of(lambda: solver.solve_batch(questions))
+    memoized, memo_time = best_of(lambda: [memo_solver.solve_question(q) for q in questions], repeat=1)
+
+    print(f"{'mode':>8} {'seconds':>8} {'q/s':>10}")
+    print(f"{'scalar':>8} {scalar_time:>8.2f} {n / scalar_time:>10.0f}")
+    print(f"{'batch':>8} {batch_time:>8.2f} {n / batch_time:>10.0f}")
+    print(f"{'memo':>8} {memo_time:>8.2f} {n / memo_time:>10.0f}  (hit rate {memo.hit_rate:.1%})")
+    print(f"Identical results: {scalar == batch == memoized}")
+
+
+ENGINE_CASES = [
+    ("time_work", "A can complete a work in 12 days and B can complete it in 15 days. "
+                  "In how many days will they complete the work together?", "6.67 days"),
+    ("time_work", "A and B together can do a work in 12 days. A alone can do it in 20 days. "
+                  "In how many days can B alone do it?", "30 days"),
+    ("time_work", "A and B can do a job in 12 days, B and C in 15 days, C and A in 20 days. "
+                  "In how many days can A alone finish the work?", "30 days"),
+    ("time_work", "A, B and C can do a job in 10, 12 and 15 days respectively. "
+                  "In how many days will they finish the work together?", "4 days"),
+    ("time_work", "A can do a work in 15 days. He works for 5 days and then B finishes the rest in 10 days. "
+                  "In how many days can B alone do it?", "15 days"),
+    ("speed_distance", "A car covers 240 km in 4 hours. Find its speed.", "60 km/h"),
+    ("speed_distance", "A train 150 m long running at 54 km/h crosses a pole. Find the time taken.", "10 seconds"),
+    ("speed_distance", "A bus travels at 45 km/h for 3 hours. Find the distance covered.", "135 km"),
+    ("simple_interest", "Find the simple interest on ₹5000 at 8% per annum for 3 years.", "₹1200.00"),
+    ("simple_interest", "A sum of ₹2000 amounts to ₹2600 in 5 years at simple interest. "
+                        "Find the rate of interest.", "6%"),
+    ("simple_interest", "At what principal will the simple interest be ₹900 at 6% per annum for 5 years? "
+                        "Find the principal.", "₹3000.00"),
+    ("simple_interest", "Simple interest on a sum at 5% per annum for 4 years is ₹400. Find the sum.", "₹2000.00"),
+    ("simple_interest", "The simple interest on a certain sum for 3 years at 10% per annum is ₹900. "
+                        "Find the sum.", "₹3000.00"),
+    ("compound_interest", "Find the compound interest on ₹10000 at 10% per annum for 2 years, "
+                          "compounded annually.", "₹2100.00"),
+    ("compound_interest", "Find the amount on ₹8000 at 10% per annum compound interest for 1 year, "
+                          "compounded half-yearly.", "₹8820.00"),
+    ("compound_interest", "The compound interest on a sum for 2 years at 10% per annum is ₹420. "
+                          "Find the sum.", "₹2000.00"),
+    ("ratio_proportion", "Divide ₹1200 in the ratio 2:3.", "₹480, ₹720"),
+    ("ratio_proportion", "The ratio of boys to girls in a class is 3:5. If boys are 45, "
+                         "find the number of girls.", "75"),
+    ("chained_transaction", "A sells an item to B at 20 % profit.\nB sells it to C at 10 % loss.\n"
+                            "C pays ₹ 594.\nFind A’s cost price.", "₹550.00"),
+    # Wording the engine cannot model; None means it must decline the
+    # question rather than answer it.
+    ("time_work", "A and B can do a work in 10 days. They work together for 4 days, then A leaves. "
+                  "In how many days will B finish the remaining work alone?", None),
+    ("simple_interest", "A man pays ₹300 as fees and ₹200 as simple interest at 5% per annum for 2 years. "
+                        "Find the principal.", None),
+]
+
+
+def percentile(sorted_values, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def loadtest_payloads(n: int, endpoint: str, seed: int = 42):
+    # Question-only bodies for /solve and /render (so the solver does the
+    # work), full question + solution for /validate.
+    rng = random.Random(seed)
+    payloads = []
+    for _ in range(n):
+        question, _, solution = generate_question(rng).partition("Sol:")
+        body = {"question": question.strip()[len("Q."):].strip()}
+        if endpoint == 'validate':
+            body["solution"] = solution.strip()
+        payloads.append(json.dumps(body).encode('utf-8'))
+    return payloads
+
+
+async def _http_request(reader, writer, host: str, method: str, path: str, body: bytes = b""):
+    writer.write((f"{method} {path} HTTP/1.1\r\nHost: {host}\r\n"
+                  f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n").encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+
+async def _load_run(host: str, port: int, path: str, payloads, n: int, concurrency: int):
+    import asyncio
+
+    latencies = []
+    statuses = {}
+    counter = iter(range(n))
+
+    async def client():
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            for i in counter:
+                start = time.perf_counter()
+                status, _ = await _http_request(reader, writer, host, "POST", path, payloads[i % len(payloads)])
+                latencies.append((status, time.perf_counter() - start))
+                statuses[status] = statuses.get(status, 0) + 1
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(host, port)
+    _, health = await _http_request(reader, writer, host, "GET", "/health")
+    writer.close()
+    return latencies, statuses, elapsed, json.loads(health)
+
+
+def start_server(port: int, server_args) -> subprocess.Popen:
+    here = os.path.dirname(os.path.abspath(__file__))
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(here, 'server.py'), '--port', str(port)] + list(server_args),
+        stdout=subprocess.PIPE, text=True, cwd=here
+    )
+    line = proc.stdout.readline()
+    if "Serving" not in line:
+        proc.kill()
+        raise RuntimeError("server.py did not start")
+    return proc
+
+
+def bench_loadtest(n: int, concurrency: int, endpoint: str, url: str = None, server_args=()):
+    import asyncio
+    import socket
+
+    proc = None
+    if url:
+        host, _, port = url.replace("http://", "").rstrip("/").partition(":")
+        port = int(port or 80)
+    else:
+        with socket.socket() as s:
+            s.bind(('127.0.0.1', 0))
+            host, port = s.getsockname()
+        proc = start_server(port, server_args)
+
+    try:
+        payloads = loadtest_payloads(min(n, 1000), endpoint)
+        latencies, statuses, elapsed, health = asyncio.run(
+            _load_run(host, port, f"/{endpoint}", payloads, n, concurrency)
+        )
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+    # Percentiles cover answered (200) requests; shed requests return at once.
+    ok = sorted(seconds for status, seconds in latencies if status == 200)
+    print(f"/{endpoint}: {n} requests, concurrency {concurrency}")
+    print(f"  throughput  {len(ok) / elapsed:10.1f} req/s answered ({elapsed:.2f}s)")
+    for label, pct in (("p50", 50), ("p90", 90), ("p99", 99), ("max", 100)):
+        print(f"  {label:<10}  {percentile(ok, pct) * 1000:10.2f} ms")
+    print(f"  status      {', '.join(f'{k}: {v}' for k, v in sorted(statuses.items()))}")
+    for stage in ('solve', 'render'):
+        stats = health.get(stage, {})
+        if stats.get("batches"):
+            print(f"  {stage} batches {stats['batches']}, mean size {stats['mean_batch']}, "
+                  f"largest {stats['largest_batch']}, shed {stats['shed']}, expired {stats['expired']}")
+    return statuses
+
+
+def bench_engine(repeat: int):
+    from ai_solver import MathSolver
+    from equation_engine import EquationEngine
+    from question_automation import QuestionAnalyzer
+    from solver_cache import SolverCache
+
+    # No memo cache, so every timed call runs the engine.
+    solver = MathSolver(cache=SolverCache(maxsize=0))
+    engine = EquationEngine()
+    analyzer = QuestionAnalyzer()
+    failures = 0
+    print(f"{'type':>20} {'answer':>12} {'expected':>12} {'µs/solve':>10}")
+    for kind, text, expected in ENGINE_CASES:
+        q = {"raw_text": text, "question_type": analyzer.detect_question_type(text)}
+        if expected is None:
+            solution = engine.solve(q["question_type"], text)
+            answer = solution["answer"] if solution else None
+        else:
+            answer = solver.solve_question(q)["answer"]
+        start = time.perf_counter()
+        for _ in range(repeat):
+            solver.solve_question(q)
+        micros = (time.perf_counter() - start) / repeat * 1e6
+        status = "" if answer == expected else "  FAIL"
+        failures += answer != expected
+        print(f"{kind:>20} {str(answer):>12} {str(expected):>12} {micros:>10.1f}{status}")
+    print(f"{len(ENGINE_CASES) - failures}/{len(ENGINE_CASES)} correct")
+    return failures
+
+
+SUITE_STAGES = ('analyze', 'solve', 'render', 'validate')
+
+
+def stage_summary(latencies) -> Dict:
+    values = sorted(latencies)
+    total = sum(values)
+    return {
+        "count": len(values),
+        "seconds": round(total, 4),
+        "qps": round(len(values) / total, 1) if total else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 4),
+        "p90_ms": round(percentile(values, 90) * 1000, 4),
+        "p99_ms": round(percentile(values, 99) * 1000, 4),
+        "max_ms": round(percentile(values, 100) * 1000, 4),
+    }
+
+
+def run_suite(n: int, seed: int = 42, mix: Optional[Dict[str, float]] = None, worked: float = 0.5,
+              render_limit: int = 1000, output_format: str = 'jsonl', keep: Optional[str] = None) -> Dict:
+    # One streaming pass over a generated bank, timing every stage of
+    # QuestionToVisualPipeline per question. Rendering is limited to the first
+    # render_limit questions (about 40 ms each), the other stages see all n.
+    import platform
+    import shutil
+    from dataclasses import asdict
+    from main_pipeline import QuestionToVisualPipeline
+
+    mix = mix or parse_mix('all')
+    workdir = keep or tempfile.mkdtemp(prefix="bench_suite_")
+    try:
+        start = time.perf_counter()
+        bank = generate_bank(os.path.join(workdir, "bank.txt"), n, seed, mix, worked)
+        generate_seconds = time.perf_counter() - start
+        rss_before = peak_rss_kb()
+
+        pipeline = QuestionToVisualPipeline(os.path.join(workdir, "outputs"), output_format=output_format)
+        report = pipeline.save_manager.report_builder()
+        timings = {stage: array('d') for stage in SUITE_STAGES}
+        clock = time.perf_counter
+        questions = iter(pipeline.converter.iter_file(bank))
+
+        start = clock()
+        i = 0
+        while True:
+            t0 = clock()
+            q = next(questions, None)
+            if q is None:
+                break
+            q = asdict(q)
+            i += 1
+            t1 = clock()
+            q = pipeline.solve_one(q)
+            t2 = clock()
+            if i <= render_limit:
+                pipeline.render_one(q, i)
+            t3 = clock()
+            pipeline.save_one(q, i)
+            report.add(i, q['validation'])
+            t4 = clock()
+            timings['analyze'].append(t1 - t0)
+            timings['solve'].append(t2 - t1)
+            if i <= render_limit:
+                timings['render'].append(t3 - t2)
+            timings['validate'].append(t4 - t3)
+        with contextlib.redirect_stdout(io.StringIO()):
+            report.finish()
+            pipeline.finish()
+        wall = clock() - start
+    finally:
+        if keep is None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "meta": {
+            "questions": i,
+            "seed": seed,
+            "mix": mix,
+            "worked": worked,
+            "render_limit": render_limit,
+            "output_format": output_format,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "generate_seconds": round(generate_seconds, 3),
+        "wall_seconds": round(wall, 3),
+        "qps": round(i / wall, 1) if wall else 0.0,
+        "peak_rss_kb": peak_rss_kb(),
+        "rss_before_pipeline_kb": rss_before,
+        "stages": {stage: stage_summary(timings[stage]) for stage in SUITE_STAGES},
+    }
+
+
+def print_suite(result: Dict):
+    meta = result["meta"]
+    print(f"{meta['questions']} questions (seed {meta['seed']}, worked {meta['worked']:.0%}), "
+          f"{result['qps']:.0f} q/s end to end, peak RSS {result['peak_rss_kb'] / 1024:.1f} MB")
+    print(f"{'stage':>9} {'count':>9} {'q/s':>10} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for stage, s in result["stages"].items():
+        print(f"{stage:>9} {s['count']:>9} {s['qps']:>10.0f} {s['p50_ms']:>9.3f} "
+              f"{s['p90_ms']:>9.3f} {s['p99_ms']:>9.3f} {s['max_ms']:>9.3f}")
+
+
+def compare_results(current: Dict, baseline: Dict, threshold: float = 0.10) -> List[str]:
+    # Flags stages whose throughput fell, or whose p50/p99 latency rose, by
+    # more than threshold relative to the baseline, plus peak RSS growth.
+    checks = [("qps", True), ("p50_ms", False), ("p99_ms", False)]
+    regressions = []
+    print(f"{'stage':>9} {'metric':>7} {'baseline':>11} {'current':>11} {'change':>8}")
+    for stage, cur in current["stages"].items():
+        base = baseline.get("stages", {}).get(stage)
+        if not base or not cur["count"]:
+            continue
+        for metric, higher_is_better in checks:
+            b, c = base.get(metric), cur.get(metric)
+            if not b or c is None:
+                continue
+            change = (c - b) / b
+            worse = -change if higher_is_better else change
+            flag = "  SLOWER" if worse > threshold else ""
+            if flag:
+                regressions.append(f"{stage} {metric}: {b} -> {c} ({change:+.1%})")
+            print(f"{stage:>9} {metric:>7} {b:>11.3f} {c:>11.3f} {change:>+8.1%}{flag}")
+
+    b, c = baseline.get("peak_rss_kb"), current.get("peak_rss_kb")
+    if b and c:
+        change = (c - b) / b
+        flag = "  MORE MEMORY" if change > threshold else ""
+        if flag:
+            regressions.append(f"peak_rss_kb: {b} -> {c} ({change:+.1%})")
+        print(f"{'total':>9} {'rss MB':>7} {b / 1024:>11.1f} {c / 1024:>11.1f} {change:>+8.1%}{flag}")
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {threshold:.0%}:")
+        for line in regressions:
+            print(f"  {line}")
+    else:
+        print(f"\nNo regressions over {threshold:.0%}")
+    return regressions
+
+
+def bench_suite(n: int, seed: int, mix: str, worked: float, render_limit: int, output_format: str,
+                output: Optional[str], baseline: Optional[str], threshold: float, keep: Optional[str]) -> bool:
+    result = run_suite(n, seed, parse_mix(mix), worked, render_limit, output_format, keep)
+    print_suite(result)
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+        print(f"Results saved: {output}")
+    if baseline:
+        print(f"\nCompared with {baseline}:")
+        with open(baseline, 'r', encoding='utf-8') as f:
+            return not compare_results(result, json.load(f), threshold)
+    return True
+
+
+def bench_compare(current: str, baseline: str, threshold: float) -> bool:
+    with open(current, 'r', encoding='utf-8') as f:
+        current_result = json.load(f)
+    with open(baseline, 'r', encoding='utf-8') as f:
+        baseline_result = json.load(f)
+    return not compare_results(current_result, baseline_result, threshold)
+
+
+REWORDINGS = [("Find", "Calculate"), ("find", "calculate"), ("What is", "Find"), ("sells", "sold"),
+              ("article", "item"), ("original", "initial")]
+
+
+def perturb_question(rng: random.Random, text: str) -> str:
+    # The kind of copy merged banks contain: re-flowed whitespace, changed
+    # case or punctuation, Rs. for ₹, or one reworded phrase.
+    for _ in range(rng.randint(1, 2)):
+        edit = rng.randrange(5)
+        if edit == 0:
+            words = text.split(' ')
+            text = ''.join(w + rng.choice((' ', '  ', '\n')) for w in words).rstrip()
+        elif edit == 1:
+            text = text.upper() if rng.random() < 0.5 else text.lower()
+        elif edit == 2:
+            text = text.replace('.', '') if '.' in text else text + '.'
+        elif edit == 3:
+            text = text.replace('₹', 'Rs. ')
+        else:
+            old, new = rng.choice(REWORDINGS)
+            text = text.replace(old, new, 1)
+    return text
+
+
+# (question, later question, whether the later one is a near-duplicate).
+# The negative pairs share wording and numbers but ask for another quantity.
+DEDUP_CASES = [
+    ("A shopkeeper marks his goods 40% above the cost price. The marked price is Rs. 1400, find the cost price.",
+     "A shopkeeper marks his goods 40% above the cost price. The marked price is Rs. 1400, find the selling price.",
+     False),
+    ("A sum of Rs. 5000 is lent at 8% per annum simple interest for 3 years. Find the interest.",
+     "A sum of Rs. 5000 is lent at 8% per annum simple interest for 3 years. Find the amount.", False),
+    ("A trader sells an article at a profit of 20%. If the cost price is ₹500, find the original selling price.",
+     "A TRADER SELLS AN ARTICLE AT A PROFIT OF 20%. IF THE COST PRICE IS RS. 500, FIND THE ORIGINAL SELLING PRICE",
+     True),
+    ("A can do a work in 12 days and B in 15 days. In how many days will they finish it together?",
+     "A can do a work in 12 days and B in 15 days.\nIn how many days will  they finish it together", True),
+]
+
+
+def bench_dedup(sizes, dup_rate: float, threshold: float, seed: int = 42):
+    from dedup import NearDuplicateIndex, normalize_question
+
+    failures = 0
+    for first, second, duplicate in DEDUP_CASES:
+        index = NearDuplicateIndex(threshold)
+        index.add(1, first)
+        match = index.add(2, second)
+        if (match is not None) != duplicate:
+            failures += 1
+            print(f"FAIL: expected {'a' if duplicate else 'no'} match for {second!r} (got {match})")
+    print(f"{len(DEDUP_CASES) - failures}/{len(DEDUP_CASES)} pair cases correct\n")
+
+    print(f"{'questions':>10} {'injected':>9} {'seconds':>8} {'q/s':>7} {'unique':>9} {'ratio':>6} "
+          f"{'recall':>7} {'false':>6} {'KB/unique':>9}")
+    topics = list(TOPICS)
+    for n in sizes:
+        rng = random.Random(seed)
+        index = NearDuplicateIndex(threshold)
+        # origin[i]: hash of the normalized text question i was made from;
+        # a merge is correct when both questions share it.
+        origin = array('q', bytes(8 * (n + 1)))
+        originals = []
+        injected = caught = false_merges = 0
+        elapsed = 0.0
+        for i in range(1, n + 1):
+            copy = bool(originals) and rng.random() < dup_rate
+            if copy:
+                source, source_hash = originals[rng.randrange(len(originals))]
+                text = perturb_question(rng, source)
+                origin[i] = source_hash
+                injected += 1
+            else:
+                text = TOPICS[rng.choice(topics)](rng)[0]
+                origin[i] = hash(normalize_question(text))
+                originals.append((text, origin[i]))
+            start = time.perf_counter()
+            match = index.add(i, text)
+            elapsed += time.perf_counter() - start
+            if match is not None:
+                if origin[match[0]] != origin[i]:
+                    false_merges += 1
+                elif copy:
+                    caught += 1
+        # The ratio also includes exact repeats the generator produces by chance;
+        # recall is over the injected copies only.
+        stats = index.stats()
+        print(f"{n:>10} {injected:>9} {elapsed:>8.2f} {n / elapsed:>7.0f} {stats['unique']:>9} "
+              f"{stats['dedup_ratio']:>6.1%} {caught / injected if injected else 1.0:>7.1%} "
+              f"{false_merges:>6} {index.memory_bytes() / 1024 / stats['unique']:>9.2f}")
+    return failures
+
+
+# Test PDFs use the built-in Helvetica font with WinAnsiEncoding (cp1252),
+# so the few symbols outside it are spelled out.
+PDF_TEXT = str.maketrans({"₹": "Rs.", "→": "->", "−": "-", "≈": "~"})
+
+
+def pdf_string(line: str) -> bytes:
+    text = line.translate(PDF_TEXT).encode('cp1252', errors='replace')
+    return b"(" + text.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+def write_test_pdf(lines, path: str, lines_per_page: int = 50) -> int:
+    # Streams lines onto A4 pages with a page-number footer and writes a
+    # minimal PDF 1.4 file (no dependencies). Returns the page count.
+    offsets = {}
+    kids = []
+    with open(path, 'wb') as f:
+        def write_object(number: int, body: bytes):
+            offsets[number] = f.tell()
+            f.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+
+        f.write(b"%PDF-1.4\n")
+        write_object(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        write_object(3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+        page = []
+        lines = iter(lines)
+        while True:
+            line = next(lines, None)
+            if line is not None:
+                page.append(line.rstrip("\n"))
+            if len(page) == lines_per_page or (line is None and page):
+                number = 4 + 2 * len(kids)
+                content = (b"BT /F1 9 Tf 14 TL 40 800 Td\n"
+                           + b"".join(pdf_string(text) + b" Tj T*\n" for text in page)
+                           + b"T* (%d) Tj\nET" % (len(kids) + 1))
+                write_object(number, b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                                     b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (number + 1))
+                write_object(number + 1, b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+                kids.append(number)
+                page = []
+            if line is None:
+                break
+        write_object(2, b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % k for k in kids)
+                     + b"] /Count %d >>" % len(kids))
+        xref = f.tell()
+        size = max(offsets) + 1
+        f.write(b"xref\n0 %d\n0000000000 65535 f \n" % size)
+        for number in range(1, size):
+            f.write(b"%010d 00000 n \n" % offsets[number])
+        f.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, xref))
+    return len(kids)
+
+
+def question_digest(questions) -> tuple:
+    import hashlib
+    from dataclasses import asdict
+    digest = hashlib.sha256()
+    count = 0
+    for q in questions:
+        digest.update(json.dumps(asdict(q), sort_keys=True, ensure_ascii=False).encode('utf-8'))
+        count += 1
+    return count, digest.hexdigest()
+
+
+def bench_pdf(pages: int, workers: List[int], chunk_pages: int, keep: Optional[str]):
+    from json_converter import DatasetToJSON
+    from pdf_ingest import iter_pdf_questions
+
+    lines_per_page = 50
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = keep or tmp
+        os.makedirs(workdir, exist_ok=True)
+        # Questions are 3-11 lines long, so many of them cross a page break.
+        # The bank is cut at exactly `pages` pages of lines. Every 10th page
+        # ends with "40" and the next starts with "3/4": bare answer lines
+        # that must not be taken for page numbers.
+        bank = generate_bank(os.path.join(workdir, "bank.txt"), pages * lines_per_page // 3, mix=parse_mix('all'))
+        text_path = os.path.join(workdir, "bank_pdf_text.txt")
+        pdf_path = os.path.join(workdir, "bank.pdf")
+        start = time.perf_counter()
+        with open(bank, 'r', encoding='utf-8') as src, open(text_path, 'w', encoding='utf-8') as dst:
+            for i, line in zip(range(pages * lines_per_page), src):
+                edge = {lines_per_page - 1: "40\n", lines_per_page: "3/4\n"}.get(i % (10 * lines_per_page))
+                dst.write(edge or line.translate(PDF_TEXT))
+        with open(text_path, 'r', encoding='utf-8') as f:
+            pages = write_test_pdf(f, pdf_path, lines_per_page)
+        print(f"Wrote {pages} pages ({os.path.getsize(pdf_path) / 1e6:.1f} MB) in {time.perf_counter() - start:.1f}s")
+
+        converter = DatasetToJSON()
+        start = time.perf_counter()
+        expected = question_digest(converter.iter_file(text_path))
+        text_seconds = time.perf_counter() - start
+        print(f"Text file: {expected[0]} questions in {text_seconds:.2f}s\n")
+
+        print(f"{'workers':>8} {'seconds':>8} {'pages/s':>8} {'q/s':>8} {'speedup':>8}  questions match")
+        baseline = None
+        for w in workers:
+            start = time.perf_counter()
+            got = question_digest(iter_pdf_questions(pdf_path, converter, w, chunk_pages))
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"{w:>8} {elapsed:>8.2f} {pages / elapsed:>8.0f} {got[0] / elapsed:>8.0f} "
+                  f"{baseline / elapsed:>7.2f}x  {'yes' if got == expected else 'NO'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Logical pipeline benchmarks")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    ingest = sub.add_parser('ingest', help="Peak RSS of eager vs streaming ingestion")
+    ingest.add_argument('--sizes', default='1000,10000,50000')
+
+    scaling = sub.add_parser('scaling', help="Pipeline throughput for 1..N workers")
+    scaling.add_argument('-n', type=int, default=500)
+    scaling.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+
+    render = sub.add_parser('render', help="Visual rendering throughput, serial vs pool")
+    render.add_argument('-n', type=int, default=500)
+    render.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+
+    visual = sub.add_parser('visual', help="generate_visual images/s with and without caches")
+    visual.add_argument('-n', type=int, default=500)
+
+    solver = sub.add_parser('solver', help="MathSolver scalar loop vs solve_batch")
+    solver.add_argument('-n', type=int, default=100000)
+
+    memory = sub.add_parser('memory', help="Memory of dict questions vs slotted QuestionRecords")
+    memory.add_argument('-n', type=int, default=100000)
+
+    validate = sub.add_parser('validate', help="Per-question validation vs QuestionValidator.validate_many")
+    validate.add_argument('-n', type=int, default=1000000)
+
+    report = sub.add_parser('report', help="List-based vs streaming validation report")
+    report.add_argument('-n', type=int, default=1000000)
+
+    store = sub.add_parser('store', help="Per-question JSON files vs sharded JSONL output")
+    store.add_argument('-n', type=int, default=20000)
+
+    engine = sub.add_parser('engine', help="Equation engine correctness and per-type latency")
+    engine.add_argument('--repeat', type=int, default=2000)
+
+    loadtest = sub.add_parser('loadtest', help="Latency percentiles and throughput of server.py")
+    loadtest.add_argument('-n', type=int, default=2000)
+    loadtest.add_argument('-c', '--concurrency', type=int, default=32)
+    loadtest.add_argument('--endpoint', choices=('solve', 'render', 'validate'), default='solve')
+    loadtest.add_argument('--url', help="Running server (host:port); default starts server.py on a free port")
+    loadtest.add_argument('server_args', nargs=argparse.REMAINDER,
+                          help="Extra server.py options after --, e.g. -- --max-batch 64")
+
+    suite = sub.add_parser('suite', help="Per-stage throughput, latency percentiles and peak RSS as JSON")
+    suite.add_argument('-n', type=int, default=10000, help="Questions in the generated bank (1k to 1M)")
+    suite.add_argument('--seed', type=int, default=42)
+    suite.add_argument('--mix', default='all', help="Topic weights, e.g. profit_loss=3,time_work=1")
+    suite.add_argument('--worked', type=float, default=0.5,
+                       help="Fraction of questions that come with worked solution steps")
+    suite.add_argument('--render-limit', type=int, default=1000, help="Questions to render")
+    suite.add_argument('--format', choices=('files', 'jsonl'), default='jsonl')
+    suite.add_argument('-o', '--output', help="Write the results as JSON")
+    suite.add_argument('--baseline', help="Results JSON to compare against")
+    suite.add_argument('--threshold', type=float, default=0.10, help="Allowed slowdown (0.10 = 10%%)")
+    suite.add_argument('--keep', help="Keep the bank and outputs in this directory")
+
+    compare = sub.add_parser('compare', help="Compare two suite result files")
+    compare.add_argument('current')
+    compare.add_argument('baseline')
+    compare.add_argument('--threshold', type=float, default=0.10)
+
+    pdf = sub.add_parser('pdf', help="Page-parallel PDF ingestion throughput on a generated PDF")
+    pdf.add_argument('--pages', type=int, default=3000)
+    pdf.add_argument('--workers', default=None, help="Comma-separated worker counts (default: 1..CPU count)")
+    pdf.add_argument('--chunk-pages', type=int, default=16)
+    pdf.add_argument('--keep', help="Keep the bank and PDF in this directory")
+
+    dedup = sub.add_parser('dedup', help="Near-duplicate index throughput, recall and dedup ratio")
+    dedup.add_argument('--sizes', default='10000,100000', help="Comma-separated question counts")
+    dedup.add_argument('--dup-rate', type=float, default=0.3, help="Fraction of questions that are perturbed copies")
+    dedup.add_argument('--threshold', type=float, default=0.8)
+
+    child = sub.add_parser('_ingest')
+    child.add_argument('path')
+    child.add_argument('mode')
+
+    gen = sub.add_parser('generate', help="Write a synthetic Q./Sol: question bank")
+    gen.add_argument('path')
+    gen.add_argument('-n', type=int, default=1000)
+    gen.add_argument('--seed', type=int, default=42)
+    gen.add_argument('--mix', help="Topic weights (e.g. all, or profit_loss=3,time_work=1)")
+    gen.add_argument('--worked', type=float, default=1.0,
+                     help="Fraction of mixed-topic questions with worked solution steps")
+
+    args = parser.parse_args()
+
+    if args.command == 'ingest':
+        bench_ingest([int(s) for s in args.sizes.split(',')])
+    elif args.command == 'scaling':
+        bench_scaling(args.n, args.max_workers)
+    elif args.command == 'render':
+        bench_render(args.n, args.workers)
+    elif args.command == 'visual':
+        bench_visual(args.n)
+    elif args.command == 'solver':
+        bench_solver(args.n)
+    elif args.command == 'memory':
+        bench_memory(args.n)
+    elif args.command == 'validate':
+        sys.exit(0 if bench_validate(args.n) else 1)
+    elif args.command == 'report':
+        bench_report(args.n)
+    elif args.command == 'store':
+        bench_store(args.n)
+    elif args.command == 'engine':
+        sys.exit(1 if bench_engine(args.repeat) else 0)
+    elif args.command == 'loadtest':
+        server_args = [a for a in args.server_args if a != '--']
+        bench_loadtest(args.n, args.concurrency, args.endpoint, args.url, server_args)
+    elif args.command == 'suite':
+        ok = bench_suite(args.n, args.seed, args.mix, args.worked, args.render_limit, args.format,
+                         args.output, args.baseline, args.threshold, args.keep)
+        sys.exit(0 if ok else 1)
+    elif args.command == 'compare':
+        sys.exit(0 if bench_compare(args.current, args.baseline, args.threshold) else 1)
+    elif args.command == 'pdf':
+        if args.workers:
+            workers = [int(w) for w in args.workers.split(',')]
+        else:
+            workers = [1]
+            while workers[-1] * 2 <= (os.cpu_count() or 1):
+                workers.append(workers[-1] * 2)
+        bench_pdf(args.pages, workers, args.chunk_pages, args.keep)
+    elif args.command == 'dedup':
+        sys.exit(1 if bench_dedup([int(s) for s in args.sizes.split(',')], args.dup_rate, args.threshold) else 0)
+    elif args.command == '_ingest':
+        _ingest_child(args.path, args.mode)
+    elif args.command == 'generate':
+        generate_bank(args.path, args.n, args.seed, parse_mix(args.mix) if args.mix else None, args.worked)
+        print(f"Wrote {args.n} questions to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
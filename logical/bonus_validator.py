@@ -1,9 +1,80 @@
 # Task 5 (Bonus): Auto-save outputs and detect invalid/meaningless questions
 import json
 import os
-from typing import Dict, List, Tuple
+import shutil
+import tempfile
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
 import re
 from datetime import datetime
+from record_store import JsonlRecordWriter
+from question_automation import QuestionRecord, ValidationResult
+
+# Result codes used by validate_many; index 0 is always "Valid".
+QUESTION_MESSAGES = ("Valid", "Question too short", "No numerical data found",
+                     "No question indicator found", "Appears to be gibberish",
+                     "Too many special characters")
+SOLUTION_MESSAGES = ("Valid", "No solution steps provided", "Solution too brief",
+                     "No mathematical operations in solution")
+ANSWER_MESSAGES = ("Valid", "No answer provided", "Answer doesn't contain numerical value")
+
+COMMON_WORDS = frozenset(['the', 'a', 'an', 'is', 'of', 'to', 'in', 'and', 'or'])
+# A whitespace-delimited common word, i.e. "not COMMON_WORDS.isdisjoint(text.split())"
+# without building the token list.
+COMMON_WORDS_RE = re.compile(r'(?<!\S)(?:' + '|'.join(sorted(COMMON_WORDS)) + r')(?!\S)')
+EMPTY_ANSWERS = frozenset(['n/a', 'not found', 'none', ''])
+DIGIT_RE = re.compile(r'\d')
+MATH_RE = re.compile('[' + re.escape('=+-×÷%/*') + ']')
+NON_ASCII_RE = re.compile(r'[^\x00-\x7f]+')
+ASCII_LETTERS = b'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+def count_alpha(text: str) -> int:
+    # sum(c.isalpha() for c in text), counting ASCII letters with a bytes
+    # translate and only checking the (usually few) non-ASCII characters.
+    ascii_part = text.encode('ascii', 'ignore')
+    count = len(ascii_part) - len(ascii_part.translate(None, ASCII_LETTERS))
+    if len(ascii_part) != len(text):
+        count += sum(map(str.isalpha, ''.join(NON_ASCII_RE.findall(text))))
+    return count
+
+class ValidationBatch:
+    # Compact per-question result codes from QuestionValidator.validate_many,
+    # indexing into QUESTION_MESSAGES / SOLUTION_MESSAGES / ANSWER_MESSAGES.
+    __slots__ = ('question', 'solution', 'answer')
+    
+    def __init__(self):
+        self.question = array('B')
+        self.solution = array('B')
+        self.answer = array('B')
+    
+    def __len__(self) -> int:
+        return len(self.question)
+    
+    def is_valid(self, i: int) -> bool:
+        return self.question[i] == 0
+    
+    def valid_count(self) -> int:
+        return self.question.count(0)
+    
+    def messages(self, i: int) -> Tuple[str, str, str]:
+        return (QUESTION_MESSAGES[self.question[i]],
+                SOLUTION_MESSAGES[self.solution[i]],
+                ANSWER_MESSAGES[self.answer[i]])
+    
+    def validation(self, i: int) -> Dict:
+        # The dict AutoSaveManager.validate_and_categorize stores for question i.
+        return validation_from_codes(self.question[i], self.solution[i], self.answer[i])
+
+def validation_from_codes(question_code: int, solution_code: int, answer_code: int) -> Dict:
+    result = {"is_valid": question_code == 0, "errors": [], "warnings": []}
+    if question_code:
+        result["errors"].append(f"Question: {QUESTION_MESSAGES[question_code]}")
+    if solution_code:
+        result["warnings"].append(f"Solution: {SOLUTION_MESSAGES[solution_code]}")
+    if answer_code:
+        result["warnings"].append(f"Answer: {ANSWER_MESSAGES[answer_code]}")
+    return result
 
 class QuestionValidator:
     
@@ -11,6 +82,7 @@ class QuestionValidator:
         self.min_question_length = 20
         self.min_numbers_required = 1
         self.required_elements = ['?', 'find', 'calculate', 'what', 'how']
+        self.indicator_re = re.compile('|'.join(re.escape(e) for e in self.required_elements))
     
     def is_valid_question(self, question_text: str) -> Tuple[bool, str]:
         text = question_text.lower().strip()
@@ -63,11 +135,161 @@ class QuestionValidator:
             return False, "Answer doesn't contain numerical value"
         
         return True, "Valid"
+    
+    def question_code(self, question_text: str) -> int:
+        # Same checks and order as is_valid_question, with precompiled patterns.
+        text = question_text.lower().strip()
+        if len(text) < self.min_question_length:
+            return 1
+        if self.min_numbers_required == 1:
+            if DIGIT_RE.search(text) is None:
+                return 2
+        elif len(re.findall(r'\d+', text)) < self.min_numbers_required:
+            return 2
+        if self.indicator_re.search(text) is None:
+            return 3
+        if COMMON_WORDS_RE.search(text) is None:
+            return 4
+        if count_alpha(text) / len(text) < 0.5:
+            return 5
+        return 0
+    
+    def solution_code(self, solution_steps: List[str]) -> int:
+        if not solution_steps:
+            return 1
+        if len(solution_steps) < 2:
+            return 2
+        if not any(map(MATH_RE.search, solution_steps)):
+            return 3
+        return 0
+    
+    def answer_code(self, answer: str) -> int:
+        if not answer or answer.lower() in EMPTY_ANSWERS:
+            return 1
+        if DIGIT_RE.search(answer) is None:
+            return 2
+        return 0
+    
+    def validate_question(self, q: Dict) -> Dict:
+        # validate_many for a single question dict, without building a batch.
+        return validation_from_codes(
+            self.question_code(q.get('raw_text', '')),
+            self.solution_code(q.get('solution_steps', [])),
+            self.answer_code(q.get('answer', ''))
+        )
+    
+    def validate_many(self, questions: Iterable) -> ValidationBatch:
+        # Validates question dicts or QuestionRecords in one pass, returning
+        # result codes equivalent to is_valid_question / validate_solution /
+        # validate_answer for each question.
+        batch = ValidationBatch()
+        question_codes = batch.question.append
+        solution_codes = batch.solution.append
+        answer_codes = batch.answer.append
+        question_code = self.question_code
+        solution_code = self.solution_code
+        answer_code = self.answer_code
+        
+        for q in questions:
+            if isinstance(q, dict):
+                text = q.get('raw_text', '')
+                steps = q.get('solution_steps', [])
+                answer = q.get('answer', '')
+            else:
+                text, steps, answer = q.raw_text, q.solution_steps, q.answer
+            
+            question_codes(question_code(text))
+            solution_codes(solution_code(steps))
+            answer_codes(answer_code(answer))
+        
+        return batch
+
+def report_header(total: int, valid_count: int) -> str:
+    invalid_count = total - valid_count
+    valid_pct = valid_count / total * 100 if total else 0.0
+    invalid_pct = invalid_count / total * 100 if total else 0.0
+    return f"""
+=== Validation Report ===
+Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+
+Total Questions: {total}
+Valid Questions: {valid_count} ({valid_pct:.1f}%)
+Invalid Questions: {invalid_count} ({invalid_pct:.1f}%)
+
+Invalid Questions Details:
+"""
+
+class ValidationReportBuilder:
+    # Builds the validation report while questions are being validated:
+    # counters and error/warning histograms are updated per question and
+    # invalid-question details are appended to a scratch file, so memory stays
+    # constant. finish() writes the text report (same format as
+    # generate_validation_report) plus a JSON summary next to it.
+    
+    def __init__(self, logs_dir: str):
+        os.makedirs(logs_dir, exist_ok=True)
+        self.report_path = os.path.join(
+            logs_dir, f"validation_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+        )
+        self.summary_path = self.report_path[:-len(".txt")] + ".json"
+        self.total = 0
+        self.valid = 0
+        self.errors = Counter()
+        self.warnings = Counter()
+        self.details = tempfile.NamedTemporaryFile(
+            'w+', encoding='utf-8', dir=logs_dir, prefix=".validation_details_", delete=False
+        )
+    
+    def add(self, q_number: int, validation: Dict):
+        self.total += 1
+        errors = validation.get('errors', [])
+        for error in errors:
+            self.errors[error] += 1
+        for warning in validation.get('warnings', []):
+            self.warnings[warning] += 1
+        if validation.get('is_valid', False):
+            self.valid += 1
+        elif not validation.get('is_valid', True):
+            self.details.write(f"\nQ{q_number}: {', '.join(errors)}")
+    
+    def summary(self) -> Dict:
+        return {
+            "generated": datetime.now().isoformat(timespec='seconds'),
+            "total": self.total,
+            "valid": self.valid,
+            "invalid": self.total - self.valid,
+            "valid_pct": round(self.valid / self.total * 100, 2) if self.total else 0.0,
+            "errors": dict(self.errors.most_common()),
+            "warnings": dict(self.warnings.most_common()),
+            "report": os.path.basename(self.report_path)
+        }
+    
+    def finish(self) -> str:
+        with open(self.report_path, 'w', encoding='utf-8') as f:
+            f.write(report_header(self.total, self.valid))
+            self.details.seek(0)
+            shutil.copyfileobj(self.details, f)
+        self.details.close()
+        os.remove(self.details.name)
+        
+        with open(self.summary_path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, indent=2, ensure_ascii=False)
+        
+        print(f"Validation report saved: {self.report_path}")
+        return self.report_path
 
 class AutoSaveManager:
     
-    def __init__(self, output_base_dir="outputs"):
+    def __init__(self, output_base_dir="outputs", output_format="files", **store_options):
+        # output_format "files" writes one pretty-printed JSON per question;
+        # "jsonl" appends to sharded JSONL files (see record_store.py), with
+        # store_options passed to JsonlRecordWriter.
+        if output_format not in ('files', 'jsonl'):
+            raise ValueError(f"Unknown output format: {output_format}")
         self.output_base_dir = output_base_dir
+        self.output_format = output_format
+        self.store_options = store_options
+        self.stores = {}
         self.validator = QuestionValidator()
         self.create_directory_structure()
     
@@ -82,76 +304,108 @@ class AutoSaveManager:
         for dir_path in dirs:
             os.makedirs(dir_path, exist_ok=True)
     
-    def validate_and_categorize(self, question_data: Dict) -> Dict:
+    def validation_for(self, raw_text: str, solution_steps: List[str], answer: str) -> Dict:
         validation_result = {
             "is_valid": True,
             "errors": [],
             "warnings": []
         }
         
-        q_valid, q_msg = self.validator.is_valid_question(
-            question_data.get('raw_text', '')
-        )
+        q_valid, q_msg = self.validator.is_valid_question(raw_text)
         if not q_valid:
             validation_result["is_valid"] = False
             validation_result["errors"].append(f"Question: {q_msg}")
         
-        sol_valid, sol_msg = self.validator.validate_solution(
-            question_data.get('solution_steps', [])
-        )
+        sol_valid, sol_msg = self.validator.validate_solution(solution_steps)
         if not sol_valid:
             validation_result["warnings"].append(f"Solution: {sol_msg}")
         
-        ans_valid, ans_msg = self.validator.validate_answer(
-            question_data.get('answer', '')
-        )
+        ans_valid, ans_msg = self.validator.validate_answer(answer)
         if not ans_valid:
             validation_result["warnings"].append(f"Answer: {ans_msg}")
         
-        question_data['validation'] = validation_result
+        return validation_result
+    
+    def validate_and_categorize(self, question_data: Dict) -> Dict:
+        question_data['validation'] = self.validation_for(
+            question_data.get('raw_text', ''),
+            question_data.get('solution_steps', []),
+            question_data.get('answer', '')
+        )
         return question_data
     
-    def save_question(self, question_data: Dict, q_number: int):
-        validated_data = self.validate_and_categorize(question_data)
-        
-        is_valid = validated_data['validation']['is_valid']
+    def validate_record(self, record: QuestionRecord) -> QuestionRecord:
+        record.validation = ValidationResult.from_dict(
+            self.validation_for(record.raw_text, record.solution_steps, record.answer)
+        )
+        return record
+    
+    def question_path(self, q_number: int, is_valid: bool) -> str:
         category = "valid" if is_valid else "invalid"
-        
-        json_path = os.path.join(
+        return os.path.join(
             self.output_base_dir, 
             "json", 
             category,
             f"question_{q_number}.json"
         )
+    
+    def store_dir(self, is_valid: bool) -> str:
+        return os.path.join(self.output_base_dir, "json", "valid" if is_valid else "invalid")
+    
+    def record_store(self, is_valid: bool) -> JsonlRecordWriter:
+        if is_valid not in self.stores:
+            self.stores[is_valid] = JsonlRecordWriter(self.store_dir(is_valid), **self.store_options)
+        return self.stores[is_valid]
+    
+    def write_question(self, validated_data: Dict, q_number: int, is_valid: bool) -> str:
+        if self.output_format == 'jsonl':
+            return self.record_store(is_valid).write(q_number, validated_data)
+        
+        json_path = self.question_path(q_number, is_valid)
         os.makedirs(os.path.dirname(json_path), exist_ok=True)
         
         with open(json_path, 'w', encoding='utf-8') as f:
             json.dump(validated_data, f, indent=2, ensure_ascii=False)
         
+        return json_path
+    
+    def save_question(self, question_data: Dict, q_number: int):
+        if isinstance(question_data, QuestionRecord):
+            record = self.validate_record(question_data)
+            is_valid = record.validation.is_valid
+            return is_valid, self.write_question(record.to_dict(), q_number, is_valid)
+        
+        validated_data = self.validate_and_categorize(question_data)
+        
+        is_valid = validated_data['validation']['is_valid']
+        json_path = self.write_question(validated_data, q_number, is_valid)
+        
         return is_valid, json_path
     
+    def flush(self):
+        for store in self.stores.values():
+            store.flush()
+    
+    def close(self):
+        for store in self.stores.values():
+            store.close()
+        self.stores = {}
+    
+    def report_builder(self) -> ValidationReportBuilder:
+        return ValidationReportBuilder(os.path.join(self.output_base_dir, "logs"))
+    
     def generate_validation_report(self, all_questions: List[Dict]) -> str:
-        total = len(all_questions)
-        valid_count = sum(1 for q in all_questions if q.get('validation', {}).get('is_valid', False))
-        invalid_count = total - valid_count
-        
-        report = f"""
-=== Validation Report ===
-Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-Total Questions: {total}
-Valid Questions: {valid_count} ({valid_count/total*100:.1f}%)
-Invalid Questions: {invalid_count} ({invalid_count/total*100:.1f}%)
-
-Invalid Questions Details:
-"""
+        valid_count = 0
+        details = []
         
         for i, q in enumerate(all_questions, 1):
-            if not q.get('validation', {}).get('is_valid', True):
-                errors = q['validation'].get('errors', [])
-                report += f"\nQ{i}: {', '.join(errors)}"
+            validation = q.get('validation', {})
+            if validation.get('is_valid', False):
+                valid_count += 1
+            elif not validation.get('is_valid', True):
+                details.append(f"\nQ{i}: {', '.join(validation.get('errors', []))}")
         
-        return report
+        return report_header(len(all_questions), valid_count) + "".join(details)
     
     def save_report(self, report: str):
         report_path = os.path.join(
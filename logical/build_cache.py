@@ -0,0 +1,109 @@
+# Content-addressed build cache: reuse stage outputs for unchanged questions
+
+import hashlib
+import json
+import os
+import sqlite3
+from typing import Dict, Optional
+from shared_modules import SHARED_MODULES, shared_path
+
+CACHE_FORMAT_VERSION = "1"
+
+STAGE_MODULES = {
+    "analyze": ["question_automation", "json_converter"],
+    "solve": ["ai_solver", "equation_engine", "solver_cache"],
+    "render": ["visual_generator"],
+    "validate": ["bonus_validator", "question_automation", "record_store"],
+}
+
+def stage_code_version(stage: str) -> str:
+    # Hash of the source of every module a stage depends on, so editing a
+    # stage invalidates only that stage's entries. Shared modules are hashed
+    # from their math_agent source as well.
+    digest = hashlib.sha256(CACHE_FORMAT_VERSION.encode())
+    base = os.path.dirname(os.path.abspath(__file__))
+    for module in STAGE_MODULES[stage]:
+        paths = [os.path.join(base, module + ".py")]
+        if module in SHARED_MODULES:
+            paths.append(shared_path(module))
+        for path in paths:
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+class BuildCache:
+
+    def __init__(self, path: str, commit_every: int = 64):
+        self.path = path
+        self.commit_every = commit_every
+        self.pending_writes = 0
+        self.versions = {stage: stage_code_version(stage) for stage in STAGE_MODULES}
+        self.stats = {stage: {"hit": 0, "miss": 0} for stage in STAGE_MODULES}
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=60)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "stage TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, "
+            "PRIMARY KEY (stage, key))"
+        )
+        self.conn.commit()
+
+    def key(self, stage: str, *parts) -> str:
+        digest = hashlib.sha256(self.versions[stage].encode())
+        for part in parts:
+            if not isinstance(part, str):
+                part = json.dumps(part, sort_keys=True, ensure_ascii=False)
+            digest.update(b"\0")
+            digest.update(part.encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, stage: str, key: str) -> Optional[bytes]:
+        row = self.conn.execute(
+            "SELECT value FROM entries WHERE stage = ? AND key = ?", (stage, key)
+        ).fetchone()
+        self.stats[stage]["hit" if row else "miss"] += 1
+        return row[0] if row else None
+
+    def put(self, stage: str, key: str, value: bytes):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO entries (stage, key, value) VALUES (?, ?, ?)",
+            (stage, key, value)
+        )
+        self.pending_writes += 1
+        if self.pending_writes >= self.commit_every:
+            self.flush()
+
+    def get_json(self, stage: str, key: str):
+        value = self.get(stage, key)
+        return json.loads(value) if value is not None else None
+
+    def put_json(self, stage: str, key: str, value):
+        self.put(stage, key, json.dumps(value, ensure_ascii=False).encode('utf-8'))
+
+    def flush(self):
+        if self.pending_writes:
+            self.conn.commit()
+            self.pending_writes = 0
+
+    def pop_stats(self) -> Dict[str, Dict[str, int]]:
+        stats = self.stats
+        self.stats = {stage: {"hit": 0, "miss": 0} for stage in STAGE_MODULES}
+        return stats
+
+    def merge_stats(self, stats: Dict[str, Dict[str, int]]):
+        for stage, counts in stats.items():
+            for outcome, count in counts.items():
+                self.stats[stage][outcome] += count
+
+    def summary(self) -> str:
+        lines = ["Cache hits/misses:"]
+        for stage, counts in self.stats.items():
+            lines.append(f"  {stage}: {counts['hit']} hit, {counts['miss']} miss")
+        return "\n".join(lines)
+
+    def close(self):
+        self.flush()
+        self.conn.close()
@@ -0,0 +1,156 @@
+# Near-duplicate detection: MinHash signatures over normalized question text, indexed by LSH bands
+
+import re
+import sys
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+# Lower-cased, Rs./INR spelled as ₹, punctuation and whitespace runs
+# collapsed to single spaces. Decimal points survive so 1.05 stays one number.
+RUPEES = re.compile(r'\b(?:rs\.?|inr)\b\s*')
+SYMBOLS = re.compile(r'[^\w\s%₹.]+|\.(?!\d)')
+NUMBER = re.compile(r'\d+(?:\.\d+)?')
+# The last question clause ("find the cost price", "how many days ...").
+ASKED = re.compile(r'.*\b(?:find|calculate|compute|determine|what is|what will be|what was|'
+                   r'how much|how many|how long)\b(.*)')
+QUANTITY = re.compile(
+    r'\b(?:cost price|selling price|marked price|list price|cp|sp|mp|profit|loss|gain|discount|'
+    r'simple interest|compound interest|interest|amount|principal|sum|rate|time|speed|distance|'
+    r'length|days?|hours?|minutes?|ratio|share|percentage|percent|number)\b'
+)
+
+def normalize_question(text: str) -> str:
+    text = text.lower()
+    if 'rs' in text or 'inr' in text:
+        text = RUPEES.sub('₹', text)
+    return ' '.join(SYMBOLS.sub(' ', text).split()).replace('₹ ', '₹')
+
+def number_key(normalized: str) -> Tuple[float, ...]:
+    # Questions only match when they use the same numbers in the same order:
+    # the same wording with other values is a different problem.
+    return tuple(float(n) for n in NUMBER.findall(normalized))
+
+def asked_key(normalized: str) -> Tuple[str, ...]:
+    # ...and ask for the same quantity: "find the cost price" and "find the
+    # selling price" of one shop are different problems. The quantities named
+    # in the last question clause (or after the last number) are the key, so
+    # rewording the rest of that clause still matches.
+    match = ASKED.match(normalized)
+    if match:
+        clause = match.group(1)
+    else:
+        numbers = list(NUMBER.finditer(normalized))
+        clause = normalized[numbers[-1].end():] if numbers else normalized
+    return tuple(QUANTITY.findall(clause)) or (clause.strip(),)
+
+class MinHasher:
+    # Signature of num_perm minimums over the text's byte k-grams (k <= 8,
+    # each packed into one uint64) under multiply-shift hash functions, all
+    # vectorized with numpy.
+
+    def __init__(self, num_perm: int = 32, shingle: int = 5, seed: int = 1):
+        if not 1 <= shingle <= 8:
+            raise ValueError("shingle must be between 1 and 8 bytes")
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.shingle = shingle
+        self.a = (rng.integers(1, 2 ** 63, num_perm, dtype=np.uint64) | np.uint64(1))[:, None]
+        self.b = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64)[:, None]
+        self.shifts = [np.uint64(8 * j) for j in range(shingle)]
+
+    def signature(self, text: str) -> np.ndarray:
+        data = np.frombuffer(text.encode('utf-8'), dtype=np.uint8).astype(np.uint64)
+        n = max(1, len(data) - self.shingle + 1)
+        if len(data) < self.shingle:
+            data = np.concatenate([data, np.zeros(self.shingle - len(data), dtype=np.uint64)])
+        grams = data[:n].copy()
+        for j in range(1, self.shingle):
+            grams |= data[j:j + n] << self.shifts[j]
+        hashed = self.a * grams
+        hashed += self.b
+        hashed >>= np.uint64(32)
+        return hashed.min(axis=1).astype(np.uint32)
+
+class NearDuplicateIndex:
+    # add() is called once per question in input order. The first question
+    # of a cluster becomes its canonical one; a later question whose
+    # signature shares a band with it, has the same numbers, asks for the same
+    # quantity and has an estimated Jaccard similarity >= threshold is
+    # reported as its duplicate. Each lookup touches `bands` buckets, so the
+    # cost per question is constant and building the index is linear in the
+    # number of questions. Only canonical questions are stored (under 1 KB
+    # each).
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 32, bands: int = 8,
+                 shingle: int = 5, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm, shingle, seed)
+        self.buckets: Dict[int, int] = {}
+        self.signatures = np.empty((1024, num_perm), dtype=np.uint32)
+        self.numbers = np.empty(1024, dtype=np.int64)
+        self.unique = 0
+        self.seen = 0
+        self.duplicates = 0
+        self.cluster_sizes: Dict[int, int] = {}
+
+    def add(self, number: int, text: str) -> Optional[Tuple[int, float]]:
+        # Returns (canonical question number, estimated similarity) for a
+        # near-duplicate; otherwise indexes the question and returns None.
+        self.seen += 1
+        normalized = normalize_question(text)
+        exact = (number_key(normalized), asked_key(normalized))
+        signature = self.hasher.signature(normalized)
+        keys = [hash((band, exact, signature[band * self.rows:(band + 1) * self.rows].tobytes()))
+                for band in range(self.bands)]
+
+        best, best_similarity = None, 0.0
+        for key in keys:
+            slot = self.buckets.get(key)
+            if slot is None or slot == best:
+                continue
+            similarity = int(np.count_nonzero(self.signatures[slot] == signature)) / self.hasher.num_perm
+            if similarity >= self.threshold and similarity > best_similarity:
+                best, best_similarity = slot, similarity
+
+        if best is not None:
+            canonical = int(self.numbers[best])
+            self.duplicates += 1
+            self.cluster_sizes[canonical] = self.cluster_sizes.get(canonical, 1) + 1
+            return canonical, best_similarity
+
+        slot = self.unique
+        if slot == len(self.numbers):
+            self.signatures = np.concatenate([self.signatures, np.empty_like(self.signatures)])
+            self.numbers = np.concatenate([self.numbers, np.empty_like(self.numbers)])
+        self.signatures[slot] = signature
+        self.numbers[slot] = number
+        self.unique += 1
+        for key in keys:
+            self.buckets.setdefault(key, slot)
+        return None
+
+    def memory_bytes(self) -> int:
+        # Bucket table (with its int keys) plus the stored signatures.
+        return (sys.getsizeof(self.buckets) + 32 * len(self.buckets)
+                + self.signatures[:self.unique].nbytes + self.numbers[:self.unique].nbytes)
+
+    def stats(self) -> Dict:
+        return {
+            "questions": self.seen,
+            "unique": self.unique,
+            "duplicates": self.duplicates,
+            "dedup_ratio": round(self.duplicates / self.seen, 4) if self.seen else 0.0,
+            "clusters": len(self.cluster_sizes),
+            "largest_cluster": max(self.cluster_sizes.values(), default=1),
+        }
+
+    def summary(self) -> str:
+        s = self.stats()
+        return (f"Near-duplicates: {s['duplicates']} of {s['questions']} questions ({s['dedup_ratio']:.1%}) "
+                f"linked to {s['clusters']} canonical questions; {s['unique']} processed, "
+                f"largest cluster {s['largest_cluster']}")
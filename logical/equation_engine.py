@@ -0,0 +1,548 @@
+# Equation engine: deterministic linear/closed-form solvers for the remaining question types
+
+import math
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+NUM = r'(\d+(?:\.\d+)?)'
+MONEY = r'(?:₹|Rs\.?|INR)\s*' + NUM
+
+TIME_UNITS = {'hour': 1.0, 'hr': 1.0, 'minute': 1 / 60, 'min': 1 / 60, 'second': 1 / 3600, 'sec': 1 / 3600}
+
+WORK_CONTEXT_RE = re.compile(r'\b(?:work|job|task|piece)\b', re.I)
+WORK_RESPECTIVELY_RE = re.compile(
+    r'\b((?:[A-Z],\s*)*[A-Z],?\s+and\s+[A-Z])\b[^.?]*?\bin\s+'
+    r'((?:\d+(?:\.\d+)?,\s*)*\d+(?:\.\d+)?,?\s+and\s+\d+(?:\.\d+)?)\s*(days?|hours?)\s+respectively'
+)
+WORK_GROUP_RE = re.compile(
+    r'\b((?:[A-Z],\s*)*[A-Z]\s+and\s+[A-Z])\b[^.?,;]*?\bin\s+' + NUM + r'\s*(days?|hours?)'
+)
+WORK_SINGLE_RE = re.compile(r'\b([A-Z])\b(?:\s+alone)?[^.?,;A-Z]*?\bin\s+' + NUM + r'\s*(days?|hours?)')
+WORK_TARGET_ALONE_RE = re.compile(r'\b([A-Z])\s+alone\b')
+# "A works for 5 days and then B finishes the rest in 10 days": the first
+# worker (a name or he/she) does part of the job, the second the remainder.
+WORK_PARTIAL_RE = re.compile(
+    r'\b([A-Z]|[Hh]e|[Ss]he)\s+(?:works?|worked)\s+(?:on\s+it\s+)?for\s+' + NUM + r'\s*(days?|hours?)'
+    r'[^.?]*?\b([A-Z])\b(?:\s+alone)?\s+(?:finish|complete|do)(?:es|ed|s)?\s+the\s+'
+    r'(?:rest|remaining|remainder)(?:\s+(?:of\s+the\s+)?(?:work|job|task))?\s+in\s+' + NUM + r'\s*(?:days?|hours?)'
+)
+# Any other partial-work wording (someone leaves, works for a while, the
+# rest is finished by others) cannot be read as whole-job equations.
+WORK_UNMODELLED_RE = re.compile(
+    r'\bwork(?:s|ed)?\s+(?:together\s+)?for\b|\b(?:leaves?|left|rest|remaining|remainder)\b', re.I
+)
+NAMES_RE = re.compile(r'\b[A-Z]\b')
+
+SPEED_RE = re.compile(
+    NUM + r'\s*(km/h|km/hr|kmph|km per hour|kilometres? per hour|kilometers? per hour|'
+    r'm/s|metres? per second|meters? per second)', re.I
+)
+DISTANCE_RE = re.compile(NUM + r'\s*(km|kilometres?|kilometers?|m|metres?|meters?)\b(?!\s*/|\s*per\b)', re.I)
+DURATION_RE = re.compile(NUM + r'\s*(hours?|hrs?|minutes?|mins?|seconds?|secs?)\b', re.I)
+SPEED_CONTEXT_RE = re.compile(r'\b(?:speed|train|car|bus|cyclist|travels?|covers?|crosses?|runs?|km/h|kmph)\b', re.I)
+
+RATE_RE = re.compile(NUM + r'\s*%')
+YEARS_RE = re.compile(NUM + r'\s*(years?|months?)', re.I)
+AMOUNT_RE = re.compile(r'(?:amounts?\s+to|amount\s+(?:of|is|=|becomes)|becomes)\s*' + MONEY, re.I)
+INTEREST_RE = re.compile(
+    r'(?:interest|\bSI\b|\bCI\b)\s*(?:of|is|=|earned|will be|be|comes to)?\s*(?:is\s*)?' + MONEY + r'|'
+    + MONEY + r'\s*(?:as\s+)?(?:simple\s+|compound\s+)?interest|'
+    # "interest on a sum at 5% per annum for 4 years is ₹400"
+    r'interest\b(?:(?!₹|\bRs\b|\bINR\b)(?:[^.?]|\.\d))*?\b(?:is|was|will\s+be|comes\s+to)\s*' + MONEY, re.I
+)
+# Only a money value introduced as the principal is taken as P.
+PRINCIPAL_RE = re.compile(
+    r'(?:principal|sum|lends?|lent|invests?|invested|deposits?|deposited|borrows?|borrowed|loan|\bon)'
+    r'\s*(?:of|is|=)?\s*' + MONEY, re.I
+)
+ANY_MONEY_RE = re.compile(MONEY)
+ASKED_RE = re.compile(
+    r'(?:find|calculate|what\s+(?:is|will\s+be))\s+(?:the\s+)?'
+    r'(amount|compound interest|simple interest|interest|principal|sum|rate|time)', re.I
+)
+COMPOUNDING = [('quarterly', 4), ('half-yearly', 2), ('half yearly', 2), ('semi-annually', 2)]
+
+DIVIDE_RE = re.compile(
+    r'(?:divide|distribute|share|split)\w*\s+(?:(?:₹|Rs\.?|INR)\s*)?' + NUM + r'[^.?]*?\bratio\s+(?:of\s+)?'
+    r'(\d+(?:\.\d+)?(?:\s*:\s*\d+(?:\.\d+)?)+)', re.I
+)
+RATIO_PAIR_RE = re.compile(
+    r'ratio\s+of\s+(?:the\s+)?(\w+)[^.?:]*?\s(?:to|and)\s+(?:the\s+)?(\w+)[^.?:]*?\s(?:is|=)\s*'
+    + NUM + r'\s*:\s*' + NUM, re.I
+)
+
+CHAIN_LEG_RE = re.compile(NUM + r'\s*%\s*(profit|gain|loss)', re.I)
+CHAIN_FINAL_RE = re.compile(r'(?:pays?|paid)\s*' + MONEY, re.I)
+CHAIN_START_RE = re.compile(r'(?:costs?|cost\s+price\s+(?:of|is)|bought\s+(?:it\s+)?for)\s*(?:[A-Z]\s+)?' + MONEY, re.I)
+CHAIN_SELLER_RE = re.compile(r'\b([A-Z])\s+sells\b[^.?]*?\bto\s+([A-Z])\b')
+
+
+def fmt(value: float) -> str:
+    if abs(value - round(value)) < 1e-9:
+        return str(int(round(value)))
+    return f"{value:.2f}".rstrip('0').rstrip('.')
+
+
+def money(value: float) -> str:
+    return f"₹{value:.2f}"
+
+
+def solve_linear_system(rows: Sequence[Dict[str, float]], rhs: Sequence[float],
+                        variables: Sequence[str]) -> Optional[Dict[str, float]]:
+    # Gauss-Jordan elimination with partial pivoting on a small dense system.
+    # Returns None unless every variable is uniquely determined.
+    matrix = [[row.get(v, 0.0) for v in variables] + [b] for row, b in zip(rows, rhs)]
+    n = len(variables)
+    pivot_row = 0
+    pivots = []
+
+    for col in range(n):
+        best = max(range(pivot_row, len(matrix)), key=lambda r: abs(matrix[r][col]), default=None)
+        if best is None or abs(matrix[best][col]) < 1e-12:
+            return None
+        matrix[pivot_row], matrix[best] = matrix[best], matrix[pivot_row]
+        pivot = matrix[pivot_row][col]
+        matrix[pivot_row] = [v / pivot for v in matrix[pivot_row]]
+        for r in range(len(matrix)):
+            if r != pivot_row and matrix[r][col]:
+                factor = matrix[r][col]
+                matrix[r] = [a - factor * b for a, b in zip(matrix[r], matrix[pivot_row])]
+        pivots.append(pivot_row)
+        pivot_row += 1
+
+    for r in range(pivot_row, len(matrix)):
+        if abs(matrix[r][n]) > 1e-9:
+            return None
+
+    return {v: matrix[pivots[i]][n] for i, v in enumerate(variables)}
+
+
+def _last_sentence(text: str) -> str:
+    parts = [p for p in re.split(r'(?<=[.?!])\s+', text.strip()) if p.strip()]
+    return parts[-1] if parts else text
+
+
+def _price_owner(text: str, position: int) -> Optional[str]:
+    # The last person named earlier in the sentence: "C pays ₹594",
+    # "If A bought it for ₹100".
+    names = NAMES_RE.findall(re.split(r'[.?!\n]', text[:position])[-1])
+    return names[-1] if names else None
+
+
+def _names(group: str) -> List[str]:
+    return NAMES_RE.findall(group)
+
+
+class EquationEngine:
+
+    SOLVERS = ['time_work', 'speed_distance', 'compound_interest', 'simple_interest',
+               'ratio_proportion', 'chained_transaction']
+
+    def solve(self, q_type: str, text: str) -> Optional[Dict]:
+        # The detector in QuestionAnalyzer often labels these questions as
+        # "percentage" or "general", so the declared type is only tried first.
+        order = [q_type] + [t for t in self.SOLVERS if t != q_type]
+        for name in order:
+            solver = getattr(self, f"solve_{name}", None)
+            if solver is None:
+                continue
+            solution = solver(text)
+            if solution is not None:
+                return solution
+        return None
+
+    def solve_time_work(self, text: str) -> Optional[Dict]:
+        if not WORK_CONTEXT_RE.search(text):
+            return None
+
+        # Every equation is {worker: time spent working} = 1 whole job.
+        equations = []
+        unit = 'days'
+        remaining = text
+
+        for match in WORK_PARTIAL_RE.finditer(text):
+            first = match.group(1)
+            if len(first) > 1:
+                mentioned = NAMES_RE.findall(text[:match.start()])
+                if not mentioned:
+                    return None
+                first = mentioned[-1]
+            if first == match.group(4):
+                return None
+            equations.append({first: float(match.group(2)), match.group(4): float(match.group(5))})
+            unit = 'hours' if match.group(3).startswith('hour') else 'days'
+            remaining = remaining.replace(match.group(0), ' ')
+
+        if WORK_UNMODELLED_RE.search(remaining):
+            return None
+
+        for match in WORK_RESPECTIVELY_RE.finditer(remaining):
+            names = _names(match.group(1))
+            times = [float(t) for t in re.findall(NUM, match.group(2))]
+            if len(names) != len(times):
+                return None
+            equations.extend({name: t} for name, t in zip(names, times))
+            unit = 'hours' if match.group(3).startswith('hour') else 'days'
+            remaining = remaining.replace(match.group(0), ' ')
+
+        for match in WORK_GROUP_RE.finditer(remaining):
+            equations.append({name: float(match.group(2)) for name in _names(match.group(1))})
+            unit = 'hours' if match.group(3).startswith('hour') else 'days'
+            remaining = remaining.replace(match.group(0), ' ')
+
+        for match in WORK_SINGLE_RE.finditer(remaining):
+            equations.append({match.group(1): float(match.group(2))})
+            unit = 'hours' if match.group(3).startswith('hour') else 'days'
+
+        if not equations:
+            return None
+
+        workers = sorted({name for times in equations for name in times})
+        # The answer is for the worker(s) the question names ("B alone", "can
+        # B do"), or everyone together when it names nobody. A named worker
+        # with no equation of their own ("B is 50% more efficient") is not
+        # modelled.
+        question = _last_sentence(text)
+        alone = WORK_TARGET_ALONE_RE.search(question)
+        target = [alone.group(1)] if alone else sorted(set(_names(question))) or workers
+        if any(name not in workers for name in target):
+            return None
+        if any(t <= 0 for times in equations for t in times.values()):
+            return None
+
+        steps = [f"Let the total work = 1 unit and the work rate of each person = work done per {unit[:-1]}"]
+        for times in equations:
+            if len(set(times.values())) == 1:
+                t = next(iter(times.values()))
+                steps.append(f"Rate({' + '.join(times)}) = 1/{fmt(t)}")
+            else:
+                steps.append(" + ".join(f"{fmt(t)} × Rate({name})" for name, t in times.items()) + " = 1")
+
+        if len(equations) == len(workers) and all(len(times) == 1 for times in equations):
+            rates = {name: 1 / t for times in equations for name, t in times.items()}
+        else:
+            rates = solve_linear_system(equations, [1.0] * len(equations), workers)
+            if rates is None:
+                return None
+            steps.append("Solving the equations: " + ", ".join(
+                f"Rate({w}) = {fmt(rates[w])}" for w in workers))
+
+        combined = sum(rates[w] for w in target)
+        if combined <= 0:
+            return None
+        time_taken = 1 / combined
+
+        label = ' + '.join(target)
+        if len(target) > 1:
+            steps.append(f"Combined rate ({label}) = {' + '.join(fmt(rates[w]) for w in target)} = {fmt(combined)}")
+        steps.append(f"Time taken by {label} = 1 / {fmt(combined)} = {fmt(time_taken)} {unit}")
+
+        return {
+            "steps": steps,
+            "formula_used": ["Rate = 1 / Time", "Time = 1 / (sum of rates)"],
+            "answer": f"{fmt(time_taken)} {unit}"
+        }
+
+    def solve_speed_distance(self, text: str) -> Optional[Dict]:
+        if not SPEED_CONTEXT_RE.search(text):
+            return None
+
+        speeds = SPEED_RE.findall(text)
+        distances = DISTANCE_RE.findall(text)
+        durations = DURATION_RE.findall(text)
+        if len(speeds) > 1 or len(distances) > 1 or len(durations) > 1:
+            return None
+
+        speed = distance = duration = None
+        if speeds:
+            value, unit = speeds[0]
+            speed = float(value) * (3.6 if unit.lower().startswith(('m/s', 'met')) else 1.0)
+        if distances:
+            value, unit = distances[0]
+            distance = float(value) * (1.0 if unit.lower().startswith('k') else 0.001)
+        if durations:
+            value, unit = durations[0]
+            key = unit.lower().rstrip('s')
+            duration = float(value) * TIME_UNITS[key]
+
+        known = [v is not None for v in (speed, distance, duration)]
+        if sum(known) != 2:
+            return None
+
+        metric = any(not u.lower().startswith('k') for _, u in distances) or \
+            any(u.lower().startswith('s') for _, u in durations) or \
+            any(u.lower().startswith(('m/s', 'met')) for _, u in speeds)
+        steps = ["Using Distance = Speed × Time"]
+
+        if speed is None:
+            result = distance / duration
+            if metric and 'km/h' not in text.lower():
+                value = result / 3.6
+                steps.append(f"Speed = Distance / Time = {fmt(distance * 1000)} m / {fmt(duration * 3600)} s = {fmt(value)} m/s")
+                answer = f"{fmt(value)} m/s"
+            else:
+                steps.append(f"Speed = Distance / Time = {fmt(distance)} km / {fmt(duration)} h = {fmt(result)} km/h")
+                answer = f"{fmt(result)} km/h"
+        elif distance is None:
+            result = speed * duration
+            if metric:
+                steps.append(f"Speed = {fmt(speed)} km/h = {fmt(speed)} × 5/18 = {fmt(speed / 3.6)} m/s")
+                steps.append(f"Distance = {fmt(speed / 3.6)} × {fmt(duration * 3600)} = {fmt(result * 1000)} m")
+                answer = f"{fmt(result * 1000)} m"
+            else:
+                steps.append(f"Distance = Speed × Time = {fmt(speed)} × {fmt(duration)} = {fmt(result)} km")
+                answer = f"{fmt(result)} km"
+        else:
+            if speed <= 0:
+                return None
+            result = distance / speed
+            if metric:
+                mps = speed / 3.6
+                steps.append(f"Speed = {fmt(speed)} km/h = {fmt(speed)} × 5/18 = {fmt(mps)} m/s")
+                steps.append(f"Time = Distance / Speed = {fmt(distance * 1000)} / {fmt(mps)} = {fmt(result * 3600)} seconds")
+                answer = f"{fmt(result * 3600)} seconds"
+            else:
+                steps.append(f"Time = Distance / Speed = {fmt(distance)} / {fmt(speed)} = {fmt(result)} hours")
+                answer = f"{fmt(result)} hours"
+
+        return {
+            "steps": steps,
+            "formula_used": ["Distance = Speed × Time", "1 km/h = 5/18 m/s"],
+            "answer": answer
+        }
+
+    def _interest_quantities(self, text: str) -> Optional[Tuple]:
+        rates = RATE_RE.findall(text)
+        years = YEARS_RE.findall(text)
+        rate = float(rates[0]) if len(rates) == 1 else None
+        period = None
+        if len(years) == 1:
+            value, unit = years[0]
+            period = float(value) / (12 if unit.lower().startswith('month') else 1)
+
+        amount_match = AMOUNT_RE.search(text)
+        interest_match = INTEREST_RE.search(text)
+        amount = float(amount_match.group(1)) if amount_match else None
+        interest = None
+        claimed = {m.start(1) for m in (amount_match,) if m}
+        if interest_match:
+            group = next(i for i in (1, 2, 3) if interest_match.group(i))
+            interest = float(interest_match.group(group))
+            claimed.add(interest_match.start(group))
+
+        principals = {float(m.group(1)) for m in PRINCIPAL_RE.finditer(text) if m.start(1) not in claimed}
+        claimed.update(m.start(1) for m in PRINCIPAL_RE.finditer(text))
+        # A money value that is neither P, interest nor amount could be any
+        # of them; leave such questions to the fallback solver.
+        if len(principals) > 1 or any(m.start(1) not in claimed for m in ANY_MONEY_RE.finditer(text)):
+            return None
+        principal = principals.pop() if principals else None
+
+        return principal, rate, period, interest, amount
+
+    def _asks_amount(self, text: str) -> bool:
+        asked = ASKED_RE.search(text)
+        return bool(asked) and asked.group(1).lower() == 'amount'
+
+    def solve_simple_interest(self, text: str) -> Optional[Dict]:
+        lower = text.lower()
+        if 'interest' not in lower or 'compound' in lower:
+            return None
+
+        quantities = self._interest_quantities(text)
+        if quantities is None:
+            return None
+        P, R, T, SI, A = quantities
+        if SI is None and A is not None and P is not None:
+            SI = A - P
+        steps = ["Using SI = (P × R × T) / 100 and Amount = P + SI"]
+
+        if P is not None and R is not None and T is not None:
+            SI = P * R * T / 100
+            steps.append(f"SI = ({fmt(P)} × {fmt(R)} × {fmt(T)}) / 100 = {money(SI)}")
+            if self._asks_amount(text):
+                steps.append(f"Amount = {fmt(P)} + {fmt(SI)} = {money(P + SI)}")
+                answer = money(P + SI)
+            else:
+                answer = money(SI)
+        elif R is not None and T is not None and (SI is not None or A is not None):
+            if SI is not None:
+                P = SI * 100 / (R * T)
+                steps.append(f"P = (SI × 100) / (R × T) = ({fmt(SI)} × 100) / ({fmt(R)} × {fmt(T)}) = {money(P)}")
+            else:
+                P = A / (1 + R * T / 100)
+                steps.append(f"A = P × (1 + RT/100) → P = {fmt(A)} / (1 + {fmt(R)} × {fmt(T)}/100) = {money(P)}")
+            answer = money(P)
+        elif P is not None and SI is not None and T is not None:
+            R = SI * 100 / (P * T)
+            steps.append(f"R = (SI × 100) / (P × T) = ({fmt(SI)} × 100) / ({fmt(P)} × {fmt(T)}) = {fmt(R)}%")
+            answer = f"{fmt(R)}%"
+        elif P is not None and SI is not None and R is not None:
+            T = SI * 100 / (P * R)
+            steps.append(f"T = (SI × 100) / (P × R) = ({fmt(SI)} × 100) / ({fmt(P)} × {fmt(R)}) = {fmt(T)} years")
+            answer = f"{fmt(T)} years"
+        else:
+            return None
+
+        return {
+            "steps": steps,
+            "formula_used": ["SI = (P × R × T) / 100", "Amount = P + SI"],
+            "answer": answer
+        }
+
+    def solve_compound_interest(self, text: str) -> Optional[Dict]:
+        lower = text.lower()
+        if 'compound' not in lower:
+            return None
+
+        n = 1
+        for word, periods in COMPOUNDING:
+            if word in lower:
+                n = periods
+                break
+
+        quantities = self._interest_quantities(text)
+        if quantities is None:
+            return None
+        P, R, T, CI, A = quantities
+        if CI is None and A is not None and P is not None:
+            CI = A - P
+        steps = [f"Using A = P × (1 + R/{100 * n})^({n}T) and CI = A - P"]
+
+        if P is not None and R is not None and T is not None:
+            factor = (1 + R / (100 * n)) ** (n * T)
+            A = P * factor
+            steps.append(f"A = {fmt(P)} × (1 + {fmt(R)}/{100 * n})^{fmt(n * T)} = {money(A)}")
+            if self._asks_amount(text):
+                answer = money(A)
+            else:
+                steps.append(f"CI = {fmt(A)} - {fmt(P)} = {money(A - P)}")
+                answer = money(A - P)
+        elif R is not None and T is not None and (CI is not None or A is not None):
+            factor = (1 + R / (100 * n)) ** (n * T)
+            if CI is not None:
+                P = CI / (factor - 1)
+                steps.append(f"CI = P × ((1 + {fmt(R)}/{100 * n})^{fmt(n * T)} - 1) → P = {fmt(CI)} / {fmt(factor - 1)} = {money(P)}")
+            else:
+                P = A / factor
+                steps.append(f"P = A / (1 + {fmt(R)}/{100 * n})^{fmt(n * T)} = {fmt(A)} / {fmt(factor)} = {money(P)}")
+            answer = money(P)
+        elif P is not None and T is not None and (CI is not None or A is not None) and R is None:
+            A = A if A is not None else P + CI
+            if A <= 0 or P <= 0:
+                return None
+            R = 100 * n * ((A / P) ** (1 / (n * T)) - 1)
+            steps.append(f"(1 + R/{100 * n})^{fmt(n * T)} = {fmt(A)}/{fmt(P)} → R = {fmt(R)}%")
+            answer = f"{fmt(R)}%"
+        elif P is not None and R is not None and (CI is not None or A is not None):
+            A = A if A is not None else P + CI
+            if A <= 0 or P <= 0 or R <= 0:
+                return None
+            T = math.log(A / P) / (n * math.log(1 + R / (100 * n)))
+            steps.append(f"T = log({fmt(A)}/{fmt(P)}) / ({n} × log(1 + {fmt(R)}/{100 * n})) = {fmt(T)} years")
+            answer = f"{fmt(T)} years"
+        else:
+            return None
+
+        return {
+            "steps": steps,
+            "formula_used": ["A = P(1 + R/100n)^(nT)", "CI = A - P"],
+            "answer": answer
+        }
+
+    def solve_ratio_proportion(self, text: str) -> Optional[Dict]:
+        divide = DIVIDE_RE.search(text)
+        if divide:
+            total = float(divide.group(1))
+            terms = [float(t) for t in re.findall(NUM, divide.group(2))]
+            parts_sum = sum(terms)
+            if parts_sum <= 0:
+                return None
+            k = total / parts_sum
+            currency = '₹' if re.search(r'₹|Rs\.?|INR', text) else ''
+            steps = [
+                f"Let the shares be {' : '.join(fmt(t) + 'k' for t in terms)}",
+                f"{' + '.join(fmt(t) + 'k' for t in terms)} = {fmt(total)} → {fmt(parts_sum)}k = {fmt(total)} → k = {fmt(k)}"
+            ]
+            shares = [t * k for t in terms]
+            for i, (t, share) in enumerate(zip(terms, shares), 1):
+                steps.append(f"Share {i} = {fmt(t)} × {fmt(k)} = {currency}{fmt(share)}")
+            return {
+                "steps": steps,
+                "formula_used": ["Share = (Ratio term / Sum of terms) × Total"],
+                "answer": ", ".join(f"{currency}{fmt(s)}" for s in shares)
+            }
+
+        pair = RATIO_PAIR_RE.search(text)
+        if not pair:
+            return None
+        first, second = pair.group(1), pair.group(2)
+        a, b = float(pair.group(3)), float(pair.group(4))
+        rest = text[pair.end():]
+        for name, other, mine, theirs in ((first, second, a, b), (second, first, b, a)):
+            known = re.search(r'\b' + re.escape(name) + r"\b(?:'s\s+\w+)?\s+(?:is|=|are)\s*(?:(?:₹|Rs\.?)\s*)?" + NUM, rest, re.I)
+            if known and mine:
+                value = float(known.group(1))
+                result = value * theirs / mine
+                return {
+                    "steps": [
+                        f"{first} : {second} = {fmt(a)} : {fmt(b)}",
+                        f"{name} = {fmt(value)} → 1 part = {fmt(value)} / {fmt(mine)} = {fmt(value / mine)}",
+                        f"{other} = {fmt(theirs)} × {fmt(value / mine)} = {fmt(result)}"
+                    ],
+                    "formula_used": ["a : b = x : y → y = x × b / a"],
+                    "answer": fmt(result)
+                }
+        return None
+
+    def solve_chained_transaction(self, text: str) -> Optional[Dict]:
+        # A → B → C resale chains: each leg multiplies the price by
+        # (1 ± pct/100), giving one linear equation in the first cost price.
+        sellers = CHAIN_SELLER_RE.findall(text)
+        legs = CHAIN_LEG_RE.findall(text)
+        if len(sellers) < 2 or len(legs) != len(sellers):
+            return None
+
+        factors = [1 + float(p) / 100 if kind.lower() in ('profit', 'gain') else 1 - float(p) / 100
+                   for p, kind in legs]
+        coefficient = 1.0
+        for f in factors:
+            coefficient *= f
+
+        # A price is the final one only when the last buyer pays it, and the
+        # starting one when it is the first seller's (or nobody's) cost.
+        first, last = sellers[0][0], sellers[-1][1]
+        final = next((m for m in CHAIN_FINAL_RE.finditer(text) if _price_owner(text, m.start()) == last), None)
+        start = None
+        for match in CHAIN_START_RE.finditer(text):
+            owner = _price_owner(text, match.start())
+            if owner == last and final is None:
+                final = match
+            elif owner in (None, first) and start is None:
+                start = match
+        steps = [f"Let {first}'s cost price = ₹x"]
+
+        running = 1.0
+        for (seller, _), f in zip(sellers, factors):
+            steps.append(f"{seller}'s SP = {fmt(running)}x × {fmt(f)} = {fmt(running * f)}x")
+            running *= f
+
+        if final:
+            price = float(final.group(1))
+            if coefficient == 0:
+                return None
+            x = price / coefficient
+            steps.append(f"Given {fmt(coefficient)}x = {fmt(price)} → x = {fmt(price)} ÷ {fmt(coefficient)} = {fmt(x)}")
+            answer = money(x)
+        elif start:
+            x = float(start.group(1))
+            steps.append(f"x = {fmt(x)} → final price = {fmt(coefficient)} × {fmt(x)} = {fmt(coefficient * x)}")
+            answer = money(coefficient * x)
+        else:
+            return None
+
+        return {
+            "steps": steps,
+            "formula_used": ["SP = CP × (1 ± Profit or Loss%/100)"],
+            "answer": answer
+        }
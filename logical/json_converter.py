@@ -1,34 +1,80 @@
 # Task 2: Convert raw dataset into JSON format input
 
+import io
 import json
 import re
-from typing import List, Dict
-from question_automation import QuestionAnalyzer, Question
+from typing import Iterable, Iterator, List, Dict
+from question_automation import QuestionAnalyzer, Question, QuestionRecord
 from dataclasses import asdict
 
+QUESTION_START = re.compile(r'^\s*Q\.\s*')
+SOLUTION_SPLIT = re.compile(r'\n\s*Sol:\s*')
+
 class DatasetToJSON:
     
     def __init__(self):
         self.analyzer = QuestionAnalyzer()
     
-    def parse_raw_dataset(self, raw_text: str) -> List[Dict]:
+    def parse_qa_block(self, qa: str, compact: bool = False):
+        # compact=True returns a slotted QuestionRecord instead of a Question.
+        parts = SOLUTION_SPLIT.split(qa, maxsplit=1)
+        
+        if len(parts) != 2:
+            return None
+        
+        question_text = parts[0].strip()
+        solution_text = parts[1].strip()
+        if compact:
+            return self.analyzer.analyze_record(question_text, solution_text)
+        return self.analyzer.analyze_question(question_text, solution_text)
+    
+    def split_raw_dataset(self, raw_text: str) -> List[str]:
         qa_pairs = re.split(r'\n\s*Q\.\s*', raw_text)
         qa_pairs = [q.strip() for q in qa_pairs if q.strip()]
-        
+        return [qa for qa in qa_pairs if SOLUTION_SPLIT.search(qa)]
+    
+    def parse_raw_dataset(self, raw_text: str) -> List[Dict]:
         structured_data = []
         
-        for qa in qa_pairs:
-            parts = re.split(r'\n\s*Sol:\s*', qa, maxsplit=1)
-            
-            if len(parts) == 2:
-                question_text = parts[0].strip()
-                solution_text = parts[1].strip()
-                
-                analyzed = self.analyzer.analyze_question(question_text, solution_text)
+        for qa in self.split_raw_dataset(raw_text):
+            analyzed = self.parse_qa_block(qa)
+            if analyzed is not None:
                 structured_data.append(asdict(analyzed))
         
         return structured_data
     
+    def parse_records(self, raw_text: str) -> List[QuestionRecord]:
+        records = (self.parse_qa_block(qa, compact=True) for qa in self.split_raw_dataset(raw_text))
+        return [r for r in records if r is not None]
+    
+    def iter_questions(self, lines: Iterable[str], compact: bool = False) -> Iterator[Question]:
+        # Only the current Q./Sol: block is held in memory, so peak usage is
+        # bounded by the largest single question rather than the whole bank.
+        block = []
+        
+        for line in lines:
+            match = QUESTION_START.match(line)
+            if match:
+                if block:
+                    analyzed = self.parse_qa_block(''.join(block).strip(), compact)
+                    if analyzed is not None:
+                        yield analyzed
+                block = [line[match.end():]]
+            else:
+                block.append(line)
+        
+        if block:
+            analyzed = self.parse_qa_block(''.join(block).strip(), compact)
+            if analyzed is not None:
+                yield analyzed
+    
+    def iter_raw_dataset(self, raw_text: str, compact: bool = False) -> Iterator[Question]:
+        return self.iter_questions(io.StringIO(raw_text), compact)
+    
+    def iter_file(self, filename: str, buffer_size: int = 1 << 20, compact: bool = False) -> Iterator[Question]:
+        with open(filename, 'r', encoding='utf-8', buffering=buffer_size) as f:
+            yield from self.iter_questions(f, compact)
+    
     def create_json_input(self, questions: List[Question]) -> str:
         json_data = {
             "dataset_info": {
@@ -36,7 +82,7 @@ class DatasetToJSON:
                 "exam_types": ["SSC", "Banking", "Railways", "Defence"],
                 "format_version": "1.0"
             },
-            "questions": [asdict(q) for q in questions]
+            "questions": [q.to_dict() if isinstance(q, QuestionRecord) else asdict(q) for q in questions]
         }
         
         return json.dumps(json_data, indent=2, ensure_ascii=False)
@@ -1,44 +1,433 @@
 # Main Pipeline: Integrates all tasks for complete automation
 
+import functools
 import json
 import os
-from typing import List, Dict
-from question_automation import QuestionAnalyzer
-from json_converter import DatasetToJSON
-from ai_solver import MathSolver
-from visual_generator import VisualExplanationGenerator
-from bonus_validator import AutoSaveManager
+import time
+from multiprocessing.util import Finalize
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple
+from question_automation import QuestionRecord
+from build_cache import BuildCache
+from metrics import Metrics, ProgressReporter
+from profiling import Profiler
+
+STAGE_SECONDS = "pipeline_stage_seconds"
+STAGE_ERRORS = "pipeline_errors_total"
+
+# Profile targets and the per-question method each one wraps.
+PROFILE_STAGES = {
+    "analyze": "analyze_one",
+    "solve": "solve_one",
+    "render": "render_one",
+    "validate": "save_one",
+}
+
+# Stage modules (the solver, PIL via visual_generator, the save manager and
+# its output directories) are imported and built on first use, so a run that
+# only needs some stages never pays for the others.
+
+_worker_pipeline = None
+
+def _init_worker(output_dir: str, cache_path: Optional[str] = None,
+                 output_format: str = "files", store_options: Optional[Dict] = None,
+                 profile: Optional[Dict] = None):
+    global _worker_pipeline
+    profiler = Profiler(tag=f"worker{os.getpid()}", **profile) if profile else False
+    _worker_pipeline = QuestionToVisualPipeline(
+        output_dir, cache_path=cache_path,
+        output_format=output_format, store_options=store_options, profiler=profiler
+    )
+    # Close this worker's JSONL shards when the pool shuts it down.
+    Finalize(_worker_pipeline, _worker_pipeline.close, exitpriority=10)
+
+def _process_batch(batch: List[Tuple[int, object]]) -> Tuple[List[Dict], Optional[Dict], Dict]:
+    results = [_worker_pipeline.process_one(i, payload) for i, payload in batch]
+    _worker_pipeline.flush()
+    metrics = _worker_pipeline.metrics.pop()
+    cache = _worker_pipeline.cache
+    if cache is None:
+        return results, None, metrics
+    cache.flush()
+    return results, cache.pop_stats(), metrics
+
+def write_if_changed(path: str, content: bytes):
+    if os.path.exists(path) and os.path.getsize(path) == len(content):
+        with open(path, 'rb') as f:
+            if f.read() == content:
+                return
+    with open(path, 'wb') as f:
+        f.write(content)
 
 class QuestionToVisualPipeline:
     
-    def __init__(self, output_dir="outputs"):
-        self.analyzer = QuestionAnalyzer()
-        self.converter = DatasetToJSON()
-        self.solver = MathSolver()
-        self.visual_gen = VisualExplanationGenerator()
-        self.save_manager = AutoSaveManager(output_dir)
+    def __init__(self, output_dir="outputs", workers=1, batch_size=16, cache_path=None,
+                 output_format="files", store_options=None, metrics=None, quiet=False,
+                 progress_interval=None, profiler=None, dedup=None):
+        # metrics: a metrics.Metrics (default) or NullMetrics to record nothing.
+        # quiet drops the per-question lines; progress_interval prints a
+        # progress/ETA line every that many seconds instead.
+        # profiler: a profiling.Profiler over PROFILE_STAGES; by default one is
+        # built from PIPELINE_PROFILE* environment variables (False disables).
+        # dedup: True or a dedup.NearDuplicateIndex; streaming runs then
+        # process one question per near-duplicate cluster.
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.quiet = quiet
+        self.progress = ProgressReporter(progress_interval) if progress_interval else None
+        self.output_format = output_format
+        self.store_options = store_options or {}
         self.output_dir = output_dir
+        self.workers = max(1, workers)
+        self.batch_size = batch_size
+        self.cache_path = cache_path
+        self.cache = BuildCache(cache_path) if cache_path else None
+        self._analyzer = None
+        self._converter = None
+        self._solver = None
+        self._visual_gen = None
+        self._save_manager = None
+        if profiler is None:
+            profiler = Profiler.from_env("PIPELINE_PROFILE", os.path.join(output_dir, "profile"), PROFILE_STAGES)
+        self.profiler = profiler or None
+        if dedup is True:
+            from dedup import NearDuplicateIndex
+            dedup = NearDuplicateIndex()
+        self.dedup = dedup or None
+        if self.profiler is not None:
+            # Shadow the profiled stage methods on this instance only, so
+            # unprofiled runs call them directly.
+            for stage in self.profiler.targets:
+                method = PROFILE_STAGES[stage]
+                setattr(self, method, self.profiler.wrap(stage, getattr(self, method)))
+    
+    @property
+    def analyzer(self):
+        if self._analyzer is None:
+            from question_automation import QuestionAnalyzer
+            self._analyzer = QuestionAnalyzer()
+        return self._analyzer
+    
+    @property
+    def converter(self):
+        if self._converter is None:
+            from json_converter import DatasetToJSON
+            self._converter = DatasetToJSON()
+        return self._converter
+    
+    @property
+    def solver(self):
+        if self._solver is None:
+            from ai_solver import MathSolver
+            self._solver = MathSolver()
+        return self._solver
+    
+    @property
+    def visual_gen(self):
+        if self._visual_gen is None:
+            from visual_generator import VisualExplanationGenerator
+            self._visual_gen = VisualExplanationGenerator()
+        return self._visual_gen
+    
+    @property
+    def save_manager(self):
+        if self._save_manager is None:
+            from bonus_validator import AutoSaveManager
+            self._save_manager = AutoSaveManager(self.output_dir, self.output_format, **self.store_options)
+        return self._save_manager
+    
+    def say(self, message: str):
+        # Per-question output, dropped in quiet mode.
+        if not self.quiet:
+            print(message)
+    
+    def progress_start(self, label: str, total: Optional[int] = None):
+        if self.progress is not None:
+            self.progress.start(label, total)
+    
+    def progress_update(self):
+        if self.progress is not None:
+            self.progress.update()
+    
+    def progress_finish(self):
+        if self.progress is not None:
+            self.progress.finish()
     
     def process_raw_dataset(self, raw_text: str) -> List[Dict]:
         print("Step 1: Analyzing questions...")
-        structured_data = self.converter.parse_raw_dataset(raw_text)
+        blocks = self.converter.split_raw_dataset(raw_text)
+        self.progress_start("analyze", len(blocks))
+        structured_data = []
+        for qa in blocks:
+            q = self.analyze_one(qa)
+            if q is not None:
+                structured_data.append(q)
+            self.progress_update()
+        self.progress_finish()
         print(f"Analyzed {len(structured_data)} questions")
         return structured_data
     
+    def analyze_one(self, qa: str) -> Optional[Dict]:
+        with self.metrics.time(STAGE_SECONDS, STAGE_ERRORS, stage="analyze"):
+            key = self.cache.key("analyze", qa) if self.cache else None
+            if key:
+                cached = self.cache.get_json("analyze", key)
+                if cached is not None:
+                    return cached
+            
+            analyzed = self.converter.parse_qa_block(qa)
+            if analyzed is None:
+                return None
+            q = asdict(analyzed)
+            if key:
+                self.cache.put_json("analyze", key, q)
+            return q
+    
+    def analyze_lazily(self, questions: Iterable) -> Iterator:
+        # For questions parsed on the fly (DatasetToJSON.iter_file): each step
+        # of the iterator, file read included, counts as the analyze stage.
+        step = functools.partial(next, iter(questions), None)
+        if self.profiler is not None and "analyze" in self.profiler.targets:
+            step = self.profiler.wrap("analyze", step)
+        while True:
+            start = time.perf_counter()
+            q = step()
+            if q is None:
+                return
+            self.metrics.observe(STAGE_SECONDS, time.perf_counter() - start, stage="analyze")
+            yield q
+    
+    def skip_duplicates(self, items: Iterable[Tuple[int, object]]) -> Iterator[Tuple[int, object]]:
+        # Passes on canonical questions only. Each near-duplicate is written to
+        # json/duplicates.jsonl with the number of the question whose outputs it shares.
+        if self.dedup is None:
+            yield from items
+            return
+        
+        links_path = os.path.join(self.output_dir, "json", "duplicates.jsonl")
+        os.makedirs(os.path.dirname(links_path), exist_ok=True)
+        with open(links_path, 'w', encoding='utf-8') as links:
+            for i, q in items:
+                match = self.dedup.add(i, q['raw_text'] if isinstance(q, dict) else q.raw_text)
+                if match is None:
+                    self.metrics.inc("pipeline_dedup_total", result="unique")
+                    yield i, q
+                    continue
+                self.metrics.inc("pipeline_dedup_total", result="duplicate")
+                links.write(json.dumps({"number": i, "duplicate_of": match[0],
+                                        "similarity": round(match[1], 3)}) + "\n")
+    
+    def solve_one(self, q: Dict) -> Dict:
+        with self.metrics.time(STAGE_SECONDS, STAGE_ERRORS, stage="solve"):
+            outcome = self._solve(q)
+        self.metrics.inc("pipeline_solver_outcomes_total", outcome=outcome)
+        return q
+    
+    def _solve(self, q: Dict) -> str:
+        if q.get('solution_steps') and len(q.get('solution_steps', [])) >= 2:
+            return "provided"
+        
+        key = self.cache.key("solve", q) if self.cache else None
+        if key:
+            cached = self.cache.get_json("solve", key)
+            if cached is not None:
+                q.update(cached)
+                return "cached"
+        
+        ai_solution = self.solver.solve_question(q)
+        q['solution_steps'] = ai_solution['steps']
+        q['answer'] = ai_solution.get('answer', q.get('answer', 'N/A'))
+        q['formula_used'] = ai_solution.get('formula_used', [])
+        
+        if key:
+            self.cache.put_json("solve", key, q)
+        return "unsolved" if q['answer'] in (None, 'N/A') else "solved"
+    
+    def render_key(self, q: Dict, q_number: int) -> str:
+        gen = self.visual_gen
+        template = [gen.width, gen.height, gen.padding, gen.bg_color,
+                    gen.primary_color, gen.secondary_color, gen.accent_color]
+        return self.cache.key("render", q, str(q_number), template)
+    
+    def render_cached(self, key: str, img_path: str) -> bool:
+        png = self.cache.get("render", key)
+        if png is None:
+            return False
+        write_if_changed(img_path, png)
+        return True
+    
+    def store_render(self, key: str, img_path: Optional[str]):
+        if img_path:
+            with open(img_path, 'rb') as f:
+                self.cache.put("render", key, f.read())
+    
+    def render_one(self, q: Dict, q_number: int) -> Optional[str]:
+        with self.metrics.time(STAGE_SECONDS, STAGE_ERRORS, stage="render"):
+            img_path = self._render(q, q_number)
+        self.metrics.inc("pipeline_visuals_total", result="rendered" if img_path else "failed")
+        return img_path
+    
+    def _render(self, q: Dict, q_number: int) -> Optional[str]:
+        img_path = os.path.join(self.output_dir, "visuals", f"question_{q_number}.png")
+        os.makedirs(os.path.dirname(img_path), exist_ok=True)
+        if self.cache is None:
+            return self.visual_gen.render_to_file(q, q_number, img_path)
+        
+        key = self.render_key(q, q_number)
+        if self.render_cached(key, img_path):
+            return img_path
+        img_path = self.visual_gen.render_to_file(q, q_number, img_path)
+        self.store_render(key, img_path)
+        return img_path
+    
+    def save_one(self, q: Dict, q_number: int) -> Tuple[bool, str]:
+        with self.metrics.time(STAGE_SECONDS, STAGE_ERRORS, stage="validate"):
+            is_valid, json_path = self._save(q, q_number)
+        self.metrics.inc("pipeline_validation_total", result="valid" if is_valid else "invalid")
+        return is_valid, json_path
+    
+    def _save(self, q: Dict, q_number: int) -> Tuple[bool, str]:
+        if self.cache is None:
+            return self.save_manager.save_question(q, q_number)
+        
+        key = self.cache.key("validate", q)
+        cached = self.cache.get_json("validate", key)
+        if cached is not None and self.output_format == "jsonl":
+            q['validation'] = cached["validation"]
+            is_valid = cached["validation"]["is_valid"]
+            return is_valid, self.save_manager.write_question(q, q_number, is_valid)
+        if cached is not None:
+            q['validation'] = cached["validation"]
+            is_valid = cached["validation"]["is_valid"]
+            json_path = self.save_manager.question_path(q_number, is_valid)
+            os.makedirs(os.path.dirname(json_path), exist_ok=True)
+            write_if_changed(json_path, cached["document"].encode('utf-8'))
+            return is_valid, json_path
+        
+        is_valid, json_path = self.save_manager.save_question(q, q_number)
+        if self.output_format == "jsonl":
+            document = json.dumps(q, indent=2, ensure_ascii=False)
+        else:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                document = f.read()
+        self.cache.put_json("validate", key, {"validation": q['validation'], "document": document})
+        return is_valid, json_path
+    
+    def flush(self):
+        if self._save_manager is not None:
+            self._save_manager.flush()
+    
+    def close(self):
+        if self._save_manager is not None:
+            self._save_manager.close()
+        if self.profiler is not None:
+            return self.profiler.write()
+    
+    def finish(self):
+        profile_paths = self.close()
+        self.report_cache()
+        if self.dedup is not None:
+            print(self.dedup.summary())
+        self.write_metrics()
+        if profile_paths:
+            print(f"Profile saved: {self.profiler.run_dir} ({len(profile_paths)} files)")
+    
+    def write_metrics(self):
+        # Copies the cache counters in and writes logs/metrics.prom + .json.
+        if not self.metrics.enabled:
+            return
+        if self.cache is not None:
+            for stage, counts in self.cache.stats.items():
+                for result, count in counts.items():
+                    self.metrics.set("build_cache_lookups_total", count, stage=stage, result=result)
+        if self._solver is not None:
+            stats = self._solver.cache.stats()
+            self.metrics.set("solver_cache_lookups_total", stats["hits"], result="hit")
+            self.metrics.set("solver_cache_lookups_total", stats["misses"], result="miss")
+        prom_path, json_path = self.metrics.write(os.path.join(self.output_dir, "logs"))
+        print(f"Metrics saved: {prom_path}, {json_path}")
+    
+    def report_cache(self):
+        if self.cache is not None:
+            self.cache.flush()
+            print(self.cache.summary())
+    
+    def process_one(self, q_number: int, payload) -> Dict:
+        # Runs analyze -> solve -> render -> validate/save for one question.
+        # payload is a raw Q./Sol: block, a Question, a QuestionRecord or an analyzed dict.
+        if isinstance(payload, str):
+            payload = self.analyze_one(payload)
+        if isinstance(payload, QuestionRecord):
+            payload = payload.to_dict()
+        if not isinstance(payload, dict):
+            payload = asdict(payload)
+        
+        with self.metrics.time("pipeline_question_seconds"):
+            raw = dict(payload)
+            q = self.solve_one(payload)
+            visual = self.render_one(q, q_number)
+            is_valid, json_path = self.save_one(q, q_number)
+        self.metrics.inc("pipeline_questions_total")
+        
+        return {
+            "number": q_number,
+            "raw": raw,
+            "question": q,
+            "visual": visual,
+            "is_valid": is_valid
+        }
+    
+    def map_questions(self, items: Iterable[Tuple[int, object]]) -> Iterator[Dict]:
+        # Yields process_one results in input order. With workers > 1 the
+        # items are sharded in batches across a process pool, keeping only a
+        # bounded window of batches in flight so lazy inputs stay lazy.
+        if self.workers == 1:
+            for i, payload in items:
+                yield self.process_one(i, payload)
+            return
+        
+        window = self.workers * 4
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.output_dir, self.cache_path, self.output_format, self.store_options,
+                      self.profiler.config() if self.profiler else None)
+        ) as pool:
+            pending = deque()
+            batch = []
+            
+            for item in items:
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    pending.append(pool.submit(_process_batch, batch))
+                    batch = []
+                    if len(pending) >= window:
+                        yield from self._collect(pending.popleft())
+            
+            if batch:
+                pending.append(pool.submit(_process_batch, batch))
+            while pending:
+                yield from self._collect(pending.popleft())
+    
+    def _collect(self, future) -> List[Dict]:
+        results, cache_stats, metrics = future.result()
+        if cache_stats and self.cache is not None:
+            self.cache.merge_stats(cache_stats)
+        self.metrics.merge(metrics)
+        return results
+    
     def enhance_with_ai_solutions(self, questions: List[Dict]) -> List[Dict]:
         print("\nStep 2: Generating AI solutions...")
         enhanced = []
+        self.progress_start("solve", len(questions))
         
         for i, q in enumerate(questions, 1):
-            if not q.get('solution_steps') or len(q.get('solution_steps', [])) < 2:
-                ai_solution = self.solver.solve_question(q)
-                q['solution_steps'] = ai_solution['steps']
-                q['answer'] = ai_solution.get('answer', q.get('answer', 'N/A'))
-                q['formula_used'] = ai_solution.get('formula_used', [])
-            
-            enhanced.append(q)
-            print(f"  Q{i}: {q.get('question_type', 'unknown')} - Solution generated")
+            enhanced.append(self.solve_one(q))
+            self.say(f"  Q{i}: {q.get('question_type', 'unknown')} - Solution generated")
+            self.progress_update()
         
+        self.progress_finish()
         print(f"Enhanced {len(enhanced)} questions with AI solutions")
         return enhanced
     
@@ -47,18 +436,35 @@ class QuestionToVisualPipeline:
         visual_dir = os.path.join(self.output_dir, "visuals")
         os.makedirs(visual_dir, exist_ok=True)
         
-        visual_paths = []
-        
-        for i, q in enumerate(questions, 1):
-            try:
-                img = self.visual_gen.generate_visual(q, i)
+        if self.workers > 1:
+            visual_paths = [None] * len(questions)
+            items = []
+            keys = {}
+            for i, q in enumerate(questions, 1):
                 img_path = os.path.join(visual_dir, f"question_{i}.png")
-                img.save(img_path)
-                visual_paths.append(img_path)
-                print(f"  Q{i}: Visual created")
-            except Exception as e:
-                print(f"  Q{i}: Error - {str(e)}")
-                visual_paths.append(None)
+                if self.cache is not None:
+                    keys[i] = self.render_key(q, i)
+                    if self.render_cached(keys[i], img_path):
+                        visual_paths[i - 1] = img_path
+                        continue
+                items.append((q, i, img_path))
+            
+            rendered = self.visual_gen.render_batch(items, self.workers) if items else []
+            for (q, i, _), img_path in zip(items, rendered):
+                visual_paths[i - 1] = img_path
+                if self.cache is not None:
+                    self.store_render(keys[i], img_path)
+        else:
+            self.progress_start("render", len(questions))
+            visual_paths = []
+            for i, q in enumerate(questions, 1):
+                visual_paths.append(self.render_one(q, i))
+                self.progress_update()
+            self.progress_finish()
+        
+        for i, img_path in enumerate(visual_paths, 1):
+            if img_path:
+                self.say(f"  Q{i}: Visual created")
         
         print(f"Generated {len([p for p in visual_paths if p])} visuals")
         return visual_paths
@@ -66,23 +472,25 @@ class QuestionToVisualPipeline:
     def validate_and_save(self, questions: List[Dict]) -> Dict:
         print("\nStep 4: Validating and saving...")
         
-        validated_questions = []
+        report = self.save_manager.report_builder()
         stats = {"valid": 0, "invalid": 0}
+        self.progress_start("validate", len(questions))
         
         for i, q in enumerate(questions, 1):
-            is_valid, json_path = self.save_manager.save_question(q, i)
-            validated_questions.append(q)
+            is_valid, json_path = self.save_one(q, i)
+            report.add(i, q['validation'])
             
             if is_valid:
                 stats["valid"] += 1
-                print(f"  Q{i}: Valid")
+                self.say(f"  Q{i}: Valid")
             else:
                 stats["invalid"] += 1
                 errors = q.get('validation', {}).get('errors', [])
-                print(f"  Q{i}: Invalid - {', '.join(errors)}")
+                self.say(f"  Q{i}: Invalid - {', '.join(errors)}")
+            self.progress_update()
         
-        report = self.save_manager.generate_validation_report(validated_questions)
-        report_path = self.save_manager.save_report(report)
+        self.progress_finish()
+        report_path = report.finish()
         
         print(f"\nValidation complete: {stats['valid']} valid, {stats['invalid']} invalid")
         print(f"Report saved: {report_path}")
@@ -90,6 +498,8 @@ class QuestionToVisualPipeline:
         return stats
     
     def run_complete_pipeline(self, raw_dataset: str):
+        if self.workers > 1:
+            return self.run_parallel_pipeline(raw_dataset)
         
         print("QUESTION TO VISUAL AUTOMATION PIPELINE\n")
         
@@ -116,6 +526,108 @@ class QuestionToVisualPipeline:
         print(f"Invalid Questions: {stats['invalid']}")
         print(f"Visuals Generated: {len([p for p in visual_paths if p])}")
         print(f"Output Directory: {self.output_dir}")
+        self.finish()
+        
+        return stats
+    
+    def run_parallel_pipeline(self, raw_dataset: str):
+        print(f"QUESTION TO VISUAL AUTOMATION PIPELINE ({self.workers} workers)\n")
+        
+        blocks = self.converter.split_raw_dataset(raw_dataset)
+        print(f"Processing {len(blocks)} questions...")
+        
+        self.progress_start("pipeline", len(blocks))
+        results = []
+        for result in self.map_questions(enumerate(blocks, 1)):
+            results.append(result)
+            self.progress_update()
+        self.progress_finish()
+        
+        json_path = os.path.join(self.output_dir, "json", "raw_dataset.json")
+        os.makedirs(os.path.dirname(json_path), exist_ok=True)
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump({"questions": [r["raw"] for r in results]}, f, indent=2, ensure_ascii=False)
+        print(f"Raw JSON saved: {json_path}")
+        
+        stats = {"valid": 0, "invalid": 0}
+        report = self.save_manager.report_builder()
+        for r in results:
+            stats["valid" if r["is_valid"] else "invalid"] += 1
+            report.add(r["number"], r["question"]['validation'])
+        report_path = report.finish()
+        
+        print("PIPELINE COMPLETE")
+        
+        print(f"\nTotal Questions Processed: {len(results)}")
+        print(f"Valid Questions: {stats['valid']}")
+        print(f"Invalid Questions: {stats['invalid']}")
+        print(f"Visuals Generated: {len([r for r in results if r['visual']])}")
+        print(f"Output Directory: {self.output_dir}")
+        self.finish()
+        
+        return stats
+    
+    def run_streaming_pipeline(self, questions: Iterable):
+        # Consumes questions lazily (e.g. from DatasetToJSON.iter_file) and
+        # runs every stage per question; the validation report is built
+        # incrementally, so memory does not grow with the number of questions.
+        print("QUESTION TO VISUAL AUTOMATION PIPELINE (streaming)\n")
+        
+        json_path = os.path.join(self.output_dir, "json", "raw_dataset.json")
+        visual_dir = os.path.join(self.output_dir, "visuals")
+        os.makedirs(os.path.dirname(json_path), exist_ok=True)
+        os.makedirs(visual_dir, exist_ok=True)
+        
+        stats = {"valid": 0, "invalid": 0}
+        visuals = 0
+        report = self.save_manager.report_builder()
+        total = 0
+        self.progress_start("pipeline")
+        
+        with open(json_path, 'w', encoding='utf-8') as raw_out:
+            raw_out.write('{\n  "questions": [')
+            
+            items = self.skip_duplicates(enumerate(self.analyze_lazily(questions), 1))
+            for result in self.map_questions(items):
+                i = result["number"]
+                q = result["question"]
+                
+                raw_out.write(',\n    ' if total else '\n    ')
+                raw_out.write(json.dumps(result["raw"], ensure_ascii=False))
+                
+                if result["visual"]:
+                    visuals += 1
+                
+                is_valid = result["is_valid"]
+                stats["valid" if is_valid else "invalid"] += 1
+                report.add(i, q['validation'])
+                total += 1
+                self.say(f"  Q{i}: {q.get('question_type', 'unknown')} - {'Valid' if is_valid else 'Invalid'}")
+                self.progress_update()
+            
+            raw_out.write('\n  ]\n}\n')
+        self.progress_finish()
+        print(f"Raw JSON saved: {json_path}")
+        
+        report_path = report.finish()
+        
+        print("PIPELINE COMPLETE")
+        
+        print(f"\nTotal Questions Processed: {total}")
+        print(f"Valid Questions: {stats['valid']}")
+        print(f"Invalid Questions: {stats['invalid']}")
+        print(f"Visuals Generated: {visuals}")
+        print(f"Output Directory: {self.output_dir}")
+        self.finish()
+        
+        return stats
+    
+    def run_pipeline_from_file(self, dataset_file: str, pdf_workers: Optional[int] = None):
+        # .pdf banks are extracted page by page in pdf_workers processes.
+        if dataset_file.lower().endswith('.pdf'):
+            from pdf_ingest import iter_pdf_questions
+            return self.run_streaming_pipeline(iter_pdf_questions(dataset_file, self.converter, pdf_workers))
+        return self.run_streaming_pipeline(self.converter.iter_file(dataset_file))
        
 
 if __name__ == "__main__":
@@ -0,0 +1,277 @@
+# Metrics: counters and latency histograms with Prometheus text and JSON export
+
+import json
+import os
+import sys
+import time
+from bisect import bisect_left
+from typing import Dict, Optional, Tuple
+
+# Upper bounds in seconds, from 100 µs (analysis, validation) to 10 s (LLM calls).
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HELP = {
+    "pipeline_stage_seconds": "Time spent in one pipeline stage for one question",
+    "pipeline_question_seconds": "Time to take one question through every stage",
+    "pipeline_questions_total": "Questions finished by the pipeline",
+    "pipeline_errors_total": "Exceptions raised by a stage, by exception type",
+    "pipeline_solver_outcomes_total": "solve stage outcomes",
+    "pipeline_visuals_total": "render stage outcomes",
+    "pipeline_validation_total": "validate stage outcomes",
+    "build_cache_lookups_total": "Build cache lookups by stage and result",
+    "solver_cache_lookups_total": "MathSolver memo lookups by result",
+    "pipeline_dedup_total": "Ingested questions that were unique vs near-duplicates",
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+def label_key(labels: Dict) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+def format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+class Histogram:
+    __slots__ = ('counts', 'total', 'count')
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def merge(self, other: Dict):
+        for i, c in enumerate(other["counts"]):
+            self.counts[i] += c
+        self.total += other["sum"]
+        self.count += other["count"]
+
+    def quantile(self, q: float) -> Optional[float]:
+        # Upper bound of the bucket holding the q-th observation (None past the last bucket).
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, c in zip(LATENCY_BUCKETS + (float('inf'),), self.counts):
+            seen += c
+            if seen >= rank:
+                return bound if bound != float('inf') else None
+        return None
+
+    def to_dict(self) -> Dict:
+        return {"counts": list(self.counts), "sum": self.total, "count": self.count}
+
+class Timer:
+    # Observes the elapsed time of a with-block; if errors is set, an
+    # exception leaving the block is also counted there by its type.
+    __slots__ = ('metrics', 'name', 'errors', 'labels', 'start')
+
+    def __init__(self, metrics: "Metrics", name: str, errors: Optional[str], labels: Dict):
+        self.metrics = metrics
+        self.name = name
+        self.errors = errors
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics.observe(self.name, time.perf_counter() - self.start, **self.labels)
+        if exc_type is not None and self.errors:
+            self.metrics.inc(self.errors, exception=exc_type.__name__, **self.labels)
+        return False
+
+class Metrics:
+    # In-process registry. Counters and histograms are keyed by name plus a
+    # sorted label tuple; pop() / merge() move a worker's numbers to the parent.
+
+    enabled = True
+
+    def __init__(self):
+        self.counters: Dict[str, Dict[LabelKey, float]] = {}
+        self.histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+
+    def inc(self, name: str, value: float = 1, **labels):
+        series = self.counters.setdefault(name, {})
+        key = label_key(labels)
+        series[key] = series.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels):
+        # For totals kept elsewhere (e.g. cache stats) copied in at export time.
+        self.counters.setdefault(name, {})[label_key(labels)] = value
+
+    def observe(self, name: str, seconds: float, **labels):
+        series = self.histograms.setdefault(name, {})
+        key = label_key(labels)
+        histogram = series.get(key)
+        if histogram is None:
+            histogram = series[key] = Histogram()
+        histogram.observe(seconds)
+
+    def time(self, name: str, errors: Optional[str] = None, **labels) -> Timer:
+        return Timer(self, name, errors, labels)
+
+    def state(self) -> Dict:
+        return {
+            "counters": {name: [[list(key), value] for key, value in series.items()]
+                         for name, series in self.counters.items()},
+            "histograms": {name: [[list(key), h.to_dict()] for key, h in series.items()]
+                           for name, series in self.histograms.items()},
+        }
+
+    def pop(self) -> Dict:
+        state = self.state()
+        self.counters = {}
+        self.histograms = {}
+        return state
+
+    def merge(self, state: Dict):
+        for name, series in state["counters"].items():
+            for key, value in series:
+                labels = dict(tuple(pair) for pair in key)
+                self.inc(name, value, **labels)
+        for name, series in state["histograms"].items():
+            target = self.histograms.setdefault(name, {})
+            for key, data in series:
+                key = tuple(tuple(pair) for pair in key)
+                histogram = target.get(key)
+                if histogram is None:
+                    histogram = target[key] = Histogram()
+                histogram.merge(data)
+
+    def snapshot(self) -> Dict:
+        # JSON-friendly view with bucket-based p50/p90/p99 per histogram.
+        counters = {}
+        for name, series in sorted(self.counters.items()):
+            counters[name] = [{"labels": dict(key), "value": value} for key, value in sorted(series.items())]
+        histograms = {}
+        for name, series in sorted(self.histograms.items()):
+            histograms[name] = [{
+                "labels": dict(key),
+                "count": h.count,
+                "sum": round(h.total, 6),
+                "mean": round(h.total / h.count, 6) if h.count else 0.0,
+                "p50": h.quantile(0.5),
+                "p90": h.quantile(0.9),
+                "p99": h.quantile(0.99),
+            } for key, h in sorted(series.items())]
+        return {"timestamp": time.time(), "counters": counters, "histograms": histograms}
+
+    def to_prometheus(self) -> str:
+        lines = []
+        for name, series in sorted(self.counters.items()):
+            if name in HELP:
+                lines.append(f"# HELP {name} {HELP[name]}")
+            lines.append(f"# TYPE {name} counter")
+            for key, value in sorted(series.items()):
+                lines.append(f"{name}{format_labels(key)} {value:g}")
+        for name, series in sorted(self.histograms.items()):
+            if name in HELP:
+                lines.append(f"# HELP {name} {HELP[name]}")
+            lines.append(f"# TYPE {name} histogram")
+            for key, h in sorted(series.items()):
+                cumulative = 0
+                for bound, c in zip(LATENCY_BUCKETS, h.counts):
+                    cumulative += c
+                    lines.append(f"{name}_bucket{format_labels(key, ('le', f'{bound:g}'))} {cumulative}")
+                lines.append(f"{name}_bucket{format_labels(key, ('le', '+Inf'))} {h.count}")
+                lines.append(f"{name}_sum{format_labels(key)} {h.total:.6f}")
+                lines.append(f"{name}_count{format_labels(key)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, directory: str, prefix: str = "metrics") -> Tuple[str, str]:
+        # Writes <prefix>.prom (Prometheus text format, e.g. for the
+        # node_exporter textfile collector) and <prefix>.json.
+        os.makedirs(directory, exist_ok=True)
+        prom_path = os.path.join(directory, f"{prefix}.prom")
+        json_path = os.path.join(directory, f"{prefix}.json")
+        with open(prom_path + ".tmp", 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
+        os.replace(prom_path + ".tmp", prom_path)
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, indent=2)
+        return prom_path, json_path
+
+class NullMetrics(Metrics):
+    # Drop-in replacement that records nothing.
+
+    enabled = False
+
+    def inc(self, name: str, value: float = 1, **labels):
+        pass
+
+    def set(self, name: str, value: float, **labels):
+        pass
+
+    def observe(self, name: str, seconds: float, **labels):
+        pass
+
+    def write(self, directory: str, prefix: str = "metrics") -> Tuple[str, str]:
+        return None, None
+
+class ProgressReporter:
+    # Prints "label: done/total (pct) rate q/s, ETA" at most every interval
+    # seconds, on one line that is overwritten when the stream is a terminal.
+
+    def __init__(self, interval: float = 5.0, stream=None):
+        self.interval = interval
+        self.stream = stream or sys.stderr
+        self.tty = hasattr(self.stream, "isatty") and self.stream.isatty()
+        self.label = ""
+        self.total = None
+        self.done = 0
+        self.started = self.last = time.monotonic()
+
+    def start(self, label: str, total: Optional[int] = None):
+        self.label = label
+        self.total = total
+        self.done = 0
+        self.started = self.last = time.monotonic()
+
+    def update(self, n: int = 1):
+        self.done += n
+        now = time.monotonic()
+        if now - self.last >= self.interval:
+            self.last = now
+            self.emit(now)
+
+    def line(self, now: float) -> str:
+        elapsed = now - self.started
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        text = f"{self.label}: {self.done}"
+        if self.total:
+            text += f"/{self.total} ({self.done / self.total:.0%})"
+        text += f", {rate:.0f} q/s"
+        if self.total and rate > 0:
+            text += f", ETA {format_duration((self.total - self.done) / rate)}"
+        else:
+            text += f", elapsed {format_duration(elapsed)}"
+        return text
+
+    def emit(self, now: Optional[float] = None):
+        text = self.line(now or time.monotonic())
+        self.stream.write(("\r" + text + "\033[K") if self.tty else (text + "\n"))
+        self.stream.flush()
+
+    def finish(self):
+        if self.done:
+            self.emit()
+            if self.tty:
+                self.stream.write("\n")
+
+def format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
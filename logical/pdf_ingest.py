@@ -0,0 +1,134 @@
+# PDF Ingestion: extracts question-bank PDFs page by page across processes and streams Q./Sol: blocks
+
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, Optional, Set
+
+# A line that is only a page number ("12", "Page 12", "12 of 300", "12/300").
+# It is dropped from the top or bottom of a page only when the number is that
+# page's index or runs on from a page number at the edge of a neighbouring
+# page, so a bare answer such as "120" or "3/4" is kept.
+PAGE_NUMBER = re.compile(r'^\s*(?:page\s+)?(\d+)(?:\s*(?:of|/)\s*(\d+))?\s*$', re.IGNORECASE)
+
+_worker_reader = None
+
+def open_pdf(path: str):
+    # PyPDF2 is only imported when a PDF is actually read.
+    from PyPDF2 import PdfReader
+    return PdfReader(path)
+
+def _init_worker(path: str):
+    global _worker_reader
+    _worker_reader = open_pdf(path)
+
+def _extract_pages(start: int, end: int) -> List[str]:
+    return extract_pages(_worker_reader, start, end)
+
+def extract_pages(reader, start: int, end: int) -> List[str]:
+    texts = [reader.pages[i].extract_text() or "" for i in range(start, end)]
+    # PyPDF2 keeps every object it has parsed; dropping them per chunk keeps
+    # memory flat (they are re-read from the file if needed again).
+    cache = getattr(reader, "resolved_objects", None)
+    if cache is not None:
+        cache.clear()
+    return texts
+
+def page_count(path: str) -> int:
+    return len(open_pdf(path).pages)
+
+def iter_pdf_pages(path: str, workers: Optional[int] = None, chunk_pages: int = 16) -> Iterator[str]:
+    # Yields page texts in page order. Chunks of chunk_pages pages are
+    # extracted by a pool of workers, each with its own open reader; only
+    # workers * 4 chunks are in flight, so memory stays bounded however
+    # long the document is.
+    reader = open_pdf(path)
+    total = len(reader.pages)
+    workers = max(1, min(workers or os.cpu_count() or 1, -(-total // chunk_pages) or 1))
+    if workers == 1:
+        for start in range(0, total, chunk_pages):
+            yield from extract_pages(reader, start, min(start + chunk_pages, total))
+        return
+
+    del reader
+    window = workers * 4
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(path,)) as pool:
+        pending = deque()
+        for start in range(0, total, chunk_pages):
+            pending.append(pool.submit(_extract_pages, start, min(start + chunk_pages, total)))
+            if len(pending) >= window:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+def page_number_value(line: str, total: Optional[int] = None) -> Optional[int]:
+    # The number a page-number-like line shows; "N of M" / "N/M" only count
+    # when M is the document's page count.
+    match = PAGE_NUMBER.match(line)
+    if not match or (match.group(2) and total is not None and int(match.group(2)) != total):
+        return None
+    return int(match.group(1))
+
+def edge_numbers(lines: List[str], total: Optional[int] = None) -> Set[int]:
+    # Numbers on the page-number-like lines at the top and bottom of a page.
+    numbers = set()
+    for edge in (lines, lines[::-1]):
+        for line in edge:
+            if not line.strip():
+                continue
+            value = page_number_value(line, total)
+            if value is None:
+                break
+            numbers.add(value)
+    return numbers
+
+def page_lines(text: str, page_numbers: Iterable[int] = (), total: Optional[int] = None) -> List[str]:
+    # Drops blank lines and lines showing one of page_numbers from both edges.
+    lines = text.splitlines()
+    page_numbers = set(page_numbers)
+    if page_numbers:
+        def strip(line):
+            return not line.strip() or page_number_value(line, total) in page_numbers
+        while lines and strip(lines[-1]):
+            lines.pop()
+        while lines and strip(lines[0]):
+            lines.pop(0)
+    return [line + "\n" for line in lines]
+
+def pdf_lines(pages: Iterable[str], total: Optional[int] = None, strip_page_numbers: bool = True) -> Iterator[str]:
+    # Every page is cut into whole lines, so a Q./Sol: block that runs onto
+    # the next page simply continues on the following lines. Pages are held
+    # back by one so a page's numbers can be checked against both neighbours.
+    if not strip_page_numbers:
+        for text in pages:
+            yield from page_lines(text)
+        return
+
+    def stripped(previous, current, following):
+        index, text, numbers = current
+        accepted = {index} | {n for n in numbers
+                              if (previous and n - 1 in previous[2]) or (following and n + 1 in following[2])}
+        return page_lines(text, accepted, total)
+
+    previous = current = None
+    for index, text in enumerate(pages, 1):
+        page = (index, text, edge_numbers(text.splitlines(), total))
+        if current is not None:
+            yield from stripped(previous, current, page)
+        previous, current = current, page
+    if current is not None:
+        yield from stripped(previous, current, None)
+
+def iter_pdf_lines(path: str, workers: Optional[int] = None, chunk_pages: int = 16,
+                   strip_page_numbers: bool = True) -> Iterator[str]:
+    total = page_count(path) if strip_page_numbers else None
+    return pdf_lines(iter_pdf_pages(path, workers, chunk_pages), total, strip_page_numbers)
+
+def iter_pdf_questions(path: str, converter=None, workers: Optional[int] = None, chunk_pages: int = 16,
+                       compact: bool = False, strip_page_numbers: bool = True) -> Iterator:
+    # Same questions DatasetToJSON.iter_file yields for the text version of the PDF.
+    if converter is None:
+        from json_converter import DatasetToJSON
+        converter = DatasetToJSON()
+    return converter.iter_questions(iter_pdf_lines(path, workers, chunk_pages, strip_page_numbers), compact)
@@ -0,0 +1,12 @@
+# Profiling: opt-in cProfile / sampling profiles and tracemalloc reports per stage
+# (math_agent/src/math_agent/tools/profiling.py is the implementation)
+
+from shared_modules import load_shared
+
+_profiling = load_shared("profiling")
+
+PROFILE_MODES = _profiling.PROFILE_MODES
+Profiler = _profiling.Profiler
+collapse_stats = _profiling.collapse_stats
+parse_targets = _profiling.parse_targets
+write_collapsed = _profiling.write_collapsed
@@ -1,6 +1,8 @@
 # Task 1: Question Automation - Detect question type and extract key data
 
 import re
+import sys
+from array import array
 from typing import Dict, List, Optional
 from dataclasses import dataclass, asdict
 
@@ -13,6 +15,106 @@ class Question:
     solution_steps: List[str]
     answer: str
 
+# Compact records for large batches: __slots__ instead of per-instance dicts,
+# numbers in a float array, tuples for steps and interned type/topic strings.
+# to_dict() produces the same JSON schema as asdict(Question) plus the
+# formula_used / validation keys the pipeline adds.
+
+class KeyData:
+    __slots__ = ('numbers', 'has_percentage', 'has_currency',
+                 'profit_mentioned', 'loss_mentioned', 'discount_mentioned')
+    
+    FLAGS = ('profit_mentioned', 'loss_mentioned', 'discount_mentioned')
+    
+    def __init__(self, numbers, has_percentage: bool, has_currency: bool,
+                 profit_mentioned: Optional[bool] = None, loss_mentioned: Optional[bool] = None,
+                 discount_mentioned: Optional[bool] = None):
+        self.numbers = array('d', numbers)
+        self.has_percentage = has_percentage
+        self.has_currency = has_currency
+        self.profit_mentioned = profit_mentioned
+        self.loss_mentioned = loss_mentioned
+        self.discount_mentioned = discount_mentioned
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "KeyData":
+        return cls(data.get('numbers', ()), data.get('has_percentage', False),
+                   data.get('has_currency', False), *(data.get(flag) for flag in cls.FLAGS))
+    
+    def to_dict(self) -> Dict:
+        data = {
+            'numbers': self.numbers.tolist(),
+            'has_percentage': self.has_percentage,
+            'has_currency': self.has_currency
+        }
+        for flag in self.FLAGS:
+            value = getattr(self, flag)
+            if value is not None:
+                data[flag] = value
+        return data
+
+class ValidationResult:
+    __slots__ = ('is_valid', 'errors', 'warnings')
+    
+    def __init__(self, is_valid: bool, errors=(), warnings=()):
+        self.is_valid = is_valid
+        self.errors = tuple(errors)
+        self.warnings = tuple(warnings)
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ValidationResult":
+        return cls(data['is_valid'], data.get('errors', ()), data.get('warnings', ()))
+    
+    def to_dict(self) -> Dict:
+        return {"is_valid": self.is_valid, "errors": list(self.errors), "warnings": list(self.warnings)}
+
+class QuestionRecord:
+    __slots__ = ('raw_text', 'question_type', 'topic', 'key_data', 'solution_steps',
+                 'answer', 'formula_used', 'validation')
+    
+    def __init__(self, raw_text: str, question_type: str, topic: str, key_data: KeyData,
+                 solution_steps=(), answer: str = "", formula_used=None,
+                 validation: Optional[ValidationResult] = None):
+        self.raw_text = raw_text
+        self.question_type = sys.intern(question_type)
+        self.topic = sys.intern(topic)
+        self.key_data = key_data
+        self.solution_steps = tuple(solution_steps)
+        self.answer = answer
+        self.formula_used = tuple(formula_used) if formula_used is not None else None
+        self.validation = validation
+    
+    @classmethod
+    def from_question(cls, question: Question) -> "QuestionRecord":
+        return cls(question.raw_text, question.question_type, question.topic,
+                   KeyData.from_dict(question.key_data), question.solution_steps, question.answer)
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "QuestionRecord":
+        validation = data.get('validation')
+        return cls(
+            data['raw_text'], data['question_type'], data['topic'],
+            KeyData.from_dict(data.get('key_data', {})),
+            data.get('solution_steps', ()), data.get('answer', ""),
+            data.get('formula_used'),
+            ValidationResult.from_dict(validation) if validation is not None else None
+        )
+    
+    def to_dict(self) -> Dict:
+        data = {
+            'raw_text': self.raw_text,
+            'question_type': self.question_type,
+            'topic': self.topic,
+            'key_data': self.key_data.to_dict(),
+            'solution_steps': list(self.solution_steps),
+            'answer': self.answer
+        }
+        if self.formula_used is not None:
+            data['formula_used'] = list(self.formula_used)
+        if self.validation is not None:
+            data['validation'] = self.validation.to_dict()
+        return data
+
 class QuestionAnalyzer:
     
     QUESTION_PATTERNS = {
@@ -108,6 +210,17 @@ class QuestionAnalyzer:
             solution_steps=solution_steps,
             answer=answer
         )
+    
+    def analyze_record(self, question_text: str, solution_text: str = "") -> QuestionRecord:
+        q_type = self.detect_question_type(question_text)
+        return QuestionRecord(
+            question_text,
+            q_type,
+            q_type.replace('_', ' ').title(),
+            KeyData.from_dict(self.extract_key_data(question_text + " " + solution_text, q_type)),
+            self.parse_solution(solution_text) if solution_text else (),
+            self.extract_answer(solution_text) if solution_text else ""
+        )
 
 if __name__ == "__main__":
     analyzer = QuestionAnalyzer()
@@ -0,0 +1,191 @@
+# Record store: sharded append-only JSONL output with an offset index for random access
+
+import glob
+import gzip
+import json
+import os
+import time
+import zlib
+from typing import Dict, Iterator, List, Optional, Tuple
+
+FSYNC_POLICIES = ('never', 'flush', 'close')
+
+def writer_token() -> str:
+    # Unique per writer so concurrent processes never append to the same shard.
+    return f"{int(time.time() * 1000):x}-{os.getpid()}"
+
+class JsonlRecordWriter:
+    # Records are buffered and appended in batches. Each shard "<prefix>-<token>-NNNNN.jsonl"
+    # has a sibling ".idx" file with one "record_id<TAB>offset<TAB>line" row per record.
+    # Compressed shards are written as one gzip member per flush, so offset points
+    # at the member and line is the record's position inside it.
+
+    def __init__(self, directory: str, prefix: str = "part", shard_size: int = 100000,
+                 compress: bool = False, flush_every: int = 256, fsync: str = "close"):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync}")
+        self.directory = directory
+        self.prefix = f"{prefix}-{writer_token()}"
+        self.shard_size = shard_size
+        self.compress = compress
+        self.flush_every = flush_every
+        self.fsync = fsync
+
+        self.shard_number = 0
+        self.shard_records = 0
+        self.buffer: List[Tuple[str, bytes]] = []
+        self.data_file = None
+        self.index_file = None
+        os.makedirs(directory, exist_ok=True)
+
+    def shard_path(self, number: int) -> str:
+        ext = ".jsonl.gz" if self.compress else ".jsonl"
+        return os.path.join(self.directory, f"{self.prefix}-{number:05d}{ext}")
+
+    def write(self, record_id, record: Dict) -> str:
+        if self.shard_records >= self.shard_size:
+            self.flush()
+            self._close_files()
+            self.shard_number += 1
+            self.shard_records = 0
+
+        line = json.dumps(record, ensure_ascii=False).encode('utf-8') + b"\n"
+        self.buffer.append((str(record_id), line))
+        self.shard_records += 1
+        if len(self.buffer) >= self.flush_every:
+            self.flush()
+        return self.shard_path(self.shard_number)
+
+    def flush(self):
+        if not self.buffer:
+            return
+        if self.data_file is None:
+            path = self.shard_path(self.shard_number)
+            self.data_file = open(path, 'ab')
+            self.index_file = open(index_path(path), 'a', encoding='utf-8')
+
+        offset = self.data_file.tell()
+        rows = []
+        if self.compress:
+            self.data_file.write(gzip.compress(b"".join(line for _, line in self.buffer)))
+            for i, (record_id, _) in enumerate(self.buffer):
+                rows.append(f"{record_id}\t{offset}\t{i}\n")
+        else:
+            for record_id, line in self.buffer:
+                rows.append(f"{record_id}\t{offset}\t0\n")
+                offset += len(line)
+            self.data_file.write(b"".join(line for _, line in self.buffer))
+        self.index_file.write("".join(rows))
+        self.buffer = []
+
+        self.data_file.flush()
+        self.index_file.flush()
+        if self.fsync == 'flush':
+            self._sync()
+
+    def _sync(self):
+        os.fsync(self.data_file.fileno())
+        os.fsync(self.index_file.fileno())
+
+    def _close_files(self):
+        if self.data_file is None:
+            return
+        if self.fsync != 'never':
+            self._sync()
+        self.data_file.close()
+        self.index_file.close()
+        self.data_file = None
+        self.index_file = None
+
+    def close(self):
+        self.flush()
+        self._close_files()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def index_path(shard_path: str) -> str:
+    base = shard_path[:-len(".gz")] if shard_path.endswith(".gz") else shard_path
+    return base[:-len(".jsonl")] + ".idx"
+
+def read_member(f, offset: int) -> bytes:
+    # Decompresses the single gzip member starting at offset.
+    f.seek(offset)
+    decoder = zlib.decompressobj(wbits=31)
+    chunks = []
+    while not decoder.eof:
+        data = f.read(1 << 16)
+        if not data:
+            break
+        chunks.append(decoder.decompress(data))
+    return b"".join(chunks)
+
+class JsonlRecordReader:
+    # Reads every shard written into a directory by JsonlRecordWriter. When a
+    # record id was written more than once, the most recent writer wins, both for
+    # get()/len() and for iteration.
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.shards = sorted(
+            glob.glob(os.path.join(directory, "*.jsonl")) +
+            glob.glob(os.path.join(directory, "*.jsonl.gz"))
+        )
+        self.index: Dict[str, Tuple[str, int, int]] = {}
+        for shard in self.shards:
+            idx = index_path(shard)
+            if not os.path.exists(idx):
+                continue
+            with open(idx, 'r', encoding='utf-8') as f:
+                for row in f:
+                    record_id, offset, line = row.rstrip("\n").split("\t")
+                    self.index[record_id] = (shard, int(offset), int(line))
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, record_id) -> bool:
+        return str(record_id) in self.index
+
+    def ids(self) -> List[str]:
+        return list(self.index)
+
+    def get(self, record_id) -> Optional[Dict]:
+        entry = self.index.get(str(record_id))
+        if entry is None:
+            return None
+        shard, offset, line = entry
+        with open(shard, 'rb') as f:
+            if shard.endswith(".gz"):
+                data = read_member(f, offset).split(b"\n")[line]
+            else:
+                f.seek(offset)
+                data = f.readline()
+        return json.loads(data)
+
+    def __iter__(self) -> Iterator[Dict]:
+        # Walks each shard's index in write order and skips rows that a later
+        # write of the same id has superseded.
+        for shard in self.shards:
+            idx = index_path(shard)
+            if not os.path.exists(idx):
+                continue
+            compressed = shard.endswith(".gz")
+            with open(idx, 'r', encoding='utf-8') as rows, open(shard, 'rb') as f:
+                member_offset, member = None, []
+                for row in rows:
+                    record_id, offset, line = row.rstrip("\n").split("\t")
+                    offset, line = int(offset), int(line)
+                    if self.index.get(record_id) != (shard, offset, line):
+                        continue
+                    if compressed:
+                        if offset != member_offset:
+                            member_offset, member = offset, read_member(f, offset).split(b"\n")
+                        data = member[line]
+                    else:
+                        f.seek(offset)
+                        data = f.readline()
+                    yield json.loads(data)
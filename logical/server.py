@@ -0,0 +1,347 @@
+# Solve service: long-running asyncio HTTP server for /solve, /render and /validate
+
+import argparse
+import asyncio
+import json
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from question_automation import QuestionAnalyzer
+from ai_solver import MathSolver
+from bonus_validator import QuestionValidator
+from visual_generator import RenderPool, VisualExplanationGenerator
+
+MAX_BODY = 1 << 20
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+WARMUP_QUESTION = {
+    "raw_text": "A trader marks an article 40% above its cost price. He allows a 10% discount "
+                "on the marked price and still earns a profit of ₹36. Find the cost price of the article.",
+    "question_type": "profit_loss",
+    "topic": "Profit Loss",
+    "key_data": {},
+    "solution_steps": [],
+    "answer": ""
+}
+
+class Overloaded(Exception):
+    pass
+
+class BadRequest(Exception):
+    pass
+
+class MicroBatcher:
+    # Collects concurrent submissions into batches of up to max_batch items,
+    # waiting at most max_wait seconds after the first one, and runs fn(batch)
+    # in an executor. The queue is bounded: when it is full new items are shed
+    # straight away, and items that waited longer than timeout are dropped
+    # before they reach fn.
+
+    def __init__(self, name: str, fn: Callable[[List], List], executor, max_batch: int = 32,
+                 max_wait: float = 0.005, queue_size: int = 256, timeout: float = 10.0,
+                 concurrency: int = 1):
+        self.name = name
+        self.fn = fn
+        self.executor = executor
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.timeout = timeout
+        self.concurrency = concurrency
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self.tasks = []
+        self.stats = {"items": 0, "batches": 0, "largest_batch": 0, "shed": 0, "expired": 0, "errors": 0}
+
+    def start(self):
+        self.tasks = [asyncio.create_task(self.run()) for _ in range(self.concurrency)]
+
+    async def stop(self):
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+
+    async def submit(self, item):
+        if self.queue.full():
+            self.stats["shed"] += 1
+            raise Overloaded(f"{self.name} queue is full")
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.queue.put_nowait((item, future, loop.time() + self.timeout))
+        return await future
+
+    async def next_batch(self) -> List[Tuple]:
+        batch = [await self.queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch:
+            if not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self.next_batch()
+            now = loop.time()
+            live = []
+            for item, future, expires in batch:
+                if future.done():
+                    continue
+                if expires < now:
+                    self.stats["expired"] += 1
+                    future.set_exception(Overloaded(f"{self.name} request timed out in the queue"))
+                    continue
+                live.append((item, future))
+            if not live:
+                continue
+
+            self.stats["batches"] += 1
+            self.stats["items"] += len(live)
+            self.stats["largest_batch"] = max(self.stats["largest_batch"], len(live))
+            try:
+                results = await loop.run_in_executor(self.executor, self.fn, [item for item, _ in live])
+            except Exception as e:
+                self.stats["errors"] += 1
+                for _, future in live:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), result in zip(live, results):
+                if not future.done():
+                    future.set_result(result)
+
+    def snapshot(self) -> Dict:
+        stats = dict(self.stats)
+        stats["queued"] = self.queue.qsize()
+        stats["mean_batch"] = round(stats["items"] / stats["batches"], 2) if stats["batches"] else 0.0
+        return stats
+
+class SolveService:
+    # Keeps the analyzer, solver, validator and renderer warm for the life of
+    # the process. Solving and rendering go through micro-batchers; analysis
+    # and validation are cheap enough to run inline.
+
+    def __init__(self, max_batch: int = 32, max_wait_ms: float = 5.0, queue_size: int = 256,
+                 timeout: float = 10.0, render_workers: int = 1, max_inflight: int = 1024):
+        self.analyzer = QuestionAnalyzer()
+        self.solver = MathSolver()
+        self.validator = QuestionValidator()
+        self.generator = VisualExplanationGenerator()
+        self.batch_options = {"max_batch": max_batch, "max_wait": max_wait_ms / 1000.0,
+                              "queue_size": queue_size, "timeout": timeout}
+        self.render_workers = max(1, render_workers)
+        self.max_inflight = max_inflight
+        self.inflight = 0
+        self.started = time.time()
+        self.responses = {}
+
+        # Fork the render processes before the event loop and its threads exist.
+        self.render_pool = RenderPool(self.generator, self.render_workers) if self.render_workers > 1 else None
+        self.warm()
+
+    def warm(self):
+        self.solver.solve_batch([dict(WARMUP_QUESTION)])
+        self.generator.preload_fonts()
+        self.generator.static_layers()
+
+    def solve_batch(self, questions: List[Dict]) -> List[Dict]:
+        return self.solver.solve_batch(questions)
+
+    def render_batch(self, items: List[Tuple[Dict, int]]) -> List[bytes]:
+        if self.render_pool is not None:
+            return self.render_pool.render_png(items)
+        return [self.generator.render_png(q, n) for q, n in items]
+
+    async def start(self):
+        self.solve_executor = ThreadPoolExecutor(1, thread_name_prefix="solve")
+        self.render_executor = ThreadPoolExecutor(self.render_workers, thread_name_prefix="render")
+        self.solve_batcher = MicroBatcher("solve", self.solve_batch, self.solve_executor, **self.batch_options)
+        self.render_batcher = MicroBatcher("render", self.render_batch, self.render_executor,
+                                           concurrency=self.render_workers, **self.batch_options)
+        self.solve_batcher.start()
+        self.render_batcher.start()
+
+    async def stop(self):
+        await self.solve_batcher.stop()
+        await self.render_batcher.stop()
+        self.solve_executor.shutdown()
+        self.render_executor.shutdown()
+        if self.render_pool is not None:
+            self.render_pool.close()
+
+    def question_from_body(self, body: bytes) -> Dict:
+        # Accepts {"question": "...", "solution": "..."} (analyzed here) or an
+        # already analyzed question dict with "raw_text".
+        try:
+            data = json.loads(body or b"{}")
+        except ValueError:
+            raise BadRequest("Body is not valid JSON")
+        if not isinstance(data, dict):
+            raise BadRequest("Body must be a JSON object")
+        if isinstance(data.get("raw_text"), str):
+            q = dict(data)
+            q.setdefault("question_type", self.analyzer.detect_question_type(q["raw_text"]))
+            q.setdefault("topic", q["question_type"].replace('_', ' ').title())
+            q.setdefault("key_data", {})
+            q.setdefault("solution_steps", [])
+            q.setdefault("answer", "")
+            return q
+        if isinstance(data.get("question"), str) and data["question"].strip():
+            q = asdict(self.analyzer.analyze_question(data["question"].strip(), data.get("solution") or ""))
+            if "number" in data:
+                q["number"] = data["number"]
+            return q
+        raise BadRequest("Expected a \"question\" or \"raw_text\" field")
+
+    async def solve(self, q: Dict) -> Dict:
+        # Same rule as the pipeline: questions with a worked solution keep it.
+        if len(q.get('solution_steps') or []) < 2:
+            solution = await self.solve_batcher.submit(q)
+            q['solution_steps'] = solution['steps']
+            q['answer'] = solution.get('answer', q.get('answer', 'N/A'))
+            q['formula_used'] = solution.get('formula_used', [])
+        return q
+
+    async def dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, str, bytes]:
+        route = urlsplit(path).path
+        if route == "/health":
+            return 200, "application/json", json.dumps(self.snapshot()).encode()
+        if route not in ("/solve", "/render", "/validate"):
+            return 404, "application/json", b'{"error": "Not found"}'
+        if method != "POST":
+            return 405, "application/json", b'{"error": "Use POST"}'
+
+        q = self.question_from_body(body)
+        if route == "/validate":
+            q['validation'] = self.validator.validate_question(q)
+            return 200, "application/json", json.dumps(q, ensure_ascii=False).encode()
+
+        q = await self.solve(q)
+        if route == "/solve":
+            return 200, "application/json", json.dumps(q, ensure_ascii=False).encode()
+        png = await self.render_batcher.submit((q, int(q.get("number") or 1)))
+        return 200, "image/png", png
+
+    async def respond(self, method: str, path: str, body: bytes) -> Tuple[int, str, bytes]:
+        if self.inflight >= self.max_inflight:
+            return 503, "application/json", b'{"error": "Too many requests in flight"}'
+        self.inflight += 1
+        try:
+            return await self.dispatch(method, path, body)
+        except BadRequest as e:
+            return 400, "application/json", json.dumps({"error": str(e)}).encode()
+        except Overloaded as e:
+            return 503, "application/json", json.dumps({"error": str(e)}).encode()
+        except Exception as e:
+            return 500, "application/json", json.dumps({"error": f"{type(e).__name__}: {e}"}).encode()
+        finally:
+            self.inflight -= 1
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        # HTTP/1.1 with keep-alive; requests on one connection are answered in order.
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                parts = request_line.decode('latin-1').split()
+                if len(parts) != 3:
+                    await self.send(writer, 400, "application/json", b'{"error": "Malformed request"}', False)
+                    break
+                method, path, version = parts
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length") or 0)
+                if length > MAX_BODY:
+                    await self.send(writer, 413, "application/json", b'{"error": "Body too large"}', False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                status, content_type, payload = await self.respond(method.upper(), path, body)
+                self.responses[status] = self.responses.get(status, 0) + 1
+                await self.send(writer, status, content_type, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def send(self, writer: asyncio.StreamWriter, status: int, content_type: str,
+                   payload: bytes, keep_alive: bool):
+        head = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}",
+                f"Content-Type: {content_type}",
+                f"Content-Length: {len(payload)}",
+                f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        if status == 503:
+            head.append("Retry-After: 1")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode('latin-1') + payload)
+        await writer.drain()
+
+    def snapshot(self) -> Dict:
+        return {
+            "uptime": round(time.time() - self.started, 1),
+            "inflight": self.inflight,
+            "responses": {str(k): v for k, v in sorted(self.responses.items())},
+            "solve": self.solve_batcher.snapshot(),
+            "render": self.render_batcher.snapshot(),
+            "solver_cache": self.solver.cache.stats(),
+        }
+
+async def serve(service: SolveService, host: str = "127.0.0.1", port: int = 8080):
+    await service.start()
+    server = await asyncio.start_server(service.handle, host, port, backlog=1024)
+    print(f"Serving /solve, /render, /validate and /health on http://{host}:{port}", flush=True)
+
+    # Stop cleanly on SIGINT/SIGTERM so forked render workers are shut down too.
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopping.set)
+    try:
+        async with server:
+            await stopping.wait()
+    finally:
+        await service.stop()
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="HTTP service for the solver, renderer and validator")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--max-batch', type=int, default=32, help="Largest micro-batch")
+    parser.add_argument('--max-wait-ms', type=float, default=5.0,
+                        help="How long a batch waits for more requests after the first")
+    parser.add_argument('--queue-size', type=int, default=256,
+                        help="Queued requests per stage before new ones get 503")
+    parser.add_argument('--timeout', type=float, default=10.0,
+                        help="Seconds a request may wait in a queue before it is dropped")
+    parser.add_argument('--render-workers', type=int, default=1,
+                        help="Render processes (1 renders in a thread)")
+    parser.add_argument('--max-inflight', type=int, default=1024)
+    args = parser.parse_args(argv)
+
+    service = SolveService(args.max_batch, args.max_wait_ms, args.queue_size, args.timeout,
+                           args.render_workers, args.max_inflight)
+    asyncio.run(serve(service, args.host, args.port))
+
+if __name__ == "__main__":
+    main()
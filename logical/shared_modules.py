@@ -0,0 +1,33 @@
+# Shared modules: stdlib-only modules logical/ uses from the math_agent package source
+
+import importlib.util
+import os
+import sys
+from types import ModuleType
+
+# math_agent is the project that gets packaged, so it holds the one copy of
+# these modules; logical/ always runs from a checkout next to it.
+MATH_AGENT_TOOLS = os.path.normpath(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), os.pardir, "math_agent", "src", "math_agent", "tools"
+))
+
+SHARED_MODULES = ("profiling", "solver_cache")
+
+def shared_path(name: str) -> str:
+    return os.path.join(MATH_AGENT_TOOLS, name + ".py")
+
+def load_shared(name: str) -> ModuleType:
+    # Loaded straight from its file, so math_agent's package __init__ (and
+    # crewAI) is never imported.
+    qualified = f"shared_{name}"
+    module = sys.modules.get(qualified)
+    if module is not None:
+        return module
+    path = shared_path(name)
+    if not os.path.exists(path):
+        raise ImportError(f"Shared module {name} not found at {path}")
+    spec = importlib.util.spec_from_file_location(qualified, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[qualified] = module
+    spec.loader.exec_module(module)
+    return module
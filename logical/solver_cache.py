@@ -0,0 +1,11 @@
+# Solver memoization: bounded in-memory cache keyed by normalized solver parameters
+# (math_agent/src/math_agent/tools/solver_cache.py is the implementation)
+
+from shared_modules import load_shared
+
+_solver_cache = load_shared("solver_cache")
+
+EVICTION_POLICIES = _solver_cache.EVICTION_POLICIES
+SolverCache = _solver_cache.SolverCache
+normalize_text = _solver_cache.normalize_text
+solver_cache = _solver_cache.solver_cache
@@ -0,0 +1,176 @@
+# Stage runner: runs a chosen subset of pipeline stages, reading earlier outputs from disk
+
+import argparse
+import json
+import os
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from profiling import PROFILE_MODES, Profiler, parse_targets
+
+STAGES = ('analyze', 'solve', 'render', 'validate')
+
+# Stage whose output each stage consumes. render passes questions through
+# unchanged, so validate reads the solved questions whether or not it ran.
+STAGE_INPUT = {'analyze': None, 'solve': 'analyze', 'render': 'solve', 'validate': 'solve'}
+
+# Stages whose output later runs can pick up from <output_dir>/stages/<stage>.jsonl
+PERSISTED = ('analyze', 'solve')
+
+def stage_path(output_dir: str, stage: str) -> str:
+    return os.path.join(output_dir, "stages", f"{stage}.jsonl")
+
+def parse_stages(value: str) -> List[str]:
+    names = [s.strip() for s in value.split(',') if s.strip()]
+    if names == ['all']:
+        return list(STAGES)
+    unknown = [s for s in names if s not in STAGES]
+    if unknown:
+        raise ValueError(f"Unknown stage(s): {', '.join(unknown)} (choose from {', '.join(STAGES)})")
+    return [s for s in STAGES if s in names]
+
+def check_plan(stages: List[str], output_dir: str, dataset: Optional[str]) -> str:
+    # Returns the source the first stage reads from: the dataset file or a
+    # stage file on disk. Later stages must be fed by a stage in this run.
+    first = STAGE_INPUT[stages[0]]
+    for stage in stages[1:]:
+        needed = STAGE_INPUT[stage]
+        if needed not in stages and needed != first:
+            raise ValueError(f"'{stage}' needs the output of '{needed}'; add it to --stages or run '{stage}' on its own")
+    if first is None:
+        if not dataset:
+            raise ValueError("The analyze stage needs --input")
+        return dataset
+    path = stage_path(output_dir, first)
+    if not os.path.exists(path):
+        raise ValueError(f"No saved '{first}' output at {path}; run the '{first}' stage first")
+    return path
+
+def read_stage(path: str) -> Iterator[Tuple[int, Dict]]:
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                item = json.loads(line)
+                yield item["number"], item["question"]
+
+class StageWriter:
+    # Streams one stage's output to a temporary file that replaces the
+    # previous output only once the stage has finished.
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.f = open(path + ".tmp", 'w', encoding='utf-8')
+
+    def write(self, number: int, q: Dict):
+        self.f.write(json.dumps({"number": number, "question": q}, ensure_ascii=False) + "\n")
+
+    def close(self):
+        self.f.close()
+        os.replace(self.path + ".tmp", self.path)
+
+def run_stages(stages: List[str], output_dir: str = "outputs", dataset: Optional[str] = None,
+               output_format: str = "files", cache_path: Optional[str] = None,
+               progress_interval: Optional[float] = None, profiler=None,
+               pdf_workers: Optional[int] = None, dedup=None) -> Dict:
+    from main_pipeline import QuestionToVisualPipeline
+
+    source = check_plan(stages, output_dir, dataset)
+    pipeline = QuestionToVisualPipeline(output_dir, cache_path=cache_path, output_format=output_format,
+                                        progress_interval=progress_interval, profiler=profiler, dedup=dedup)
+    print(f"Stages: {', '.join(stages)}")
+
+    if STAGE_INPUT[stages[0]] is None:
+        from dataclasses import asdict
+        if source.lower().endswith('.pdf'):
+            from pdf_ingest import iter_pdf_questions
+            questions = iter_pdf_questions(source, pipeline.converter, pdf_workers)
+        else:
+            questions = pipeline.converter.iter_file(source)
+        items: Iterable[Tuple[int, Dict]] = pipeline.skip_duplicates(
+            (i, asdict(q)) for i, q in enumerate(pipeline.analyze_lazily(questions), 1)
+        )
+    else:
+        print(f"Reading {STAGE_INPUT[stages[0]]} output: {source}")
+        items = read_stage(source)
+
+    writers = {s: StageWriter(stage_path(output_dir, s)) for s in stages if s in PERSISTED}
+    report = pipeline.save_manager.report_builder() if 'validate' in stages else None
+    stats = {"questions": 0, "visuals": 0, "valid": 0, "invalid": 0}
+    start = time.perf_counter()
+    pipeline.progress_start(",".join(stages))
+
+    for i, q in items:
+        for stage in stages:
+            if stage == 'solve':
+                q = pipeline.solve_one(q)
+            elif stage == 'render':
+                if pipeline.render_one(q, i):
+                    stats["visuals"] += 1
+            elif stage == 'validate':
+                is_valid, _ = pipeline.save_one(q, i)
+                report.add(i, q['validation'])
+                stats["valid" if is_valid else "invalid"] += 1
+            if stage in writers:
+                writers[stage].write(i, q)
+        stats["questions"] += 1
+        pipeline.progress_update()
+
+    pipeline.progress_finish()
+    for writer in writers.values():
+        writer.close()
+        print(f"Saved {writer.path}")
+    if report is not None:
+        print(f"Report saved: {report.finish()}")
+    pipeline.finish()
+
+    print(f"\nProcessed {stats['questions']} questions in {time.perf_counter() - start:.2f}s")
+    if 'render' in stages:
+        print(f"Visuals Generated: {stats['visuals']}")
+    if 'validate' in stages:
+        print(f"Valid Questions: {stats['valid']}")
+        print(f"Invalid Questions: {stats['invalid']}")
+    return stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run selected stages of the question pipeline")
+    parser.add_argument('--stages', default='all',
+                        help=f"Comma-separated subset of {','.join(STAGES)} (default: all)")
+    parser.add_argument('--input', help="Q./Sol: dataset file or PDF (needed when analyze runs)")
+    parser.add_argument('--pdf-workers', type=int, help="Processes extracting PDF pages (default: CPU count)")
+    parser.add_argument('-o', '--output-dir', default='outputs')
+    parser.add_argument('--format', choices=('files', 'jsonl'), default='files',
+                        help="How validate saves questions")
+    parser.add_argument('--cache', help="Build cache database for solve/render/validate")
+    parser.add_argument('--dedup', type=float, nargs='?', const=0.8, metavar='THRESHOLD',
+                        help="Process one question per near-duplicate cluster (similarity >= THRESHOLD, "
+                             "default 0.8); needs the analyze stage")
+    parser.add_argument('--progress', type=float, metavar='SECONDS',
+                        help="Print progress, rate and ETA every SECONDS")
+    parser.add_argument('--profile', metavar='STAGES',
+                        help="Profile these stages (comma-separated or all); overrides PIPELINE_PROFILE")
+    parser.add_argument('--profile-mode', choices=PROFILE_MODES, default='cprofile')
+    parser.add_argument('--profile-memory', action='store_true', help="Also trace allocations")
+    args = parser.parse_args(argv)
+
+    try:
+        stages = parse_stages(args.stages)
+        if not stages:
+            parser.error("--stages is empty")
+        check_plan(stages, args.output_dir, args.input)
+        dedup = None
+        if args.dedup is not None:
+            if stages[0] != 'analyze':
+                raise ValueError("--dedup works on ingestion, so the analyze stage must run")
+            from dedup import NearDuplicateIndex
+            dedup = NearDuplicateIndex(args.dedup)
+        profiler = None
+        if args.profile:
+            profiler = Profiler(parse_targets(args.profile, STAGES), args.profile_mode, args.profile_memory,
+                                os.path.join(args.output_dir, "profile"))
+    except ValueError as e:
+        parser.error(str(e))
+    return run_stages(stages, args.output_dir, args.input, args.format, args.cache, args.progress, profiler,
+                      args.pdf_workers, dedup)
+
+if __name__ == "__main__":
+    main()
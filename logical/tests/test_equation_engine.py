@@ -0,0 +1,159 @@
+import unittest
+
+from equation_engine import EquationEngine
+
+# Run from logical/: python -m unittest discover -s tests
+# Each case is solved with the question's own type first, as MathSolver
+# does; None means the engine must decline so the fallback solver runs.
+
+
+class EngineTestCase(unittest.TestCase):
+
+    q_type = None
+
+    def setUp(self):
+        self.engine = EquationEngine()
+
+    def answer(self, text: str):
+        solution = self.engine.solve(self.q_type, text)
+        return solution["answer"] if solution else None
+
+    def assertAnswers(self, cases):
+        for text, expected in cases:
+            with self.subTest(text=text):
+                self.assertEqual(self.answer(text), expected)
+
+
+class TimeWorkTest(EngineTestCase):
+
+    q_type = "time_work"
+
+    def test_whole_job_equations(self):
+        self.assertAnswers([
+            ("A can complete a work in 12 days and B can complete it in 15 days. "
+             "In how many days will they complete the work together?", "6.67 days"),
+            ("A and B together can do a work in 12 days. A alone can do it in 20 days. "
+             "In how many days can B alone do it?", "30 days"),
+            ("A and B can do a job in 12 days, B and C in 15 days, C and A in 20 days. "
+             "In how many days can A alone finish the work?", "30 days"),
+            ("A, B and C can do a job in 10, 12 and 15 days respectively. "
+             "In how many days will they finish the work together?", "4 days"),
+        ])
+
+    def test_answers_for_the_worker_the_question_names(self):
+        self.assertAnswers([
+            ("A can do a work in 20 days and B in 30 days. In how many days can B do the work?", "30 days"),
+        ])
+
+    def test_partial_work(self):
+        self.assertAnswers([
+            ("A can do a work in 15 days. He works for 5 days and then B finishes the rest in 10 days. "
+             "In how many days can B alone do it?", "15 days"),
+        ])
+
+    def test_declines_unmodelled_wording(self):
+        self.assertAnswers([
+            ("A and B can do a work in 10 days. They work together for 4 days, then A leaves. "
+             "In how many days will B finish the remaining work alone?", None),
+            ("A and B can do a work in 12 days. They work together for 2 days. "
+             "In how many days will A finish the work?", None),
+            ("A can do a work in 12 days. B is 50% more efficient than A. "
+             "In how many days can B do the work?", None),
+        ])
+
+
+class SpeedDistanceTest(EngineTestCase):
+
+    q_type = "speed_distance"
+
+    def test_speed_distance_time(self):
+        self.assertAnswers([
+            ("A car covers 240 km in 4 hours. Find its speed.", "60 km/h"),
+            ("A train 150 m long running at 54 km/h crosses a pole. Find the time taken.", "10 seconds"),
+            ("A bus travels at 45 km/h for 3 hours. Find the distance covered.", "135 km"),
+        ])
+
+    def test_declines_two_speeds(self):
+        self.assertAnswers([
+            ("A man walks at 5 km/h and runs at 10 km/h. He covers 20 km. Find the time taken.", None),
+        ])
+
+
+class SimpleInterestTest(EngineTestCase):
+
+    q_type = "simple_interest"
+
+    def test_each_unknown(self):
+        self.assertAnswers([
+            ("Find the simple interest on ₹5000 at 8% per annum for 3 years.", "₹1200.00"),
+            ("A sum of ₹2000 amounts to ₹2600 in 5 years at simple interest. Find the rate of interest.", "6%"),
+            ("At what principal will the simple interest be ₹900 at 6% per annum for 5 years? "
+             "Find the principal.", "₹3000.00"),
+        ])
+
+    def test_find_the_sum(self):
+        self.assertAnswers([
+            ("Simple interest on a sum at 5% per annum for 4 years is ₹400. Find the sum.", "₹2000.00"),
+            ("The simple interest on a certain sum for 3 years at 10% per annum is ₹900. Find the sum.",
+             "₹3000.00"),
+        ])
+
+    def test_declines_unattributed_money(self):
+        self.assertAnswers([
+            ("A man pays ₹300 as fees and ₹200 as simple interest at 5% per annum for 2 years. "
+             "Find the principal.", None),
+        ])
+
+
+class CompoundInterestTest(EngineTestCase):
+
+    q_type = "compound_interest"
+
+    def test_interest_amount_and_sum(self):
+        self.assertAnswers([
+            ("Find the compound interest on ₹10000 at 10% per annum for 2 years, compounded annually.",
+             "₹2100.00"),
+            ("Find the amount on ₹8000 at 10% per annum compound interest for 1 year, "
+             "compounded half-yearly.", "₹8820.00"),
+            ("The compound interest on a sum for 2 years at 10% per annum is ₹420. Find the sum.", "₹2000.00"),
+        ])
+
+
+class RatioProportionTest(EngineTestCase):
+
+    q_type = "ratio_proportion"
+
+    def test_divide_and_scale(self):
+        self.assertAnswers([
+            ("Divide ₹1200 in the ratio 2:3.", "₹480, ₹720"),
+            ("The ratio of boys to girls in a class is 3:5. If boys are 45, find the number of girls.", "75"),
+        ])
+
+
+class ChainedTransactionTest(EngineTestCase):
+
+    q_type = "chained_transaction"
+
+    def test_final_price_paid_by_last_buyer(self):
+        self.assertAnswers([
+            ("A sells an item to B at 20 % profit.\nB sells it to C at 10 % loss.\nC pays ₹ 594.\n"
+             "Find A’s cost price.", "₹550.00"),
+            ("A sells a watch to B at 10% profit and B sells it to C at 20% profit. "
+             "C bought it for ₹132. Find A's cost price.", "₹100.00"),
+        ])
+
+    def test_first_sellers_cost(self):
+        self.assertAnswers([
+            ("A sells a watch to B at 10% profit and B sells it to C at 20% profit. "
+             "If A bought it for ₹100, find the price C paid.", "₹132.00"),
+        ])
+
+    def test_declines_a_middle_buyers_price(self):
+        self.assertAnswers([
+            ("A sells a watch to B at 10% profit and B sells it to C at 20% profit. "
+             "If B bought it for ₹110, find the price C paid.", None),
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
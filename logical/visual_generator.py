@@ -1,13 +1,54 @@
 # Task 4: Convert JSON input into formatted visual explanations
 
+import io
 import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
 from PIL import Image, ImageDraw, ImageFont
-from typing import Dict, List
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
 import textwrap
 
+FONT_FILES = {False: "arial.ttf", True: "arialbd.ttf"}
+SOLUTION_STRIP_COLOR = (236, 240, 241)
+
+_font_paths = {}
+_font_cache = {}
+_layer_cache = {}
+_worker_generator = None
+
+def resolve_font_path(bold: bool = False) -> Optional[str]:
+    # Probed once per process; None means fall back to the PIL default font.
+    if bold not in _font_paths:
+        try:
+            ImageFont.truetype(FONT_FILES[bold], 12)
+            _font_paths[bold] = FONT_FILES[bold]
+        except OSError:
+            _font_paths[bold] = None
+    return _font_paths[bold]
+
+@lru_cache(maxsize=8192)
+def wrap_lines(text: str, width: int) -> Tuple[str, ...]:
+    return tuple(textwrap.fill(text, width=width).split('\n'))
+
+def _init_render_worker(generator: "VisualExplanationGenerator"):
+    global _worker_generator
+    _worker_generator = generator
+    generator.preload_fonts()
+
+def _render_batch(batch: List[Tuple[Dict, int, str]]) -> List[Optional[str]]:
+    return [_worker_generator.render_to_file(q, n, path) for q, n, path in batch]
+
+def _render_png_batch(batch: List[Tuple[Dict, int]]) -> List[bytes]:
+    return [_worker_generator.render_png(q, n) for q, n in batch]
+
+def _warmup(_=None):
+    return os.getpid()
+
 class VisualExplanationGenerator:
     
-    def __init__(self, template_width=800, template_height=1000):
+    def __init__(self, template_width=800, template_height=1000, use_cache=True):
         self.width = template_width
         self.height = template_height
         self.bg_color = (255, 255, 255)
@@ -15,25 +56,80 @@ class VisualExplanationGenerator:
         self.secondary_color = (52, 73, 94)
         self.accent_color = (231, 76, 60)
         self.padding = 40
+        self.use_cache = use_cache
         
     def create_template(self) -> Image.Image:
         img = Image.new('RGB', (self.width, self.height), self.bg_color)
         return img
     
     def get_font(self, size=20, bold=False):
-        try:
-            if bold:
-                return ImageFont.truetype("arialbd.ttf", size)
-            return ImageFont.truetype("arial.ttf", size)
-        except:
-            return ImageFont.load_default()
-    
-    def draw_header(self, draw: ImageDraw, topic: str, q_number: int):
-        draw.rectangle(
-            [(self.padding, self.padding), (self.width - self.padding, self.padding + 60)],
-            fill=self.primary_color
+        if not self.use_cache:
+            try:
+                if bold:
+                    return ImageFont.truetype("arialbd.ttf", size)
+                return ImageFont.truetype("arial.ttf", size)
+            except:
+                return ImageFont.load_default()
+        
+        font = _font_cache.get((size, bold))
+        if font is None:
+            path = resolve_font_path(bold)
+            font = ImageFont.truetype(path, size) if path else ImageFont.load_default()
+            _font_cache[(size, bold)] = font
+        return font
+    
+    def wrap(self, text: str, width: int) -> Tuple[str, ...]:
+        if self.use_cache:
+            return wrap_lines(text, width)
+        return tuple(textwrap.fill(text, width=width).split('\n'))
+    
+    def static_layers(self) -> Dict[str, Image.Image]:
+        # Pre-rendered pieces that never change between questions: the base
+        # page (background, header bar, "Question:" label), the "Solution:"
+        # strip and the answer box. Keyed by every attribute they depend on
+        # so customised colours or sizes get their own layers.
+        key = (self.width, self.height, self.padding, self.bg_color,
+               self.primary_color, self.secondary_color, self.accent_color)
+        layers = _layer_cache.get(key)
+        if layers is not None:
+            return layers
+        
+        base = self.create_template()
+        draw = ImageDraw.Draw(base)
+        self.draw_header(draw, "", 0, draw_static=True, draw_text=False)
+        self.draw_question(draw, "", self.padding + 80, draw_static=True)
+        
+        inner_width = self.width - 2 * self.padding + 1
+        strip = Image.new('RGB', (inner_width, 41), SOLUTION_STRIP_COLOR)
+        ImageDraw.Draw(strip).text(
+            (10, 20),
+            "Solution:",
+            fill=self.primary_color,
+            font=self.get_font(22, bold=True),
+            anchor="lm"
         )
         
+        answer_box = Image.new('RGB', (inner_width, 61), self.accent_color)
+        
+        layers = {"base": base, "solution_strip": strip, "answer_box": answer_box}
+        _layer_cache[key] = layers
+        return layers
+    
+    def preload_fonts(self):
+        for size, bold in [(28, True), (20, True), (18, False), (22, True),
+                           (16, False), (14, True), (24, True)]:
+            self.get_font(size, bold)
+    
+    def draw_header(self, draw: ImageDraw, topic: str, q_number: int,
+                    draw_static=True, draw_text=True):
+        if draw_static:
+            draw.rectangle(
+                [(self.padding, self.padding), (self.width - self.padding, self.padding + 60)],
+                fill=self.primary_color
+            )
+        if not draw_text:
+            return
+        
         font_title = self.get_font(28, bold=True)
         draw.text(
             (self.width // 2, self.padding + 30),
@@ -43,18 +139,19 @@ class VisualExplanationGenerator:
             anchor="mm"
         )
     
-    def draw_question(self, draw: ImageDraw, question_text: str, y_start: int) -> int:
+    def draw_question(self, draw: ImageDraw, question_text: str, y_start: int,
+                      draw_static=True) -> int:
         font = self.get_font(18)
         
-        draw.text(
-            (self.padding, y_start),
-            "Question:",
-            fill=self.secondary_color,
-            font=self.get_font(20, bold=True)
-        )
+        if draw_static:
+            draw.text(
+                (self.padding, y_start),
+                "Question:",
+                fill=self.secondary_color,
+                font=self.get_font(20, bold=True)
+            )
         
-        wrapped = textwrap.fill(question_text, width=70)
-        lines = wrapped.split('\n')
+        lines = self.wrap(question_text, 70)
         
         y = y_start + 35
         for line in lines:
@@ -63,21 +160,24 @@ class VisualExplanationGenerator:
         
         return y + 20
     
-    def draw_solution_steps(self, draw: ImageDraw, steps: List[str], y_start: int) -> int:
-        draw.rectangle(
-            [(self.padding, y_start), (self.width - self.padding, y_start + 40)],
-            fill=(236, 240, 241)
-        )
-        draw.text(
-            (self.padding + 10, y_start + 20),
-            "Solution:",
-            fill=self.primary_color,
-            font=self.get_font(22, bold=True),
-            anchor="lm"
-        )
+    def draw_solution_steps(self, draw: ImageDraw, steps: List[str], y_start: int,
+                            draw_static=True) -> int:
+        if draw_static:
+            draw.rectangle(
+                [(self.padding, y_start), (self.width - self.padding, y_start + 40)],
+                fill=SOLUTION_STRIP_COLOR
+            )
+            draw.text(
+                (self.padding + 10, y_start + 20),
+                "Solution:",
+                fill=self.primary_color,
+                font=self.get_font(22, bold=True),
+                anchor="lm"
+            )
         
         y = y_start + 60
         font = self.get_font(16)
+        badge_font = self.get_font(14, bold=True)
         
         for i, step in enumerate(steps, 1):
             circle_x = self.padding + 15
@@ -90,14 +190,11 @@ class VisualExplanationGenerator:
                 (circle_x, circle_y),
                 str(i),
                 fill=(255, 255, 255),
-                font=self.get_font(14, bold=True),
+                font=badge_font,
                 anchor="mm"
             )
             
-            wrapped = textwrap.fill(step, width=65)
-            step_lines = wrapped.split('\n')
-            
-            for line in step_lines:
+            for line in self.wrap(step, 65):
                 draw.text((self.padding + 40, y), line, fill=self.secondary_color, font=font)
                 y += 24
             
@@ -105,14 +202,15 @@ class VisualExplanationGenerator:
         
         return y + 10
     
-    def draw_answer(self, draw: ImageDraw, answer: str, y_start: int):
+    def draw_answer(self, draw: ImageDraw, answer: str, y_start: int, draw_static=True):
         box_height = 60
-        draw.rectangle(
-            [(self.padding, y_start), (self.width - self.padding, y_start + box_height)],
-            fill=self.accent_color,
-            outline=self.accent_color,
-            width=3
-        )
+        if draw_static:
+            draw.rectangle(
+                [(self.padding, y_start), (self.width - self.padding, y_start + box_height)],
+                fill=self.accent_color,
+                outline=self.accent_color,
+                width=3
+            )
         
         draw.text(
             (self.width // 2, y_start + box_height // 2),
@@ -123,41 +221,136 @@ class VisualExplanationGenerator:
         )
     
     def generate_visual(self, question_data: Dict, q_number: int = 1) -> Image.Image:
-        img = self.create_template()
-        draw = ImageDraw.Draw(img)
-        
         topic = question_data.get('topic', 'General')
         question_text = question_data.get('raw_text', '')
         solution_steps = question_data.get('solution_steps', [])
         answer = question_data.get('answer', 'N/A')
         
+        if not self.use_cache:
+            img = self.create_template()
+            draw = ImageDraw.Draw(img)
+            
+            y_pos = self.padding + 80
+            self.draw_header(draw, topic, q_number)
+            
+            y_pos = self.draw_question(draw, question_text, y_pos)
+            y_pos = self.draw_solution_steps(draw, solution_steps, y_pos)
+            
+            answer_y = min(y_pos, self.height - 100)
+            self.draw_answer(draw, answer, answer_y)
+            
+            return img
+        
+        layers = self.static_layers()
+        img = layers["base"].copy()
+        draw = ImageDraw.Draw(img)
+        
         y_pos = self.padding + 80
-        self.draw_header(draw, topic, q_number)
+        self.draw_header(draw, topic, q_number, draw_static=False)
         
-        y_pos = self.draw_question(draw, question_text, y_pos)
-        y_pos = self.draw_solution_steps(draw, solution_steps, y_pos)
+        y_pos = self.draw_question(draw, question_text, y_pos, draw_static=False)
+        img.paste(layers["solution_strip"], (self.padding, y_pos))
+        y_pos = self.draw_solution_steps(draw, solution_steps, y_pos, draw_static=False)
         
         answer_y = min(y_pos, self.height - 100)
-        self.draw_answer(draw, answer, answer_y)
+        img.paste(layers["answer_box"], (self.padding, answer_y))
+        self.draw_answer(draw, answer, answer_y, draw_static=False)
         
         return img
     
-    def process_json_dataset(self, json_file: str, output_dir: str = "output_visuals"):
-        import os
+    def render_to_file(self, question_data: Dict, q_number: int, output_path: str) -> Optional[str]:
+        try:
+            img = self.generate_visual(question_data, q_number)
+            img.save(output_path)
+            return output_path
+        except Exception as e:
+            print(f"  Q{q_number}: Error - {str(e)}")
+            return None
+    
+    def render_png(self, question_data: Dict, q_number: int = 1) -> bytes:
+        buffer = io.BytesIO()
+        self.generate_visual(question_data, q_number).save(buffer, format="PNG")
+        return buffer.getvalue()
+    
+    def render_batch(self, items: Iterable[Tuple[Dict, int, str]], workers: Optional[int] = None,
+                     batch_size: int = 32) -> List[Optional[str]]:
+        with RenderPool(self, workers, batch_size) as pool:
+            return pool.render(items)
+    
+    def process_json_dataset(self, json_file: str, output_dir: str = "output_visuals", workers: int = 1):
         os.makedirs(output_dir, exist_ok=True)
         
         with open(json_file, 'r', encoding='utf-8') as f:
             data = json.load(f)
         
         questions = data.get('questions', [])
+        items = [
+            (q_data, i, os.path.join(output_dir, f"question_{i}.png"))
+            for i, q_data in enumerate(questions, 1)
+        ]
         
-        for i, q_data in enumerate(questions, 1):
-            img = self.generate_visual(q_data, i)
-            output_path = os.path.join(output_dir, f"question_{i}.png")
-            img.save(output_path)
-            print(f"Generated: {output_path}")
+        if workers > 1:
+            paths = self.render_batch(items, workers)
+        else:
+            paths = [self.render_to_file(*item) for item in items]
+        
+        for path in paths:
+            if path:
+                print(f"Generated: {path}")
+        
+        print(f"\nTotal visuals generated: {len([p for p in paths if p])}")
+
+class RenderPool:
+    # Pre-forked pool of render workers. Each worker receives a copy of the
+    # generator (template size, colours) with fonts already loaded, renders
+    # and PNG-encodes straight to disk, and only returns the output path, so
+    # no Image objects cross the process boundary.
+    
+    def __init__(self, generator: VisualExplanationGenerator, workers: Optional[int] = None,
+                 batch_size: int = 32):
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
         
-        print(f"\nTotal visuals generated: {len(questions)}")
+        context = None
+        if 'fork' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('fork')
+        
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_init_render_worker,
+            initargs=(generator,)
+        )
+        list(self.executor.map(_warmup, range(self.workers)))
+    
+    def render(self, items: Iterable[Tuple[Dict, int, str]]) -> List[Optional[str]]:
+        futures = []
+        batch = []
+        for item in items:
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                futures.append(self.executor.submit(_render_batch, batch))
+                batch = []
+        if batch:
+            futures.append(self.executor.submit(_render_batch, batch))
+        
+        paths = []
+        for future in futures:
+            paths.extend(future.result())
+        return paths
+    
+    def render_png(self, items: List[Tuple[Dict, int]]) -> List[bytes]:
+        # One batch rendered in a single worker, returned as PNG bytes.
+        return self.executor.submit(_render_png_batch, list(items)).result()
+    
+    def close(self):
+        self.executor.shutdown()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
 
 if __name__ == "__main__":
     generator = VisualExplanationGenerator()
@@ -0,0 +1,87 @@
+import argparse
+import subprocess
+import sys
+import time
+from .main import SAMPLE_QUESTION
+
+# Startup benchmark: python -m math_agent.benchmark
+
+IMPORT_SNIPPET = """
+import sys, time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start, 'crewai' in sys.modules)
+"""
+
+
+def import_time(module: str, repeat: int = 3):
+    # Fresh interpreter per run so nothing is already in sys.modules.
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", IMPORT_SNIPPET.format(module=module)],
+                             capture_output=True, text=True)
+        if out.returncode != 0:
+            return None, False
+        seconds, loaded = out.stdout.split()
+        runs.append(float(seconds))
+    return min(runs), loaded == "True"
+
+
+def per_call(fn, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - start) / n
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="math_agent.benchmark", description="math_agent startup benchmark")
+    parser.add_argument("-n", type=int, default=20, help="Repetitions for the per-question timings")
+    args = parser.parse_args(argv)
+
+    print("Import time (fresh interpreter, best of 3)")
+    for module in ("math_agent.main", "crewai"):
+        seconds, loaded = import_time(module)
+        if seconds is None:
+            print(f"  {module:<18} not importable")
+        else:
+            print(f"  {module:<18} {seconds * 1000:8.1f} ms   crewai loaded: {loaded}")
+
+    from .crew import CrewPool, MathCrew, build_crew, load_config
+
+    print("\nFast path (no crewAI)")
+    crew = MathCrew(fast_path=True)
+    start = time.perf_counter()
+    crew.solve_fast(SAMPLE_QUESTION)
+    print(f"  first question     {(time.perf_counter() - start) * 1000:8.2f} ms")
+    print(f"  per question       {per_call(lambda: crew.solve_fast(SAMPLE_QUESTION), args.n) * 1000:8.2f} ms")
+
+    try:
+        import crewai  # noqa: F401
+    except ImportError:
+        print("\ncrewAI is not installed; skipping crew construction timings")
+        return
+
+    print("\nCrew construction")
+    load_config.cache_clear()
+    start = time.perf_counter()
+    build_crew()
+    print(f"  cold build         {(time.perf_counter() - start) * 1000:8.2f} ms")
+    print(f"  build (cached cfg) {per_call(build_crew, args.n) * 1000:8.2f} ms")
+
+    def reparse():
+        load_config.cache_clear()
+        build_crew()
+    print(f"  build (re-parse)   {per_call(reparse, args.n) * 1000:8.2f} ms")
+
+    pool = CrewPool(1)
+    pool.warm()
+
+    def acquire():
+        with pool.crew():
+            pass
+    print(f"  pooled acquire     {per_call(acquire, args.n * 100) * 1000:8.4f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,60 +1,198 @@
-from crewai import Crew, Process
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-import yaml
-from crewai import Agent, Task
-from .tools.question_to_json_tool import question_auto_extractor_tool,json_structuring_tool,generic_math_solver_tool,visual_formatter_tool
+from typing import Iterable, Iterator, Optional
+import json
+import queue
+import threading
+from .tools.question_to_json_tool import extract_question_features,structure_question_json,format_solution,solve_deterministic
 
-class MathCrew:
-    def __init__(self):
-        base = Path(__file__).parent
+# crewAI is only imported when an agent crew is actually built, so the CLI,
+# --help and fast-path-only runs start without it.
+
+CONFIG_DIR = Path(__file__).parent / "config"
+
+@lru_cache(maxsize=None)
+def load_config(name: str) -> dict:
+    import yaml
+    with open(CONFIG_DIR / f"{name}.yaml") as f:
+        return yaml.safe_load(f)
 
-        with open(base / "config" / "agents.yaml") as f:
-            agents_config = yaml.safe_load(f)
+def build_crew():
+    from crewai import Agent, Crew, Process, Task
+    from .tools import question_to_json_tool
+    from .tools.llm_client import scheduled_llm
 
-        with open(base / "config" / "tasks.yaml") as f:
-            tasks_config = yaml.safe_load(f)
+    agents_config = load_config("agents")
+    tasks_config = load_config("tasks")
+    tools = {name: getattr(question_to_json_tool, name) for name in question_to_json_tool.TOOL_FUNCTIONS}
 
-        
+    agents = {}
+    for name, cfg in agents_config.items():
+        agent_tools = [tools[t] for t in cfg.get("tools", [])]
 
-        agents = {}
-        for name, cfg in agents_config.items():
-            tools = {
-                "question_auto_extractor_tool": question_auto_extractor_tool,
-                "json_structuring_tool": json_structuring_tool,
-                "generic_math_solver_tool": generic_math_solver_tool,
-                "visual_formatter_tool": visual_formatter_tool,
+        agents[name] = Agent(
+            **{
+                "role": cfg["role"],
+                "goal": cfg["goal"],
+                "backstory": cfg["backstory"],
+                "verbose": cfg["verbose"],
+                "memory": cfg["memory"],
+                "allow_delegation": cfg["allow_delegation"],
+                "llm": scheduled_llm(cfg["llm"]),
+                "tools": agent_tools
             }
-            agent_tools = [tools[t] for t in cfg.get("tools", [])]
-
-            agents[name] = Agent(
-                **{
-                    "role": cfg["role"],
-                    "goal": cfg["goal"],
-                    "backstory": cfg["backstory"],
-                    "verbose": cfg["verbose"],
-                    "memory": cfg["memory"],
-                    "allow_delegation": cfg["allow_delegation"],
-                    "llm": cfg["llm"],
-                    "tools": agent_tools
-                }
-            )
+        )
 
-        tasks = []
-        for task_name, cfg in tasks_config.items():
-            tasks.append(
-                Task(
-                    description=cfg["description"],
-                    expected_output=cfg["expected_output"],
-                    agent=agents[cfg["agent"]],
-                    tools=[],
-                )
+    tasks = []
+    for task_name, cfg in tasks_config.items():
+        tasks.append(
+            Task(
+                description=cfg["description"],
+                expected_output=cfg["expected_output"],
+                agent=agents[cfg["agent"]],
+                tools=[],
             )
-
-        self.crew = Crew(
-            agents=list(agents.values()),
-            tasks=tasks,
-            process=Process.sequential,
         )
 
+    return Crew(
+        agents=list(agents.values()),
+        tasks=tasks,
+        process=Process.sequential,
+    )
+
+class CrewPool:
+    # Pre-built crews handed out one caller at a time. A crew re-interpolates
+    # its task templates on every kickoff, so it can be reused for the next
+    # question once the previous run has finished.
+
+    def __init__(self, size: int = 4):
+        self.size = size
+        self.created = 0
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+
+    def warm(self, count: Optional[int] = None):
+        for _ in range(min(count or self.size, self.size)):
+            with self._lock:
+                if self.created >= self.size:
+                    return
+                self.created += 1
+            self._idle.put(self._build())
+
+    def _build(self):
+        # Builds a crew for a slot already counted in created. If that fails
+        # the slot is given back and a None is queued to wake one waiting
+        # caller, which then tries to build it itself.
+        try:
+            return build_crew()
+        except BaseException:
+            with self._lock:
+                self.created -= 1
+            self._idle.put(None)
+            raise
+
+    def _acquire(self):
+        while True:
+            try:
+                crew = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    build = self.created < self.size
+                    if build:
+                        self.created += 1
+                crew = self._build() if build else self._idle.get()
+            if crew is not None:
+                return crew
+
+    @contextmanager
+    def crew(self):
+        crew = self._acquire()
+        try:
+            yield crew
+        finally:
+            self._idle.put(crew)
+
+class MathCrew:
+    def __init__(self, fast_path: bool = False, pool_size: int = 4):
+        # fast_path runs the four tools in-process and only falls back to the
+        # agent crew when the deterministic solver cannot reach an answer.
+        self.fast_path = fast_path
+        self.stats = {"fast_path": 0, "escalated": 0}
+        self._stats_lock = threading.Lock()
+        self.pool = CrewPool(pool_size)
+        self._crew = None
+
+    @property
+    def crew(self):
+        # A dedicated crew for train/replay/test; solving goes through the pool.
+        if self._crew is None:
+            self._crew = build_crew()
+        return self._crew
+
     def kickoff(self, question: str):
-        return self.crew.kickoff({"question": question})
+        if self.fast_path:
+            return self._solve(question)
+        with self.pool.crew() as crew:
+            return crew.kickoff({"question": question})
+
+    def solve_fast(self, question: str) -> Optional[str]:
+        # Same tool chain the agents run, called directly. Returns the
+        # formatted solution, or None if the deterministic solver gave up.
+        try:
+            extracted = extract_question_features(question)
+            structured = json.loads(structure_question_json(extracted))
+        except (ValueError, KeyError):
+            return None
+        solved, _ = solve_deterministic(structured)
+        if not solved:
+            return None
+        return format_solution(json.dumps(structured, indent=2))
+
+    def _solve(self, question: str):
+        result = self.solve_fast(question)
+        with self._stats_lock:
+            self.stats["fast_path" if result is not None else "escalated"] += 1
+        if result is not None:
+            return result
+        with self.pool.crew() as crew:
+            return crew.kickoff({"question": question})
+
+    def kickoff_many(self, questions: Iterable[str], max_concurrency: int = 4,
+                     return_exceptions: bool = False) -> Iterator:
+        # Solves questions concurrently (LLM calls are I/O bound, so threads
+        # suffice) and yields results in input order. At most
+        # max_concurrency * 2 questions are in flight, so large inputs are
+        # read lazily. With return_exceptions=True a failed question yields
+        # its exception instead of stopping the batch.
+        if max_concurrency <= 1:
+            for question in questions:
+                try:
+                    yield self.kickoff(question)
+                except Exception as e:
+                    if not return_exceptions:
+                        raise
+                    yield e
+            return
+
+        self.pool.size = max(self.pool.size, max_concurrency)
+        window = max_concurrency * 2
+        with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+            pending = deque()
+            for question in questions:
+                pending.append(pool.submit(self.kickoff, question))
+                if len(pending) >= window:
+                    yield self._result(pending.popleft(), return_exceptions)
+            while pending:
+                yield self._result(pending.popleft(), return_exceptions)
+
+    @staticmethod
+    def _result(future, return_exceptions: bool):
+        try:
+            return future.result()
+        except Exception as e:
+            if not return_exceptions:
+                raise
+            return e
@@ -1,16 +1,121 @@
+import argparse
+import json
+import sys
+from collections import deque
 from .crew import MathCrew
+from .tools import profiling
+from .tools.solver_cache import solver_cache
 
-def run():
-    print("\n=== Math Solver ===\n")
-    question = '''A shopkeeper sells a book at a profit of 10%. Later, he reduces the cost price by 4%
+SAMPLE_QUESTION = '''A shopkeeper sells a book at a profit of 10%. Later, he reduces the cost price by 4%
                   and increases the selling price by ₹6. As a result, his profit percentage becomes
                   18.75% (or 3/16). Find the original cost price of the book.'''
 
+def run():
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        return batch(sys.argv[2:])
+
+    print("\n=== Math Solver ===\n")
+    question = SAMPLE_QUESTION
+
     crew = MathCrew()
     result = crew.kickoff(question)
 
     print("\n\n=== FINAL OUTPUT ===\n")
     print(result)
 
+def read_questions(path: str):
+    # One question per line: {"id": ..., "question": "..."} or a JSON string.
+    with open(path, "r", encoding="utf-8") as f:
+        for n, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            item = json.loads(line)
+            if isinstance(item, str):
+                item = {"question": item}
+            item.setdefault("id", n)
+            yield item
+
+def batch(argv=None):
+    parser = argparse.ArgumentParser(prog="math_agent batch", description="Solve questions from a JSONL file")
+    parser.add_argument("input", help="JSONL file with one question per line")
+    parser.add_argument("-o", "--output", default="results.jsonl", help="JSONL file for the results")
+    parser.add_argument("-c", "--concurrency", type=int, default=4, help="Questions solved at the same time")
+    parser.add_argument("--fast-path", action="store_true",
+                        help="Solve with the tools directly and use the agents only when that fails")
+    parser.add_argument("--profile", metavar="TOOLS",
+                        help="Profile these tools (comma-separated or all); overrides MATH_AGENT_PROFILE")
+    parser.add_argument("--profile-mode", choices=profiling.PROFILE_MODES, default="cprofile")
+    parser.add_argument("--profile-memory", action="store_true", help="Also trace allocations")
+    parser.add_argument("--profile-dir", default="profile")
+    args = parser.parse_args(argv)
+
+    profiler = None
+    if args.profile:
+        from .tools.question_to_json_tool import TOOL_FUNCTIONS
+        try:
+            targets = profiling.parse_targets(args.profile, TOOL_FUNCTIONS)
+            profiler = profiling.Profiler(targets, args.profile_mode, args.profile_memory, args.profile_dir)
+        except ValueError as e:
+            parser.error(str(e))
+        previous = profiling.install(profiler)
+
+    crew = MathCrew(fast_path=args.fast_path)
+    items = deque()
+
+    def questions():
+        # Keeps only the ids/questions still waiting for their result.
+        for item in read_questions(args.input):
+            items.append(item)
+            yield item["question"]
+
+    solved = failed = 0
+    with open(args.output, "w", encoding="utf-8") as out:
+        for result in crew.kickoff_many(questions(), args.concurrency, return_exceptions=True):
+            item = items.popleft()
+            record = {"id": item["id"], "question": item["question"]}
+            if isinstance(result, Exception):
+                record["error"] = f"{type(result).__name__}: {result}"
+                failed += 1
+            else:
+                record["result"] = str(result)
+                solved += 1
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            print(f"  {item['id']}: {'failed' if 'error' in record else 'solved'}")
+
+    print(f"\nSolved {solved}, failed {failed}. Results saved: {args.output}")
+    if args.fast_path:
+        print(f"Fast path: {crew.stats['fast_path']}, escalated to agents: {crew.stats['escalated']}")
+    cache = solver_cache.stats()
+    if cache["hits"] or cache["misses"]:
+        print(f"Solver cache: {cache['hits']} hits, {cache['misses']} misses "
+              f"(hit rate {cache['hit_rate']:.1%}), {cache['evictions']} evictions")
+    if profiler is not None:
+        profiling.install(previous)
+        print(f"Profile saved: {profiler.run_dir} ({len(profiler.write())} files)")
+
+def train():
+    try:
+        MathCrew().crew.train(
+            n_iterations=int(sys.argv[1]), filename=sys.argv[2], inputs={"question": SAMPLE_QUESTION}
+        )
+    except Exception as e:
+        raise Exception(f"An error occurred while training the crew: {e}")
+
+def replay():
+    try:
+        MathCrew().crew.replay(task_id=sys.argv[1])
+    except Exception as e:
+        raise Exception(f"An error occurred while replaying the crew: {e}")
+
+def test():
+    try:
+        MathCrew().crew.test(
+            n_iterations=int(sys.argv[1]), eval_llm=sys.argv[2], inputs={"question": SAMPLE_QUESTION}
+        )
+    except Exception as e:
+        raise Exception(f"An error occurred while testing the crew: {e}")
+
 if __name__ == "__main__":
     run()
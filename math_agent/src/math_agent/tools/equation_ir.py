@@ -0,0 +1,193 @@
+import ast
+import operator
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+
+# Typed equation IR shared by json_structuring_tool (producer) and
+# generic_math_solver_tool (consumer). Expressions are plain arithmetic
+# strings compiled once through a whitelisting AST walker, never eval().
+
+BINARY_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Pow: operator.pow,
+}
+UNARY_OPS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+
+def _compile_node(node) -> Callable[[Dict[str, float]], float]:
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+        value = float(node.value)
+        return lambda env: value
+    if isinstance(node, ast.Name):
+        name = node.id
+        return lambda env: env[name]
+    if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPS:
+        op = BINARY_OPS[type(node.op)]
+        left, right = _compile_node(node.left), _compile_node(node.right)
+        return lambda env: op(left(env), right(env))
+    if isinstance(node, ast.UnaryOp) and type(node.op) in UNARY_OPS:
+        op = UNARY_OPS[type(node.op)]
+        operand = _compile_node(node.operand)
+        return lambda env: op(operand(env))
+    raise ValueError(f"Unsupported expression element: {ast.dump(node)}")
+
+
+@lru_cache(maxsize=1024)
+def parse_expression(source: str) -> ast.AST:
+    return ast.parse(source.strip(), mode="eval").body
+
+
+@lru_cache(maxsize=1024)
+def compile_expression(source: str) -> Callable[[Dict[str, float]], float]:
+    # Only numbers, names, + - * / ** and unary +/- are accepted.
+    return _compile_node(parse_expression(source))
+
+
+def evaluate(source: str, env: Optional[Dict[str, float]] = None) -> float:
+    return compile_expression(source)(env or {})
+
+
+class Linear:
+    # coefficients . variables + constant
+
+    __slots__ = ("coefficients", "constant")
+
+    def __init__(self, coefficients: Optional[Dict[str, float]] = None, constant: float = 0.0):
+        self.coefficients = coefficients or {}
+        self.constant = constant
+
+    def is_constant(self) -> bool:
+        return not any(self.coefficients.values())
+
+    def scale(self, k: float) -> "Linear":
+        return Linear({v: c * k for v, c in self.coefficients.items()}, self.constant * k)
+
+    def add(self, other: "Linear", sign: float = 1.0) -> "Linear":
+        coefficients = dict(self.coefficients)
+        for v, c in other.coefficients.items():
+            coefficients[v] = coefficients.get(v, 0.0) + sign * c
+        return Linear(coefficients, self.constant + sign * other.constant)
+
+
+def linearize(node, env: Dict[str, Linear]) -> Linear:
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+        return Linear(constant=float(node.value))
+    if isinstance(node, ast.Name):
+        return env.get(node.id) or Linear({node.id: 1.0})
+    if isinstance(node, ast.UnaryOp) and type(node.op) in UNARY_OPS:
+        operand = linearize(node.operand, env)
+        return operand.scale(-1.0) if isinstance(node.op, ast.USub) else operand
+    if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPS:
+        left, right = linearize(node.left, env), linearize(node.right, env)
+        if isinstance(node.op, ast.Add):
+            return left.add(right)
+        if isinstance(node.op, ast.Sub):
+            return left.add(right, -1.0)
+        if isinstance(node.op, ast.Mult):
+            if right.is_constant():
+                return left.scale(right.constant)
+            if left.is_constant():
+                return right.scale(left.constant)
+        if isinstance(node.op, ast.Div) and right.is_constant() and right.constant != 0:
+            return left.scale(1.0 / right.constant)
+        if isinstance(node.op, ast.Pow) and left.is_constant() and right.is_constant():
+            return Linear(constant=left.constant ** right.constant)
+    raise ValueError("Equation is not linear in the unknowns")
+
+
+@dataclass(frozen=True)
+class Definition:
+    name: str
+    expr: str
+
+
+@dataclass(frozen=True)
+class Equation:
+    lhs: str
+    rhs: str
+
+    def __str__(self) -> str:
+        return f"{self.lhs} = {self.rhs}"
+
+    def row(self, env: Dict[str, Linear]) -> Linear:
+        # lhs - rhs = 0. A side of the form num / den with an unknown
+        # denominator is cross-multiplied: num = other * den.
+        lhs, rhs = parse_expression(self.lhs), parse_expression(self.rhs)
+        for a, b in ((lhs, rhs), (rhs, lhs)):
+            if isinstance(a, ast.BinOp) and isinstance(a.op, ast.Div):
+                den = linearize(a.right, env)
+                other = linearize(b, env)
+                if not den.is_constant() and other.is_constant():
+                    return linearize(a.left, env).add(den.scale(other.constant), -1.0)
+        return linearize(lhs, env).add(linearize(rhs, env), -1.0)
+
+
+@dataclass
+class EquationSystem:
+    unknowns: List[str]
+    definitions: List[Definition] = field(default_factory=list)
+    equations: List[Equation] = field(default_factory=list)
+    target: str = "CP"
+
+    def to_dict(self) -> Dict:
+        return {
+            "unknowns": list(self.unknowns),
+            "definitions": [{"name": d.name, "expr": d.expr} for d in self.definitions],
+            "equations": [{"lhs": e.lhs, "rhs": e.rhs} for e in self.equations],
+            "target": self.target,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "EquationSystem":
+        return cls(
+            unknowns=list(data["unknowns"]),
+            definitions=[Definition(d["name"], d["expr"]) for d in data.get("definitions", [])],
+            equations=[Equation(e["lhs"], e["rhs"]) for e in data.get("equations", [])],
+            target=data.get("target", "CP"),
+        )
+
+    def solve(self) -> Dict[str, float]:
+        # Substitutes the definitions in order, then solves the linear
+        # equations for the unknowns by Gauss-Jordan elimination.
+        env: Dict[str, Linear] = {}
+        for d in self.definitions:
+            env[d.name] = linearize(parse_expression(d.expr), env)
+
+        rows = [eq.row(env) for eq in self.equations]
+        for row in rows:
+            unknown = [v for v, c in row.coefficients.items() if c and v not in self.unknowns]
+            if unknown:
+                raise ValueError(f"Undefined quantity: {', '.join(unknown)}")
+        n = len(self.unknowns)
+        matrix = [[row.coefficients.get(u, 0.0) for u in self.unknowns] + [-row.constant] for row in rows]
+
+        pivot_row = 0
+        for col in range(n):
+            best = max(range(pivot_row, len(matrix)), key=lambda r: abs(matrix[r][col]), default=None)
+            if best is None or abs(matrix[best][col]) < 1e-12:
+                raise ValueError(f"Not enough information to solve for {self.unknowns[col]}")
+            matrix[pivot_row], matrix[best] = matrix[best], matrix[pivot_row]
+            pivot = matrix[pivot_row][col]
+            matrix[pivot_row] = [x / pivot for x in matrix[pivot_row]]
+            for r in range(len(matrix)):
+                if r != pivot_row and matrix[r][col]:
+                    factor = matrix[r][col]
+                    matrix[r] = [x - factor * y for x, y in zip(matrix[r], matrix[pivot_row])]
+            pivot_row += 1
+
+        for r in range(n, len(matrix)):
+            if abs(matrix[r][n]) > 1e-9:
+                raise ValueError("Equations are inconsistent")
+
+        solution = {u: matrix[i][n] for i, u in enumerate(self.unknowns)}
+        values = dict(solution)
+        for d in self.definitions:
+            values[d.name] = evaluate(d.expr, values)
+        return values
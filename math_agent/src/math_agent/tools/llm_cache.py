@@ -0,0 +1,162 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Optional
+from .solver_cache import normalize_text
+from .llm_client import chat_completion
+
+# Persistent cache for LLM completions, keyed by model + normalized prompt.
+#   MATH_AGENT_LLM_CACHE        database path ("" disables the cache)
+#   MATH_AGENT_LLM_CACHE_TTL    seconds before an entry expires
+#   MATH_AGENT_LLM_CACHE_SIZE   maximum entries, least recently used evicted first
+#   MATH_AGENT_LLM_RECORD=1     also store the raw API response for offline replay
+#   MATH_AGENT_LLM_REPLAY=1     never call the API; serve cached/recorded responses only
+
+DEFAULT_CACHE_PATH = os.path.join(".math_agent_cache", "llm_cache.db")
+
+
+def prompt_key(model: str, prompt: str) -> str:
+    return hashlib.sha256(f"{model}\0{normalize_text(prompt)}".encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: float = 7 * 24 * 3600,
+                 max_entries: int = 10000, record: bool = False, replay: bool = False):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.record = record
+        self.replay = replay
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self.stores = 0
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, model TEXT NOT NULL, content TEXT NOT NULL, "
+            "raw TEXT, created REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+        self.conn.commit()
+        self.size = self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    @classmethod
+    def from_env(cls) -> Optional["LLMResponseCache"]:
+        path = os.environ.get("MATH_AGENT_LLM_CACHE", DEFAULT_CACHE_PATH)
+        if not path:
+            return None
+        return cls(
+            path,
+            ttl=float(os.environ.get("MATH_AGENT_LLM_CACHE_TTL", 7 * 24 * 3600)),
+            max_entries=int(os.environ.get("MATH_AGENT_LLM_CACHE_SIZE", 10000)),
+            record=os.environ.get("MATH_AGENT_LLM_RECORD") == "1",
+            replay=os.environ.get("MATH_AGENT_LLM_REPLAY") == "1",
+        )
+
+    def get(self, model: str, prompt: str) -> Optional[str]:
+        key = prompt_key(model, prompt)
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT content, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and not self.replay and now - row[1] > self.ttl:
+                self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.conn.commit()
+                self.size -= 1
+                self.expired += 1
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self.conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self.conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, model: str, prompt: str, content: str, raw: Optional[str] = None):
+        key = prompt_key(model, prompt)
+        now = time.time()
+        with self._lock:
+            existed = self.conn.execute(
+                "SELECT 1 FROM responses WHERE key = ?", (key,)
+            ).fetchone() is not None
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, content, raw, created, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, content, raw if self.record else None, now, now)
+            )
+            self.stores += 1
+            if not existed:
+                self.size += 1
+            overflow = self.size - self.max_entries
+            if overflow > 0:
+                self.conn.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY last_used ASC LIMIT ?)", (overflow,)
+                )
+                self.size -= overflow
+                self.evictions += overflow
+            self.conn.commit()
+
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "stores": self.stores,
+            "size": self.size,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+    def close(self):
+        self.conn.close()
+
+
+_llm_cache = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    # Created on first use so importing the tools never touches the disk.
+    global _llm_cache
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            _llm_cache = LLMResponseCache.from_env() or False
+    return _llm_cache or None
+
+
+def cached_chat_completion(prompt: str, model: str = "gpt-4", client=None,
+                           accept: Optional[Callable[[str], bool]] = None) -> str:
+    # Returns the completion text for a single user message, from the cache
+    # when possible. Only responses passing accept() are stored. client can be
+    # any object with the OpenAI chat.completions.create interface (e.g. a
+    # local stub); it defaults to the shared pooled client. Calls go through
+    # the process-wide rate-limit scheduler either way.
+    cache = get_llm_cache()
+    if cache is not None:
+        content = cache.get(model, prompt)
+        if content is not None:
+            return content
+        if cache.replay:
+            raise LookupError("No recorded LLM response for this prompt (MATH_AGENT_LLM_REPLAY=1)")
+
+    resp = chat_completion([{"role": "user", "content": prompt}], model=model, client=client)
+    content = resp.choices[0].message.content
+
+    if cache is not None and (accept is None or accept(content)):
+        raw = resp.model_dump_json() if cache.record and hasattr(resp, "model_dump_json") else None
+        cache.put(model, prompt, content, raw)
+    return content
@@ -0,0 +1,265 @@
+import os
+import random
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+# Process-wide LLM access: one pooled OpenAI client plus a scheduler that
+# enforces requests/tokens per minute and adapts concurrency to 429s and
+# latency spikes. Both generic_math_solver_tool and the crew agents go
+# through the same scheduler.
+#   MATH_AGENT_LLM_RPM           requests per minute (default 500)
+#   MATH_AGENT_LLM_TPM           tokens per minute (default 90000)
+#   MATH_AGENT_LLM_CONCURRENCY   maximum concurrent requests (default 8)
+#   MATH_AGENT_LLM_TIMEOUT       request timeout in seconds (default 60)
+#   MATH_AGENT_LLM_RETRIES       retries on 429/5xx/timeouts (default 5)
+# OPENAI_BASE_URL can point the client at a local stand-in server.
+
+
+class TokenBucket:
+    # Refills continuously at per_minute / 60 per second up to capacity.
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._cond = threading.Condition()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, amount: float = 1.0) -> float:
+        # Requests larger than the bucket wait for a full bucket instead of
+        # forever. Returns the amount actually taken.
+        amount = min(amount, self.capacity)
+        with self._cond:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return amount
+                self._cond.wait((amount - self.tokens) / self.rate)
+
+    def adjust(self, amount: float):
+        # Corrects an estimate once the real usage is known (negative refunds).
+        with self._cond:
+            self._refill()
+            self.tokens -= amount
+            self._cond.notify_all()
+
+
+class AdaptiveLimiter:
+    # AIMD concurrency limit: +1 after `limit` consecutive healthy calls,
+    # halved on a 429 or when latency exceeds spike_factor x its moving average.
+
+    def __init__(self, max_concurrency: int = 8, min_concurrency: int = 1, spike_factor: float = 3.0):
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.spike_factor = spike_factor
+        self.limit = max_concurrency
+        self.active = 0
+        self.successes = 0
+        self.latency = None
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while self.active >= self.limit:
+                self._cond.wait()
+            self.active += 1
+
+    def release(self, latency: Optional[float] = None, throttled: bool = False):
+        with self._cond:
+            self.active -= 1
+            spike = (latency is not None and self.latency is not None
+                     and latency > self.spike_factor * self.latency)
+            if throttled or spike:
+                self.limit = max(self.min_concurrency, self.limit // 2)
+                self.successes = 0
+            elif latency is not None:
+                self.successes += 1
+                if self.successes >= self.limit and self.limit < self.max_concurrency:
+                    self.limit += 1
+                    self.successes = 0
+            if latency is not None and not throttled:
+                self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+            self._cond.notify_all()
+
+
+def status_code(error: Exception) -> Optional[int]:
+    code = getattr(error, "status_code", None)
+    if code is None and getattr(error, "response", None) is not None:
+        code = getattr(error.response, "status_code", None)
+    return code
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error: Exception) -> bool:
+    code = status_code(error)
+    if code is not None:
+        return code == 429 or code >= 500
+    return type(error).__name__ in ("APITimeoutError", "APIConnectionError", "Timeout", "TimeoutException")
+
+
+def estimate_tokens(messages, max_tokens: int = 512) -> int:
+    # ~4 characters per token for the prompt plus the completion budget.
+    if isinstance(messages, str):
+        chars = len(messages)
+    else:
+        chars = sum(len(str(m.get("content", ""))) if isinstance(m, dict) else len(str(m)) for m in messages)
+    return chars // 4 + max_tokens
+
+
+def usage_tokens(response) -> Optional[int]:
+    usage = getattr(response, "usage", None)
+    if usage is None and isinstance(response, dict):
+        usage = response.get("usage")
+    if usage is None:
+        return None
+    if isinstance(usage, dict):
+        return usage.get("total_tokens")
+    return getattr(usage, "total_tokens", None)
+
+
+class LLMScheduler:
+
+    def __init__(self, rpm: float = 500, tpm: float = 90000, max_concurrency: int = 8,
+                 max_retries: int = 5, backoff: float = 1.0, max_backoff: float = 60.0):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.limiter = AdaptiveLimiter(max_concurrency)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.stats = {"calls": 0, "retries": 0, "throttled": 0, "failures": 0}
+        self._stats_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "LLMScheduler":
+        return cls(
+            rpm=float(os.environ.get("MATH_AGENT_LLM_RPM", 500)),
+            tpm=float(os.environ.get("MATH_AGENT_LLM_TPM", 90000)),
+            max_concurrency=int(os.environ.get("MATH_AGENT_LLM_CONCURRENCY", 8)),
+            max_retries=int(os.environ.get("MATH_AGENT_LLM_RETRIES", 5)),
+        )
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def call(self, fn: Callable, estimated_tokens: int = 1000):
+        # Runs fn() once rate limits and the concurrency limit allow it,
+        # retrying throttled/transient failures with jittered exponential
+        # backoff (or the server's Retry-After). Failed attempts still count
+        # as requests but give their token estimate back.
+        for attempt in range(self.max_retries + 1):
+            self.requests.acquire(1)
+            taken = self.tokens.acquire(estimated_tokens)
+            self.limiter.acquire()
+            start = time.monotonic()
+            try:
+                result = fn()
+            except Exception as e:
+                throttled = status_code(e) == 429
+                self.limiter.release(None, throttled=throttled)
+                self.tokens.adjust(-taken)
+                if throttled:
+                    self._count("throttled")
+                if not is_retryable(e) or attempt == self.max_retries:
+                    self._count("failures")
+                    raise
+                self._count("retries")
+                delay = retry_after(e)
+                if delay is None:
+                    delay = min(self.max_backoff, self.backoff * 2 ** attempt) * random.uniform(0.5, 1.0)
+                time.sleep(delay)
+                continue
+
+            self.limiter.release(time.monotonic() - start)
+            self._count("calls")
+            used = usage_tokens(result)
+            if used is not None:
+                self.tokens.adjust(used - taken)
+            return result
+
+    def snapshot(self) -> Dict:
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats["concurrency_limit"] = self.limiter.limit
+        return stats
+
+
+_scheduler = None
+_client = None
+_lock = threading.Lock()
+
+
+def get_scheduler() -> LLMScheduler:
+    global _scheduler
+    with _lock:
+        if _scheduler is None:
+            _scheduler = LLMScheduler.from_env()
+    return _scheduler
+
+
+def get_client():
+    # One OpenAI client per process with a pooled HTTP connection. Retries
+    # are left to the scheduler so backoff is coordinated across threads.
+    global _client
+    with _lock:
+        if _client is None:
+            import httpx
+            from openai import OpenAI
+
+            timeout = float(os.environ.get("MATH_AGENT_LLM_TIMEOUT", 60))
+            concurrency = int(os.environ.get("MATH_AGENT_LLM_CONCURRENCY", 8))
+            _client = OpenAI(
+                max_retries=0,
+                timeout=timeout,
+                http_client=httpx.Client(
+                    timeout=httpx.Timeout(timeout, connect=10.0),
+                    limits=httpx.Limits(max_connections=concurrency * 2,
+                                        max_keepalive_connections=concurrency),
+                ),
+            )
+    return _client
+
+
+def chat_completion(messages: List[Dict], model: str = "gpt-4", client=None, **kwargs):
+    client = client or get_client()
+    return get_scheduler().call(
+        lambda: client.chat.completions.create(model=model, messages=messages, **kwargs),
+        estimate_tokens(messages, kwargs.get("max_tokens") or 512)
+    )
+
+
+_scheduled_llm_class = None
+
+
+def scheduled_llm(model: str):
+    # crewAI LLM whose calls share the process-wide scheduler, so agent turns
+    # and tool fallbacks are counted against the same limits.
+    global _scheduled_llm_class
+    if _scheduled_llm_class is None:
+        from crewai import LLM
+
+        class ScheduledLLM(LLM):
+            def call(self, messages, *args, **kwargs):
+                return get_scheduler().call(
+                    lambda: super(ScheduledLLM, self).call(messages, *args, **kwargs),
+                    estimate_tokens(messages)
+                )
+
+        _scheduled_llm_class = ScheduledLLM
+    return _scheduled_llm_class(model=model)
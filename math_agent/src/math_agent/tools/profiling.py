@@ -0,0 +1,336 @@
+import cProfile
+import functools
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional
+
+# Opt-in profiling of the tool functions. The logical/ pipeline profiles its
+# stages with this same module (logical/profiling.py re-exports it), so keep
+# it standard-library only.
+#   MATH_AGENT_PROFILE           tools to profile, comma-separated, or "all"
+#   MATH_AGENT_PROFILE_MODE      cprofile (default) or sample
+#   MATH_AGENT_PROFILE_MEMORY=1  also trace allocations with tracemalloc
+#   MATH_AGENT_PROFILE_DIR       output directory (default "profile")
+#   MATH_AGENT_PROFILE_INTERVAL  sampling interval in seconds (default 0.005)
+# Each run writes <tool>.pstats / <tool>.collapsed, summary.txt and
+# allocations.txt into <dir>/<timestamp>/ when the process exits. Collapsed
+# stacks from cProfile are weighted in microseconds, from sampling in
+# samples; both load into flamegraph.pl or speedscope as they are.
+
+PROFILE_MODES = ("cprofile", "sample")
+
+
+def parse_targets(spec: str, available: Iterable[str]) -> List[str]:
+    available = list(available)
+    if spec.strip() == "all":
+        return available
+    targets = [t.strip() for t in spec.split(",") if t.strip()]
+    unknown = [t for t in targets if t not in available]
+    if unknown:
+        raise ValueError(f"Unknown profile target(s): {', '.join(unknown)} "
+                         f"(choose from {', '.join(available)} or all)")
+    return targets
+
+
+def frame_name(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def pstats_name(func) -> str:
+    filename, line, name = func
+    if filename == "~":
+        return name
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+def collapse_stats(stats: pstats.Stats, max_depth: int = 64, min_share: float = 1e-4) -> Dict[str, int]:
+    # Turns the cProfile call graph into collapsed stacks: every callee's
+    # share of a caller's path is its cumulative time through that caller
+    # over its total cumulative time. Recursive edges are cut, and paths
+    # under min_share of the total time are dropped (the number of paths
+    # through a call graph grows exponentially otherwise).
+    callees: Dict[tuple, Dict[tuple, float]] = {}
+    for func, (_, _, _, _, callers) in stats.stats.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, {})[func] = edge[3]
+    roots = [func for func, row in stats.stats.items() if not row[4]]
+    min_time = max(1e-6, min_share * sum(stats.stats[root][3] for root in roots))
+    stacks: Counter = Counter()
+
+    def walk(func, path, scale):
+        _, _, tt, ct, _ = stats.stats[func]
+        path = path + [pstats_name(func)]
+        stacks[";".join(path)] += tt * scale
+        if len(path) >= max_depth:
+            return
+        for callee, edge_ct in callees.get(func, {}).items():
+            total = stats.stats[callee][3]
+            if total <= 0 or pstats_name(callee) in path:
+                continue
+            share = scale * min(1.0, edge_ct / total)
+            if total * share >= min_time:
+                walk(callee, path, share)
+
+    for root in roots:
+        walk(root, [], 1.0)
+    return {stack: round(t * 1e6) for stack, t in stacks.items() if round(t * 1e6) > 0}
+
+
+def write_collapsed(path: str, stacks: Dict[str, int]):
+    with open(path, 'w', encoding='utf-8') as f:
+        for stack, count in sorted(stacks.items()):
+            f.write(f"{stack} {count}\n")
+
+
+class Profiler:
+    # Profiles the functions handed to wrap() under a target name, either
+    # with one cProfile per target and thread or with a sampler thread that
+    # records the stacks of threads inside a target every `interval`
+    # seconds. A call that starts inside another profiled call is counted
+    # with the outer one. memory=True also traces allocations.
+
+    def __init__(self, targets: Iterable[str], mode: str = "cprofile", memory: bool = False,
+                 output_dir: str = "profile", interval: float = 0.005,
+                 run: Optional[str] = None, tag: Optional[str] = None):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode: {mode} (choose from {', '.join(PROFILE_MODES)})")
+        self.targets = set(targets)
+        self.mode = mode
+        self.memory = memory
+        self.output_dir = output_dir
+        self.interval = interval
+        self.run = run or time.strftime("%Y%m%d_%H%M%S")
+        self.tag = tag
+        self.calls = Counter()
+        self.seconds = Counter()
+        self.peak_bytes: Dict[str, int] = {}
+        self._profiles: Dict[tuple, cProfile.Profile] = {}
+        self._samples: Dict[str, Counter] = {}
+        self._active: Dict[int, str] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._sampler = None
+        self._stop = threading.Event()
+        self._baseline = None
+        if memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(10)
+            self._baseline = tracemalloc.take_snapshot()
+
+    @classmethod
+    def from_env(cls, prefix: str, output_dir: str, available: Iterable[str]) -> Optional["Profiler"]:
+        # <prefix>=solve,render|all turns profiling on; <prefix>_MODE,
+        # <prefix>_MEMORY=1, <prefix>_DIR and <prefix>_INTERVAL tune it.
+        spec = os.environ.get(prefix, "")
+        if not spec:
+            return None
+        return cls(
+            parse_targets(spec, available),
+            mode=os.environ.get(f"{prefix}_MODE", "cprofile"),
+            memory=os.environ.get(f"{prefix}_MEMORY") == "1",
+            output_dir=os.environ.get(f"{prefix}_DIR", output_dir),
+            interval=float(os.environ.get(f"{prefix}_INTERVAL", 0.005)),
+        )
+
+    def config(self) -> Dict:
+        # Constructor arguments for a worker process writing into the same run.
+        return {"targets": sorted(self.targets), "mode": self.mode, "memory": self.memory,
+                "output_dir": self.output_dir, "interval": self.interval, "run": self.run}
+
+    @property
+    def run_dir(self) -> str:
+        return os.path.join(self.output_dir, self.run)
+
+    def wrap(self, target: str, fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def profiled(*args, **kwargs):
+            return self.call(target, fn, *args, **kwargs)
+        return profiled
+
+    def call(self, target: str, fn: Callable, *args, **kwargs):
+        if getattr(self._local, "target", None) is not None:
+            return fn(*args, **kwargs)
+        self._local.target = target
+        profile = None
+        if self.mode == "cprofile":
+            key = (target, threading.get_ident())
+            profile = self._profiles.get(key)
+            if profile is None:
+                with self._lock:
+                    profile = self._profiles.setdefault(key, cProfile.Profile())
+        else:
+            self._ensure_sampler()
+            self._active[threading.get_ident()] = target
+        if self.memory:
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+
+        start = time.perf_counter()
+        try:
+            if profile is not None:
+                return profile.runcall(fn, *args, **kwargs)
+            return fn(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            self._local.target = None
+            self._active.pop(threading.get_ident(), None)
+            with self._lock:
+                self.calls[target] += 1
+                self.seconds[target] += elapsed
+                if self.memory:
+                    peak = tracemalloc.get_traced_memory()[1] - before
+                    self.peak_bytes[target] = max(self.peak_bytes.get(target, 0), peak)
+
+    def _ensure_sampler(self):
+        if self._sampler is None or not self._sampler.is_alive():
+            with self._lock:
+                if self._sampler is None or not self._sampler.is_alive():
+                    self._stop.clear()
+                    self._sampler = threading.Thread(target=self._sample_loop, name="profiler-sampler",
+                                                     daemon=True)
+                    self._sampler.start()
+
+    def _sample_loop(self):
+        while not self._stop.wait(self.interval):
+            if not self._active:
+                continue
+            frames = sys._current_frames()
+            for ident, target in list(self._active.items()):
+                frame = frames.get(ident)
+                stack = []
+                while frame is not None:
+                    stack.append(frame_name(frame.f_code))
+                    frame = frame.f_back
+                if stack:
+                    self._samples.setdefault(target, Counter())[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        if self._sampler is not None:
+            self._stop.set()
+            self._sampler.join()
+            self._sampler = None
+
+    def file_name(self, target: str, ext: str) -> str:
+        name = f"{target}.{self.tag}" if self.tag else target
+        return os.path.join(self.run_dir, f"{name}.{ext}")
+
+    def write(self) -> List[str]:
+        # Writes <target>.pstats / <target>.collapsed per target, plus
+        # allocations.txt and summary.txt, into <output_dir>/<run>/.
+        self.stop()
+        os.makedirs(self.run_dir, exist_ok=True)
+        paths = []
+        summary = io.StringIO()
+        summary.write(f"Profile run {self.run} ({self.mode}), pid {os.getpid()}\n\n")
+        for target in sorted(self.targets):
+            if not self.calls[target]:
+                continue
+            summary.write(f"{target}: {self.calls[target]} calls, {self.seconds[target]:.3f}s")
+            if target in self.peak_bytes:
+                summary.write(f", peak {self.peak_bytes[target] / 1024:.1f} KiB per call")
+            summary.write("\n")
+
+            if self.mode == "cprofile":
+                profiles = [p for (t, _), p in self._profiles.items() if t == target]
+                stats = pstats.Stats(profiles[0], stream=summary)
+                for profile in profiles[1:]:
+                    stats.add(profile)
+                paths.append(self.file_name(target, "pstats"))
+                stats.dump_stats(paths[-1])
+                paths.append(self.file_name(target, "collapsed"))
+                write_collapsed(paths[-1], collapse_stats(stats))
+                stats.sort_stats("cumulative").print_stats(15)
+            else:
+                samples = self._samples.get(target, Counter())
+                paths.append(self.file_name(target, "collapsed"))
+                write_collapsed(paths[-1], samples)
+                leaves = Counter()
+                for stack, count in samples.items():
+                    leaves[stack.rsplit(";", 1)[-1]] += count
+                total = sum(samples.values())
+                summary.write(f"  {total} samples every {self.interval * 1000:g} ms, top frames:\n")
+                for name, count in leaves.most_common(15):
+                    summary.write(f"  {count:8d}  {count / total:6.1%}  {name}\n")
+                summary.write("\n")
+
+        if self.memory:
+            paths.append(self.file_name("allocations", "txt"))
+            self.write_allocations(paths[-1])
+        paths.append(self.file_name("summary", "txt"))
+        with open(paths[-1], 'w', encoding='utf-8') as f:
+            f.write(summary.getvalue())
+        return paths
+
+    def write_allocations(self, path: str, limit: int = 25):
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ))
+        current, peak = tracemalloc.get_traced_memory()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f"Traced memory: {current / 1024:.1f} KiB now, {peak / 1024:.1f} KiB peak since last reset\n")
+            f.write("\nLargest live allocations by line:\n")
+            for stat in snapshot.statistics("lineno")[:limit]:
+                f.write(f"  {stat}\n")
+            if self._baseline is not None:
+                f.write("\nGrowth since profiling started:\n")
+                for stat in snapshot.compare_to(self._baseline, "lineno")[:limit]:
+                    f.write(f"  {stat}\n")
+            f.write("\nLargest live allocations by traceback:\n")
+            for stat in snapshot.statistics("traceback")[:5]:
+                f.write(f"  {stat}\n")
+                for line in stat.traceback.format()[-10:]:
+                    f.write(f"    {line}\n")
+
+
+_profiler: Optional[Profiler] = None
+_atexit_registered = False
+
+
+def install(profiler: Optional[Profiler]) -> Optional[Profiler]:
+    # Makes profiler the one @profiled functions report to (None turns
+    # profiling off) and returns the previous one.
+    global _profiler
+    previous, _profiler = _profiler, profiler
+    return previous
+
+
+def install_from_env(available: Iterable[str]):
+    global _atexit_registered
+    profiler = Profiler.from_env("MATH_AGENT_PROFILE", "profile", available)
+    if profiler is None:
+        return
+    install(profiler)
+    if not _atexit_registered:
+        import atexit
+        atexit.register(write_installed)
+        _atexit_registered = True
+
+
+def write_installed() -> List[str]:
+    if _profiler is None or not sum(_profiler.calls.values()):
+        return []
+    paths = _profiler.write()
+    print(f"Profile saved: {_profiler.run_dir} ({len(paths)} files)", file=sys.stderr)
+    return paths
+
+
+def profiled(target: str):
+    # Routes calls through the installed profiler when it covers target;
+    # otherwise the only cost is one extra function call.
+    def decorate(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            profiler = _profiler
+            if profiler is None or target not in profiler.targets:
+                return fn(*args, **kwargs)
+            return profiler.call(target, fn, *args, **kwargs)
+        return wrapper
+    return decorate
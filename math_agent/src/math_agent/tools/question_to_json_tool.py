@@ -1,13 +1,14 @@
-from crewai.tools import tool
 import json
 import re
-import ast
-import operator
-import math
 import traceback
-
-@tool("question_auto_extractor_tool")
-def question_auto_extractor_tool(question: str) -> str:
+from typing import List, Tuple
+from .solver_cache import solver_cache
+from .llm_cache import cached_chat_completion
+from .equation_ir import Definition, Equation, EquationSystem, evaluate
+from .profiling import install_from_env, profiled
+
+@profiled("question_auto_extractor_tool")
+def extract_question_features(question: str) -> str:
     text = question.lower()
     if "profit" in text or "loss" in text:
         problem_type = "profit_loss"
@@ -37,8 +38,8 @@ def question_auto_extractor_tool(question: str) -> str:
     }, indent=2)
 
 
-@tool("json_structuring_tool")
-def json_structuring_tool(extracted_json: str) -> str:
+@profiled("json_structuring_tool")
+def structure_question_json(extracted_json: str) -> str:
     data = json.loads(extracted_json)
     raw = data["raw_values"]
     text = data["raw_question"].lower()
@@ -47,21 +48,45 @@ def json_structuring_tool(extracted_json: str) -> str:
     variables = {"CP": "unknown"}
     equations = []
 
+    position = 0
     for v in raw:
+        # Classify each value by the words around it, falling back to the
+        # whole question when the context is not conclusive.
+        start = text.find(v.lower(), position)
+        if start < 0:
+            start = position
+        end = start + len(v)
+        position = end
+        before, after = text[max(0, start - 40):start], text[end:end + 25]
+        verbs = re.findall(r"(reduc|decreas|lower|increas|rais)", before)
+        sign = "-" if verbs and verbs[-1] in ("reduc", "decreas", "lower") else ""
+
         if "%" in v:
-            if "mark" in text:
+            if "discount" in after[:12] or re.search(r"discount\s+(of\s+)?$", before):
+                values["discount_percentage"] = v
+            elif "above" in after or re.search(r"mark\w*\s+(up\s+)?(by\s+)?$", before):
                 values["markup_percentage"] = v
-            elif "discount" in text:
+            elif re.search(r"(cost price|cp)\s+by\s*$", before):
+                values["cost_change_percentage"] = sign + v
+            elif re.search(r"(becomes|new profit\w*|now)\s*(is\s+)?$", before) and "profit_percentage" in values:
+                values["new_profit_percentage"] = v
+            elif "mark" in text and "markup_percentage" not in values:
+                values["markup_percentage"] = v
+            elif "discount" in text and "discount_percentage" not in values:
                 values["discount_percentage"] = v
             elif "profit" in text:
                 values["profit_percentage"] = v
 
         elif "₹" in v:
-            if "profit" in text:
+            if re.search(r"(selling price|sp)\s+by\s*$", before):
+                values["price_change_value"] = sign + v
+            elif "profit" in text:
                 values["profit_value"] = v
             else:
                 values[f"amount_{v}"] = v
 
+    system = build_equation_system(values)
+
     if "markup_percentage" in values:
         p = float(values["markup_percentage"].replace("%", ""))/100
         variables["MP"] = f"CP * (1 + {p})"
@@ -78,18 +103,80 @@ def json_structuring_tool(extracted_json: str) -> str:
         p = float(values["profit_percentage"].replace("%", ""))/100
         equations.append(f"(SP - CP) / CP = {p}")
 
+    if system is not None:
+        for d in system.definitions:
+            variables.setdefault(d.name, d.expr)
+        equations = [str(e) for e in system.equations]
+
     return json.dumps({
         "problem_type": data["problem_type"],
         "values": values,
         "variables": variables,
         "equations": equations,
+        "system": system.to_dict() if system is not None else None,
         "required_output": "Find cost price or selling price as required",
         "raw_question": data["raw_question"]
     }, indent=2)
 
 
-@tool("visual_formatter_tool")
-def visual_formatter_tool(solved_json: str) -> str:
+def percent(value: str) -> float:
+    return float(value.replace("%", "")) / 100
+
+
+def rupees(value: str) -> float:
+    return float(value.replace("₹", "").strip())
+
+
+def scaled(base: str, rate: float) -> str:
+    return f"{base} * (1 - {-rate})" if rate < 0 else f"{base} * (1 + {rate})"
+
+
+def shifted(base: str, amount: float) -> str:
+    return f"{base} - {-amount}" if amount < 0 else f"{base} + {amount}"
+
+
+def build_equation_system(values: dict):
+    # Typed equations consumed directly by generic_math_solver_tool; None when
+    # the values don't describe a supported relationship.
+    try:
+        definitions = []
+        sp = "CP"
+        if "markup_percentage" in values:
+            definitions.append(Definition("MP", f"CP * (1 + {percent(values['markup_percentage'])})"))
+            sp = "MP"
+        if "discount_percentage" in values:
+            definitions.append(Definition("SP", f"{sp} * (1 - {percent(values['discount_percentage'])})"))
+            sp = "SP"
+        elif sp != "CP":
+            definitions.append(Definition("SP", sp))
+            sp = "SP"
+
+        changes = ("cost_change_percentage", "price_change_value", "new_profit_percentage")
+        if "profit_percentage" in values and any(k in values for k in changes):
+            # Profit p1%, cost price changed by c%, selling price changed by ₹k,
+            # new profit p2%.
+            definitions = [
+                Definition("SP1", scaled("CP", percent(values["profit_percentage"]))),
+                Definition("CP2", scaled("CP", percent(values.get("cost_change_percentage", "0%")))),
+                Definition("SP2", shifted("SP1", rupees(values.get("price_change_value", "₹0")))),
+            ]
+            if "new_profit_percentage" not in values:
+                return None
+            equations = [Equation("(SP2 - CP2) / CP2", str(percent(values["new_profit_percentage"])))]
+        elif "profit_value" in values and sp != "CP":
+            equations = [Equation("SP - CP", str(rupees(values["profit_value"])))]
+        elif "profit_percentage" in values and sp != "CP":
+            equations = [Equation("(SP - CP) / CP", str(percent(values["profit_percentage"])))]
+        else:
+            return None
+    except ValueError:
+        return None
+
+    return EquationSystem(unknowns=["CP"], definitions=definitions, equations=equations)
+
+
+@profiled("visual_formatter_tool")
+def format_solution(solved_json: str) -> str:
     data = json.loads(solved_json)
 
     vals = data.get("values", {})
@@ -111,10 +198,10 @@ def visual_formatter_tool(solved_json: str) -> str:
     return output
 
 
-@tool("generic_math_solver_tool")
-def generic_math_solver_tool(json_input: str) -> str:
-    data = json.loads(json_input)
-
+def solve_deterministic(data: dict) -> Tuple[bool, List[str]]:
+    # Markup/discount/profit solver shared by generic_math_solver_tool and the
+    # MathCrew fast path. Returns (solved, steps); when solved, data gets
+    # "solution_template" and "final_answer".
     values = data.get("values", {})
     variables = data.get("variables", {})
     equations = data.get("equations", [])
@@ -152,6 +239,21 @@ def generic_math_solver_tool(json_input: str) -> str:
 
     steps.append(f"Step 2: Extracted parameters: markup={markup_percentage}, discount={discount_percentage}, profit_value={profit_value}, profit_percentage={profit_percentage}")
 
+    # Deterministic steps depend only on these parameters, so reworded copies
+    # of the same problem reuse them.
+    system = data.get("system")
+    memo_key = ("markup_discount_profit", markup_percentage, discount_percentage, profit_value, profit_percentage,
+                json.dumps(system, sort_keys=True) if system else None)
+    cached = solver_cache.get(memo_key)
+    if cached is not None:
+        cached_steps, final_answer = cached
+        data["solution_template"] = list(cached_steps)
+        data["final_answer"] = final_answer
+        return True, data["solution_template"]
+
+    if system:
+        return solve_system(data, system, steps, memo_key)
+
     CP = None
     SP_expr = "x"
 
@@ -167,7 +269,7 @@ def generic_math_solver_tool(json_input: str) -> str:
 
     try:
         expr = SP_expr.replace("x*", "")
-        coefficient = eval(expr)
+        coefficient = evaluate(expr)
 
         steps.append(f"Step 3: Simplifying SP expression gives coefficient = {coefficient}")
 
@@ -178,10 +280,7 @@ def generic_math_solver_tool(json_input: str) -> str:
                 raise ValueError("Invalid equation: denominator zero")
 
             CP = profit_value / denom
-            steps.append(f"Step 5: Solving → x = {CP}")
-            steps.append(f"Final Answer: Cost Price = ₹{round(CP, 2)}")
-            data["solution_template"] = steps
-            return json.dumps(data, indent=2)
+            return solved(data, steps, CP, memo_key)
 
         if profit_percentage is not None:
             steps.append("Step 4: Using profit percentage formula (SP - CP)/CP = profit%")
@@ -195,10 +294,67 @@ def generic_math_solver_tool(json_input: str) -> str:
         steps.append(str(e))
         steps.append(traceback.format_exc())
 
-    steps.append("Step 6: Switching to GPT Solver Fallback.")
+    return False, steps
+
 
-    from openai import OpenAI
-    client = OpenAI()
+QUANTITY_NAMES = {
+    "MP": "Marked Price",
+    "SP": "Selling Price",
+    "SP1": "Original Selling Price",
+    "CP2": "New Cost Price",
+    "SP2": "New Selling Price",
+}
+
+
+def solved(data: dict, steps: List[str], CP: float, memo_key) -> Tuple[bool, List[str]]:
+    steps.append(f"Step 5: Solving → x = {CP}")
+    steps.append(f"Final Answer: Cost Price = ₹{round(CP, 2)}")
+    final_answer = f"Cost Price = ₹{round(CP, 2)}"
+    solver_cache.put(memo_key, (list(steps), final_answer))
+    data["solution_template"] = steps
+    data["final_answer"] = final_answer
+    return True, steps
+
+
+def solve_system(data: dict, system_dict: dict, steps: List[str], memo_key) -> Tuple[bool, List[str]]:
+    # Consumes the typed equations from json_structuring_tool directly. A
+    # malformed system (missing keys, bad expressions, unknown target) fails
+    # like an unsolvable one, so the caller falls back to GPT.
+    try:
+        system = EquationSystem.from_dict(system_dict)
+        for d in system.definitions:
+            steps.append(f"{QUANTITY_NAMES.get(d.name, d.name)}: {d.name} = {d.expr}")
+        for i, eq in enumerate(system.equations, 1):
+            steps.append(f"Equation {i}: {eq}")
+        steps.append(f"Step 3: Solving {len(system.equations)} equation(s) for {', '.join(system.unknowns)}")
+        values = system.solve()
+        target = values[system.target]
+    except (ValueError, ArithmeticError, SyntaxError, KeyError, TypeError, AttributeError) as e:
+        steps.append("Deterministic solver failed.")
+        steps.append(f"{type(e).__name__}: {e}")
+        return False, steps
+    known = [f"{name} = {round(values[name], 2)}" for name in QUANTITY_NAMES if name in values]
+    if known:
+        steps.append(f"Step 4: Substituting back: {', '.join(known)}")
+    return solved(data, steps, target, memo_key)
+
+
+def is_solution_json(content: str) -> bool:
+    try:
+        return "solution_template" in json.loads(content)
+    except (ValueError, TypeError):
+        return False
+
+
+@profiled("generic_math_solver_tool")
+def solve_math_json(json_input: str) -> str:
+    data = json.loads(json_input)
+
+    is_solved, steps = solve_deterministic(data)
+    if is_solved:
+        return json.dumps(data, indent=2)
+
+    steps.append("Step 6: Switching to GPT Solver Fallback.")
 
     prompt = f"""
 Solve this commercial arithmetic problem step by step.
@@ -214,17 +370,32 @@ Return only:
 If information is missing to compute exact numeric answer, derive as far as possible.
 """
 
-    gpt_resp = client.chat.completions.create(
-        model="gpt-4",
-        messages=[{"role": "user", "content": prompt}]
-    )
-
     try:
-        gpt_json = gpt_resp.choices[0].message.content
+        gpt_json = cached_chat_completion(prompt, model="gpt-4", accept=is_solution_json)
         gpt_out = json.loads(gpt_json)
         data["solution_template"] = gpt_out["solution_template"]
     except:
         steps.append("GPT fallback also failed. Returning partial solution.")
         data["solution_template"] = steps
 
-    return json.dumps(data, indent=2)
\ No newline at end of file
+    return json.dumps(data, indent=2)
+
+
+# crewAI tool objects are created on first access, so the plain functions
+# above (used by the MathCrew fast path) don't pay for importing crewAI.
+TOOL_FUNCTIONS = {
+    "question_auto_extractor_tool": extract_question_features,
+    "json_structuring_tool": structure_question_json,
+    "generic_math_solver_tool": solve_math_json,
+    "visual_formatter_tool": format_solution,
+}
+
+install_from_env(TOOL_FUNCTIONS)
+
+
+def __getattr__(name: str):
+    if name not in TOOL_FUNCTIONS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from crewai.tools import tool
+    globals()[name] = tool(name)(TOOL_FUNCTIONS[name])
+    return globals()[name]
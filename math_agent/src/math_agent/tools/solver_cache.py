@@ -0,0 +1,87 @@
+# Solver memoization: bounded in-memory cache keyed by normalized solver parameters
+# The logical/ pipeline loads this same file (logical/shared_modules.py), so
+# keep it standard-library only.
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+
+EVICTION_POLICIES = ('lru', 'fifo')
+
+
+def normalize_text(text: str) -> str:
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+class SolverCache:
+
+    def __init__(self, maxsize: int = 4096, policy: str = 'lru'):
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy: {policy}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "SolverCache":
+        return cls(
+            maxsize=int(os.environ.get("MATH_SOLVER_CACHE_SIZE", "4096")),
+            policy=os.environ.get("MATH_SOLVER_CACHE_POLICY", "lru")
+        )
+
+    def get(self, key: Hashable) -> Optional[object]:
+        with self._lock:
+            if key in self._data:
+                self.hits += 1
+                if self.policy == 'lru':
+                    self._data.move_to_end(key)
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, value: object):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if key in self._data:
+                self._data[key] = value
+                if self.policy == 'lru':
+                    self._data.move_to_end(key)
+                return
+            self._data[key] = value
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "policy": self.policy,
+            "hit_rate": round(self.hit_rate, 4)
+        }
+
+
+solver_cache = SolverCache.from_env()
@@ -0,0 +1,140 @@
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from math_agent.tools import llm_cache
+from math_agent.tools.llm_cache import LLMResponseCache, cached_chat_completion
+
+# The OpenAI client is replaced by a stub with the same
+# chat.completions.create interface, and llm_cache's clock by a fake one,
+# so nothing here touches the network or waits.
+
+
+class StubClient:
+
+    def __init__(self, content: str = '{"solution_template": ["x = 1"]}'):
+        self.content = content
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model, messages, **kwargs):
+        self.calls += 1
+        message = SimpleNamespace(content=self.content)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=message)],
+            usage=None,
+            model_dump_json=lambda: f'{{"model": "{model}", "content": {self.content!r}}}',
+        )
+
+
+class FailingClient(StubClient):
+
+    def create(self, model, messages, **kwargs):
+        raise AssertionError("the API must not be called")
+
+
+class FakeClock:
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+class LLMResponseCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "llm_cache.db")
+        self.clock = FakeClock()
+        patcher = mock.patch.object(llm_cache, "time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.caches = []
+
+    def tearDown(self):
+        for cache in self.caches:
+            cache.close()
+        self.tmp.cleanup()
+
+    def open_cache(self, **kwargs) -> LLMResponseCache:
+        cache = LLMResponseCache(self.path, **kwargs)
+        self.caches.append(cache)
+        return cache
+
+    def complete(self, cache, prompt, client):
+        with mock.patch.object(llm_cache, "_llm_cache", cache):
+            return cached_chat_completion(prompt, client=client)
+
+    def test_hit_skips_the_api(self):
+        cache = self.open_cache()
+        client = StubClient()
+        first = self.complete(cache, "Solve x + 1 = 2", client)
+        second = self.complete(cache, "Solve   x + 1 = 2", client)
+        self.assertEqual(first, second)
+        self.assertEqual(client.calls, 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_rejected_response_is_not_stored(self):
+        cache = self.open_cache()
+        client = StubClient("not json")
+        with mock.patch.object(llm_cache, "_llm_cache", cache):
+            cached_chat_completion("q", client=client, accept=lambda content: False)
+            cached_chat_completion("q", client=client, accept=lambda content: False)
+        self.assertEqual(client.calls, 2)
+        self.assertEqual(cache.size, 0)
+
+    def test_ttl_expiry(self):
+        cache = self.open_cache(ttl=60)
+        client = StubClient()
+        self.complete(cache, "q", client)
+        self.clock.now += 59
+        self.complete(cache, "q", client)
+        self.assertEqual(client.calls, 1)
+
+        self.clock.now += 2
+        self.complete(cache, "q", client)
+        self.assertEqual(client.calls, 2)
+        self.assertEqual(cache.expired, 1)
+        self.assertEqual(cache.size, 1)
+
+    def test_lru_eviction(self):
+        cache = self.open_cache(max_entries=2)
+        for prompt in ("a", "b"):
+            cache.put("gpt-4", prompt, prompt.upper())
+            self.clock.now += 1
+        self.assertEqual(cache.get("gpt-4", "a"), "A")
+        self.clock.now += 1
+
+        cache.put("gpt-4", "c", "C")
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(cache.size, 2)
+        self.assertIsNone(cache.get("gpt-4", "b"))
+        self.assertEqual(cache.get("gpt-4", "a"), "A")
+        self.assertEqual(cache.get("gpt-4", "c"), "C")
+
+    def test_record_then_replay(self):
+        recorder = self.open_cache(record=True)
+        content = self.complete(recorder, "recorded prompt", StubClient())
+        raw = recorder.conn.execute("SELECT raw FROM responses").fetchone()[0]
+        self.assertIn('"model": "gpt-4"', raw)
+        recorder.close()
+
+        # Replay never calls the API and ignores the TTL.
+        self.clock.now += 365 * 24 * 3600
+        replayer = self.open_cache(ttl=60, replay=True)
+        self.assertEqual(self.complete(replayer, "recorded prompt", FailingClient()), content)
+        with self.assertRaises(LookupError):
+            self.complete(replayer, "unknown prompt", FailingClient())
+
+    def test_responses_are_stored_without_raw_unless_recording(self):
+        cache = self.open_cache()
+        self.complete(cache, "q", StubClient())
+        self.assertIsNone(cache.conn.execute("SELECT raw FROM responses").fetchone()[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
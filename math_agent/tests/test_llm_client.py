@@ -0,0 +1,230 @@
+import json
+import os
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest import mock
+
+from math_agent.tools import llm_client
+from math_agent.tools.llm_client import AdaptiveLimiter, LLMScheduler, TokenBucket, chat_completion
+
+# The end-to-end tests point the real OpenAI client at a local http.server
+# stand-in through OPENAI_BASE_URL; the rest call the scheduler with stub
+# functions. Rates are set high enough that the whole file runs in a few
+# seconds.
+
+
+def completion(total_tokens: int = 30) -> dict:
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-4",
+        "choices": [{"index": 0, "finish_reason": "stop",
+                     "message": {"role": "assistant", "content": "x = 1"}}],
+        "usage": {"prompt_tokens": total_tokens - 10, "completion_tokens": 10,
+                  "total_tokens": total_tokens},
+    }
+
+
+class StubServer:
+    # Answers POST /v1/chat/completions with the queued (status, headers)
+    # pairs in order, then with 200 and a completion.
+
+    def __init__(self, responses=()):
+        self.responses = list(responses)
+        self.hits = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                stub.hits.append(time.monotonic())
+                status, headers = stub.responses.pop(0) if stub.responses else (200, {})
+                body = json.dumps(completion() if status == 200 else
+                                  {"error": {"message": "stub", "type": "rate_limit"}}).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_port}/v1"
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class HTTPError(Exception):
+    # Shaped like openai.APIStatusError for status_code() and retry_after().
+
+    def __init__(self, status: int, retry_after: str = None):
+        super().__init__(f"HTTP {status}")
+        self.status_code = status
+        headers = {"retry-after": retry_after} if retry_after is not None else {}
+        self.response = SimpleNamespace(status_code=status, headers=headers)
+
+
+class LocalServerTest(unittest.TestCase):
+
+    def start(self, responses, **scheduler_options) -> StubServer:
+        server = StubServer(responses)
+        self.addCleanup(server.close)
+        self.scheduler = LLMScheduler(backoff=0.01, **scheduler_options)
+        env = {"OPENAI_BASE_URL": server.base_url, "OPENAI_API_KEY": "test",
+               "MATH_AGENT_LLM_TIMEOUT": "5"}
+        for patcher in (mock.patch.dict(os.environ, env),
+                        mock.patch.object(llm_client, "_client", None),
+                        mock.patch.object(llm_client, "_scheduler", self.scheduler)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        return server
+
+    def test_retry_after_is_honoured(self):
+        server = self.start([(429, {"Retry-After": "0.3"})], max_concurrency=8)
+        response = chat_completion([{"role": "user", "content": "Solve x + 1 = 2"}])
+
+        self.assertEqual(response.choices[0].message.content, "x = 1")
+        self.assertEqual(len(server.hits), 2)
+        self.assertGreaterEqual(server.hits[1] - server.hits[0], 0.3)
+        stats = self.scheduler.snapshot()
+        self.assertEqual((stats["throttled"], stats["retries"], stats["calls"]), (1, 1, 1))
+        self.assertEqual(stats["concurrency_limit"], 4)
+
+    def test_retries_are_bounded(self):
+        server = self.start([(429, {"Retry-After": "0"})] * 10, max_retries=2)
+        with self.assertRaises(Exception) as raised:
+            chat_completion([{"role": "user", "content": "q"}])
+
+        self.assertEqual(llm_client.status_code(raised.exception), 429)
+        self.assertEqual(len(server.hits), 3)
+        stats = self.scheduler.snapshot()
+        self.assertEqual((stats["throttled"], stats["retries"], stats["failures"]), (3, 2, 1))
+
+    def test_client_errors_are_not_retried(self):
+        server = self.start([(400, {})])
+        with self.assertRaises(Exception):
+            chat_completion([{"role": "user", "content": "q"}])
+        self.assertEqual(len(server.hits), 1)
+
+
+class SchedulerTest(unittest.TestCase):
+
+    def test_failed_attempts_refund_their_tokens(self):
+        scheduler = LLMScheduler(tpm=6000, backoff=0)
+        outcomes = [HTTPError(429, "0"), HTTPError(503)]
+
+        def call():
+            if outcomes:
+                raise outcomes.pop(0)
+            return {"usage": {"total_tokens": 300}}
+
+        scheduler.call(call, estimated_tokens=1000)
+        # Only the successful attempt's real usage stays charged.
+        self.assertAlmostEqual(scheduler.tokens.tokens, 6000 - 300, delta=5)
+
+    def test_usage_reconciles_the_estimate(self):
+        scheduler = LLMScheduler(tpm=6000)
+        scheduler.call(lambda: {"usage": {"total_tokens": 1500}}, estimated_tokens=1000)
+        self.assertAlmostEqual(scheduler.tokens.tokens, 6000 - 1500, delta=5)
+
+    def test_concurrency_never_exceeds_the_limit(self):
+        scheduler = LLMScheduler(max_concurrency=3)
+        active, peak, lock = [0], [0], threading.Lock()
+
+        def call():
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+
+        threads = [threading.Thread(target=scheduler.call, args=(call, 1)) for _ in range(12)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(peak[0], 3)
+
+
+class AdaptiveLimiterTest(unittest.TestCase):
+
+    def release(self, limiter, *args, **kwargs):
+        limiter.acquire()
+        limiter.release(*args, **kwargs)
+
+    def test_halves_on_429_and_recovers_additively(self):
+        limiter = AdaptiveLimiter(max_concurrency=8)
+        self.release(limiter, None, throttled=True)
+        self.assertEqual(limiter.limit, 4)
+        self.release(limiter, None, throttled=True)
+        self.assertEqual(limiter.limit, 2)
+
+        # +1 after `limit` consecutive healthy calls.
+        for expected in (3, 4, 5, 6, 7, 8):
+            for _ in range(expected - 1):
+                self.release(limiter, 0.1)
+            self.assertEqual(limiter.limit, expected)
+        for _ in range(20):
+            self.release(limiter, 0.1)
+        self.assertEqual(limiter.limit, 8)
+
+    def test_halves_on_latency_spike(self):
+        limiter = AdaptiveLimiter(max_concurrency=8, spike_factor=3.0)
+        for _ in range(5):
+            self.release(limiter, 0.1)
+        self.release(limiter, 0.25)
+        self.assertEqual(limiter.limit, 8)
+        self.release(limiter, 1.0)
+        self.assertEqual(limiter.limit, 4)
+
+    def test_never_drops_below_the_minimum(self):
+        limiter = AdaptiveLimiter(max_concurrency=4, min_concurrency=1)
+        for _ in range(5):
+            self.release(limiter, None, throttled=True)
+        self.assertEqual(limiter.limit, 1)
+
+
+class TokenBucketTest(unittest.TestCase):
+
+    def test_requests_per_minute(self):
+        # 1200 rpm = 20/s; after the one-token burst, 5 more take >= 0.25s.
+        bucket = TokenBucket(1200, capacity=1)
+        start = time.monotonic()
+        for _ in range(6):
+            bucket.acquire(1)
+        self.assertGreaterEqual(time.monotonic() - start, 0.24)
+
+    def test_tokens_per_minute(self):
+        # 60000 tpm = 1000 tokens/s; three 200-token calls after a full
+        # 200-token bucket need 0.6s of refill.
+        scheduler = LLMScheduler(rpm=100000, tpm=60000)
+        scheduler.tokens = TokenBucket(60000, capacity=200)
+        start = time.monotonic()
+        for _ in range(4):
+            scheduler.call(lambda: None, estimated_tokens=200)
+        self.assertGreaterEqual(time.monotonic() - start, 0.58)
+
+    def test_oversized_request_waits_for_a_full_bucket(self):
+        bucket = TokenBucket(6000, capacity=100)
+        self.assertEqual(bucket.acquire(500), 100)
+        self.assertLess(bucket.tokens, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+
+from math_agent.tools.question_to_json_tool import solve_system
+
+# Malformed equation systems from the structuring step must fail cleanly
+# (so the tool falls back to GPT) instead of raising out of the tool.
+
+SYSTEM = {
+    "unknowns": ["CP"],
+    "definitions": [{"name": "SP", "expr": "CP*1.2"}],
+    "equations": [{"lhs": "SP - CP", "rhs": "50"}],
+}
+
+
+class SolveSystemTest(unittest.TestCase):
+
+    def solve(self, system):
+        data = {}
+        ok, steps = solve_system(data, system, [], ("test_solve_system", repr(system)))
+        return ok, steps, data
+
+    def test_solves_a_well_formed_system(self):
+        ok, steps, data = self.solve(SYSTEM)
+        self.assertTrue(ok)
+        self.assertEqual(data["final_answer"], "Cost Price = ₹250.0")
+
+    def test_malformed_systems_fail_without_raising(self):
+        cases = {
+            "syntax error": {**SYSTEM, "equations": [{"lhs": "CP*(", "rhs": "50"}]},
+            "overflow": {**SYSTEM, "equations": [{"lhs": "10**400*CP", "rhs": "50"}]},
+            "missing unknowns": {k: v for k, v in SYSTEM.items() if k != "unknowns"},
+            "unknown target": {**SYSTEM, "target": "XX"},
+            "equation not an object": {**SYSTEM, "equations": ["CP = 5"]},
+            "null expression": {**SYSTEM, "equations": [{"lhs": None, "rhs": "50"}]},
+            "inconsistent": {**SYSTEM, "equations": [{"lhs": "CP", "rhs": "1"}, {"lhs": "CP", "rhs": "2"}]},
+        }
+        for name, system in cases.items():
+            with self.subTest(name):
+                ok, steps, data = self.solve(system)
+                self.assertFalse(ok)
+                self.assertIn("Deterministic solver failed.", steps)
+                self.assertNotIn("final_answer", data)
+
+
+if __name__ == "__main__":
+    unittest.main()